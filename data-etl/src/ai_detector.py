@@ -6,15 +6,29 @@ Replaces hardcoded detection with intelligent, agnostic discovery.
 
 import json
 import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from operator import itemgetter
 import backoff
+from pathlib import Path
 from typing import Dict, List, Set, Optional
 from github.Repository import Repository
 from github.GithubException import GithubException
-from openai import OpenAI
 from openai import OpenAIError
 
+from detector import is_backpressure_error
+from http_clients import CompletionCache, get_openai_client, get_openai_throttle
+
 logger = logging.getLogger(__name__)
 
+# File tree entries offered to the triage prompt
+MAX_TREE_ENTRIES = 200
+
+# Concurrent file content requests per repository
+FILE_FETCH_WORKERS = 4
+
 
 class AITechnologyDetector:
     """
@@ -26,17 +40,21 @@ class AITechnologyDetector:
     - Phase 3: Returns structured technology data
     """
 
-    def __init__(self, openai_api_key: str, config: dict):
+    def __init__(self, openai_api_key: str, config: dict, cache_path: Optional[Path] = None):
         """
         Initialize AI detector.
 
         Args:
             openai_api_key: OpenAI API key
             config: Configuration dictionary
+            cache_path: Optional shelve path to persist AI responses across runs
         """
-        self.client = OpenAI(api_key=openai_api_key)
+        self.client = get_openai_client(openai_api_key)
         self.config = config
 
+        # Shared with every other OpenAI caller (repos are scanned concurrently)
+        self.throttle = get_openai_throttle(config.get('openai', {}).get('requests_per_minute', 500))
+
         # Get AI detection config
         ai_config = config.get('detection', {}).get('ai_detection', {})
         self.phase1_model = ai_config.get('phase1_model', 'gpt-4o-mini')
@@ -48,12 +66,18 @@ class AITechnologyDetector:
         # Caching
         self.cache_enabled = ai_config.get('cache_results', True)
         self.cache = {}
+        # Repos are detected concurrently; guards the result cache and stats
+        self._lock = threading.Lock()
+
+        # Responses for identical prompts (same tree / file contents) across runs
+        self.response_cache = CompletionCache(cache_path)
 
         # Stats
         self.stats = {
             'phase1_calls': 0,
             'phase2_calls': 0,
             'cache_hits': 0,
+            'response_cache_hits': 0,
             'errors': 0
         }
 
@@ -69,10 +93,13 @@ class AITechnologyDetector:
         """
         try:
             # Check cache
-            if self.cache_enabled and repo.full_name in self.cache:
-                logger.debug(f"Cache hit for {repo.name}")
-                self.stats['cache_hits'] += 1
-                return self.cache[repo.full_name]
+            if self.cache_enabled:
+                with self._lock:
+                    cached = self.cache.get(repo.full_name)
+                if cached is not None:
+                    logger.debug(f"Cache hit for {repo.name}")
+                    self._count('cache_hits')
+                    return cached
 
             # Phase 1: AI triage - which files should we read?
             logger.debug(f"Phase 1: Triaging {repo.name}")
@@ -91,15 +118,24 @@ class AITechnologyDetector:
 
             # Cache result
             if self.cache_enabled:
-                self.cache[repo.full_name] = technologies
+                with self._lock:
+                    self.cache[repo.full_name] = technologies
 
             return technologies
 
         except Exception as e:
             logger.error(f"AI detection failed for {repo.name}: {e}")
-            self.stats['errors'] += 1
+            self._count('errors')
+            # Let the scanner pause and back off on GitHub rate limit / server errors
+            if is_backpressure_error(e):
+                raise
             return self._empty_result()
 
+    def _count(self, stat: str) -> None:
+        """Increment a stats counter (called from concurrent scans)."""
+        with self._lock:
+            self.stats[stat] += 1
+
     @backoff.on_exception(
         backoff.expo,
         OpenAIError,
@@ -127,28 +163,25 @@ class AITechnologyDetector:
             prompt = self._build_triage_prompt(repo.name, file_tree)
 
             # Call AI
-            response = self.client.chat.completions.create(
-                model=self.phase1_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a technology detection expert. Analyze repository structures and identify files that contain technology information."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=300,
-                response_format={"type": "json_object"},
-                timeout=15
+            result = self._complete_json(
+                {
+                    "model": self.phase1_model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a technology detection expert. Analyze repository structures and identify files that contain technology information."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "temperature": 0.1,
+                    "max_tokens": 300
+                },
+                timeout=15,
+                stat='phase1_calls'
             )
-
-            self.stats['phase1_calls'] += 1
-
-            # Parse response
-            result = json.loads(response.choices[0].message.content)
             relevant_files = result.get('relevant_files', [])
 
             # Limit files
@@ -191,29 +224,26 @@ class AITechnologyDetector:
             prompt = self._build_analysis_prompt(repo.name, file_contents)
 
             # Call AI
-            response = self.client.chat.completions.create(
-                model=self.phase2_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a technology detection expert. Analyze code files and extract ALL technologies used."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=800,
-                response_format={"type": "json_object"},
-                timeout=20
+            result = self._complete_json(
+                {
+                    "model": self.phase2_model,
+                    "messages": [
+                        {
+                            "role": "system",
+                            "content": "You are a technology detection expert. Analyze code files and extract ALL technologies used."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    "temperature": 0.1,
+                    "max_tokens": 800
+                },
+                timeout=20,
+                stat='phase2_calls'
             )
 
-            self.stats['phase2_calls'] += 1
-
-            # Parse response
-            result = json.loads(response.choices[0].message.content)
-
             logger.debug(f"Phase 2 found {len(result.get('technologies', {}))} technology categories")
             if result.get('evidence'):
                 logger.debug(f"Evidence: {list(result['evidence'].keys())}")
@@ -224,6 +254,44 @@ class AITechnologyDetector:
             logger.error(f"Phase 2 analysis failed for {repo.name}: {e}")
             raise
 
+    def _complete_json(self, request: Dict, timeout: int, stat: str) -> Dict:
+        """
+        Run a JSON-mode chat completion, reusing a stored response if one exists.
+
+        Args:
+            request: Completion parameters that determine the answer (cache key)
+            timeout: Request timeout in seconds
+            stat: Stats counter to increment for a real API call
+
+        Returns:
+            Parsed JSON response
+        """
+        content = self.response_cache.get(request)
+        if content is not None:
+            self._count('response_cache_hits')
+            return json.loads(content)
+
+        self.throttle.wait()
+        response = self.client.chat.completions.create(
+            **request,
+            response_format={"type": "json_object"},
+            timeout=timeout
+        )
+        self._count(stat)
+
+        content = response.choices[0].message.content
+        result = json.loads(content)
+        self.response_cache.put(request, content)
+        return result
+
+    def save_cache(self) -> None:
+        """Flush persistent AI responses to disk."""
+        self.response_cache.sync()
+
+    def invalidate_cache(self) -> None:
+        """Drop all persisted AI responses."""
+        self.response_cache.clear()
+
     def _get_file_tree(self, repo: Repository) -> List[str]:
         """
         Get repository file tree (paths only) up to max_depth.
@@ -235,31 +303,23 @@ class AITechnologyDetector:
             List of file paths
         """
         try:
-            # Get repository contents (root level)
-            contents = repo.get_contents("")
-            file_tree = []
-
-            # BFS to build tree up to max_depth
-            queue = [(item, 1) for item in contents]
+            # One recursive tree request instead of a contents request per directory
+            tree = repo.get_git_tree(repo.default_branch, recursive=True).tree
 
-            while queue and len(file_tree) < 200:  # Limit to 200 files max (optimized for speed)
-                item, depth = queue.pop(0)
+            # Keep entries within max_depth, shallowest first (breadth-first order)
+            entries = [
+                (item.path.count('/') + 1, item.path)
+                for item in tree
+                if item.type in ('blob', 'tree')
+            ]
+            entries = [entry for entry in entries if entry[0] <= self.file_tree_max_depth]
+            entries.sort(key=itemgetter(0))
 
-                # Add to tree
-                file_tree.append(item.path)
-
-                # Recurse into directories if within depth limit
-                if item.type == "dir" and depth < self.file_tree_max_depth:
-                    try:
-                        sub_contents = repo.get_contents(item.path)
-                        for sub_item in sub_contents:
-                            queue.append((sub_item, depth + 1))
-                    except GithubException:
-                        pass  # Skip inaccessible directories
-
-            return file_tree
+            return [path for _, path in entries[:MAX_TREE_ENTRIES]]
 
         except Exception as e:
+            if is_backpressure_error(e):
+                raise
             logger.error(f"Error getting file tree for {repo.name}: {e}")
             return []
 
@@ -274,27 +334,38 @@ class AITechnologyDetector:
         Returns:
             Dict mapping file path to content
         """
-        file_contents = {}
-
-        for path in paths:
-            try:
-                content_file = repo.get_contents(path)
-
-                # Skip if file too large
-                if content_file.size > self.max_file_size:
-                    logger.debug(f"Skipping {path} (too large: {content_file.size} bytes)")
-                    continue
+        if not paths:
+            return {}
+
+        # Each file is a separate request, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=min(FILE_FETCH_WORKERS, len(paths))) as executor:
+            contents = executor.map(lambda path: self._fetch_file(repo, path), paths)
+            return {
+                path: content
+                for path, content in zip(paths, contents)
+                if content is not None
+            }
+
+    def _fetch_file(self, repo: Repository, path: str) -> Optional[str]:
+        """Fetch one file's decoded content (None if unavailable or too large)."""
+        try:
+            content_file = repo.get_contents(path)
 
-                # Decode content
-                content = content_file.decoded_content.decode('utf-8', errors='ignore')
-                file_contents[path] = content
+            # Skip if file too large
+            if content_file.size > self.max_file_size:
+                logger.debug(f"Skipping {path} (too large: {content_file.size} bytes)")
+                return None
 
-            except GithubException as e:
-                logger.debug(f"Could not fetch {path}: {e}")
-            except Exception as e:
-                logger.debug(f"Error reading {path}: {e}")
+            # Decode content
+            return content_file.decoded_content.decode('utf-8', errors='ignore')
 
-        return file_contents
+        except GithubException as e:
+            if is_backpressure_error(e):
+                raise
+            logger.debug(f"Could not fetch {path}: {e}")
+        except Exception as e:
+            logger.debug(f"Error reading {path}: {e}")
+        return None
 
     def _build_triage_prompt(self, repo_name: str, file_tree: List[str]) -> str:
         """Build Phase 1 triage prompt."""
@@ -422,23 +493,19 @@ class AITechnologyDetector:
         Returns:
             Dict mapping technology name to count of repos using it
         """
-        tech_counts = {}
-
-        for repo_techs in all_repo_techs:
-            # Flatten all categories
-            all_techs = set()
-            for category_techs in repo_techs.values():
-                all_techs.update(category_techs)
+        # Flatten categories into one set per repo so a tech listed under
+        # several categories is only counted once for that repo
+        tech_counts = Counter(chain.from_iterable(
+            set(chain.from_iterable(repo_techs.values()))
+            for repo_techs in all_repo_techs
+        ))
 
-            # Count occurrences
-            for tech in all_techs:
-                tech_counts[tech] = tech_counts.get(tech, 0) + 1
-
-        return tech_counts
+        return dict(tech_counts)
 
     def get_stats(self) -> Dict:
         """Get detection statistics."""
-        return {
-            **self.stats,
-            'cache_size': len(self.cache)
-        }
+        with self._lock:
+            return {
+                **self.stats,
+                'cache_size': len(self.cache)
+            }
@@ -10,12 +10,15 @@ Post-detection filter that uses AI to:
 
 import json
 import logging
+import threading
 import backoff
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Set, Tuple
 from collections import defaultdict
-from openai import OpenAI
 from openai import OpenAIError
 
+from http_clients import get_openai_client, get_openai_throttle
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,7 +57,7 @@ class AITechnologyFilter:
             openai_api_key: OpenAI API key
             config: Configuration dictionary
         """
-        self.client = OpenAI(api_key=openai_api_key)
+        self.client = get_openai_client(openai_api_key)
         self.config = config
 
         # Get filter config
@@ -80,6 +83,12 @@ class AITechnologyFilter:
         self.always_include_min_repos = overrides.get('always_include_if_repos_gte', 5)
         self.always_include_names = set(overrides.get('always_include_names', []))
 
+        # Concurrent strategic-value evaluations, throttled to the OpenAI limit
+        openai_config = config.get('openai', {})
+        self.concurrency = openai_config.get('concurrency', 8)
+        self.throttle = get_openai_throttle(openai_config.get('requests_per_minute', 500))
+        self._stats_lock = threading.Lock()
+
         # Stats
         self.stats = {
             'evaluated': 0,
@@ -231,11 +240,12 @@ class AITechnologyFilter:
                 tech_lookup[name]['deprecation_note'] = dep_info.get('note')
                 logger.info(f"Flagged deprecated: {name} → {dep_info.get('replacement')}")
 
-        # 5. Build final list
-        final_technologies = []
-        for tech in technologies:
-            if tech['name'] not in to_remove:
-                final_technologies.append(tech_lookup[tech['name']])
+        # 5. Build final list (single pass, set membership)
+        final_technologies = [
+            tech_lookup[tech['name']]
+            for tech in technologies
+            if tech['name'] not in to_remove
+        ]
 
         logger.info(f"Final count: {len(final_technologies)} (removed {len(to_remove)})")
         return final_technologies
@@ -248,63 +258,69 @@ class AITechnologyFilter:
             Dict mapping tech name to decision
         """
         decisions = {}
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for tech in technologies:
+                name = tech['name']
+                self.stats['evaluated'] += 1
+
+                # Check overrides first
+                if name in self.always_include_names:
+                    decisions[name] = {
+                        'should_include': True,
+                        'strategic_value': 'high',
+                        'reason': 'Explicitly configured to always include',
+                        'confidence': 'high'
+                    }
+                    self.stats['kept'] += 1
+                    continue
 
-        for tech in technologies:
-            name = tech['name']
-            self.stats['evaluated'] += 1
-
-            # Check overrides first
-            if name in self.always_include_names:
-                decisions[name] = {
-                    'should_include': True,
-                    'strategic_value': 'high',
-                    'reason': 'Explicitly configured to always include',
-                    'confidence': 'high'
-                }
-                self.stats['kept'] += 1
-                continue
+                if tech['metadata']['repos_count'] >= self.always_include_min_repos:
+                    decisions[name] = {
+                        'should_include': True,
+                        'strategic_value': 'medium',
+                        'reason': f"Used in {tech['metadata']['repos_count']} repos (above threshold)",
+                        'confidence': 'high'
+                    }
+                    self.stats['kept'] += 1
+                    continue
 
-            if tech['metadata']['repos_count'] >= self.always_include_min_repos:
-                decisions[name] = {
-                    'should_include': True,
-                    'strategic_value': 'medium',
-                    'reason': f"Used in {tech['metadata']['repos_count']} repos (above threshold)",
-                    'confidence': 'high'
-                }
-                self.stats['kept'] += 1
-                continue
+                # Auto-ignore rules
+                if self._should_auto_ignore(tech):
+                    decisions[name] = {
+                        'should_include': False,
+                        'strategic_value': 'low',
+                        'reason': 'Auto-ignored (utility/single-repo)',
+                        'confidence': 'high'
+                    }
+                    self.stats['removed'] += 1
+                    continue
 
-            # Auto-ignore rules
-            if self._should_auto_ignore(tech):
-                decisions[name] = {
-                    'should_include': False,
-                    'strategic_value': 'low',
-                    'reason': 'Auto-ignored (utility/single-repo)',
-                    'confidence': 'high'
-                }
-                self.stats['removed'] += 1
-                continue
+                # AI evaluation (runs concurrently, collected below in input order)
+                decisions[name] = None
+                pending[name] = executor.submit(self._evaluate_strategic_value, tech)
+
+            for name, future in pending.items():
+                try:
+                    decision = future.result()
+                    decisions[name] = decision
 
-            # AI evaluation
-            try:
-                decision = self._evaluate_strategic_value(tech)
-                decisions[name] = decision
+                    if decision.get('should_include', True):
+                        self.stats['kept'] += 1
+                    else:
+                        self.stats['removed'] += 1
 
-                if decision.get('should_include', True):
+                except Exception as e:
+                    logger.error(f"Error evaluating {name}: {e}")
+                    # Default to keeping if AI fails
+                    decisions[name] = {
+                        'should_include': True,
+                        'strategic_value': 'unknown',
+                        'reason': 'AI evaluation failed, kept by default',
+                        'confidence': 'low'
+                    }
                     self.stats['kept'] += 1
-                else:
-                    self.stats['removed'] += 1
-
-            except Exception as e:
-                logger.error(f"Error evaluating {name}: {e}")
-                # Default to keeping if AI fails
-                decisions[name] = {
-                    'should_include': True,
-                    'strategic_value': 'unknown',
-                    'reason': 'AI evaluation failed, kept by default',
-                    'confidence': 'low'
-                }
-                self.stats['kept'] += 1
 
         return decisions
 
@@ -346,6 +362,7 @@ class AITechnologyFilter:
         """
         prompt = self._build_strategic_value_prompt(tech)
 
+        self.throttle.wait()
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[
@@ -364,7 +381,8 @@ class AITechnologyFilter:
             timeout=15
         )
 
-        self.stats['ai_calls'] += 1
+        with self._stats_lock:
+            self.stats['ai_calls'] += 1
 
         result = json.loads(response.choices[0].message.content)
 
@@ -446,6 +464,7 @@ class AITechnologyFilter:
         """AI detection of duplicates in a group."""
         prompt = self._build_duplicate_detection_prompt(tech_group)
 
+        self.throttle.wait()
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[
@@ -509,6 +528,7 @@ class AITechnologyFilter:
         """AI detection of parent-child relationship."""
         prompt = self._build_hierarchy_detection_prompt(parent, children)
 
+        self.throttle.wait()
         response = self.client.chat.completions.create(
             model=self.model,
             messages=[
@@ -2,9 +2,12 @@
 AI-powered technology classification using OpenAI.
 """
 
+import re
 import logging
 import json
+import fnmatch
 import backoff
+from bisect import bisect_right
 from typing import Dict, List, Optional
 from openai import OpenAI
 from openai import OpenAIError
@@ -31,6 +34,23 @@ class TechnologyClassifier:
         3: "Hold"     # Proceed with caution
     }
 
+    # Name keywords for the fallback quadrant guess, checked in order
+    QUADRANT_KEYWORDS = (
+        # Languages & Frameworks
+        (3, ('python', 'javascript', 'typescript', 'java', 'go', 'rust', 'php', 'ruby', 'c++', 'c#',
+             'react', 'vue', 'angular', 'django', 'flask', 'express', 'next.js', 'rails', 'laravel')),
+        # Platforms
+        (2, ('docker', 'kubernetes', 'aws', 'azure', 'gcp', 'postgres', 'mysql', 'mongodb', 'redis')),
+        # Tools
+        (1, ('webpack', 'vite', 'jest', 'pytest', 'eslint', 'prettier', 'github', 'gitlab', 'jenkins')),
+    )
+
+    # One compiled alternation per quadrant, scanned once per name
+    QUADRANT_PATTERNS = tuple(
+        (quadrant, re.compile('|'.join(map(re.escape, keywords))))
+        for quadrant, keywords in QUADRANT_KEYWORDS
+    )
+
     def __init__(self, api_key: str, config: dict):
         """
         Initialize classifier.
@@ -45,6 +65,21 @@ class TechnologyClassifier:
         self.max_tokens = config['openai'].get('max_tokens', 1000)
         self.temperature = config['openai'].get('temperature', 0.3)
 
+        # Ring cutoffs as ascending percentages (assess, trial, adopt)
+        thresholds = config['classification']['thresholds']
+        self._ring_cutoffs = (
+            thresholds['assess'] * 100,
+            thresholds['trial'] * 100,
+            thresholds['adopt'] * 100
+        )
+
+        # Exclude globs combined into one case-insensitive regex
+        exclude_patterns = config['classification'].get('exclude_patterns', [])
+        self._exclude_re = (
+            re.compile('|'.join(fnmatch.translate(p) for p in exclude_patterns), re.IGNORECASE)
+            if exclude_patterns else None
+        )
+
     def classify_technologies(
         self,
         tech_counts: Dict[str, int],
@@ -164,7 +199,7 @@ class TechnologyClassifier:
             # Validate and build final classification
             return {
                 "name": tech_name,
-                "quadrant": result.get("quadrant", self._infer_quadrant(tech_name)),
+                "quadrant": result["quadrant"] if "quadrant" in result else self._infer_quadrant(tech_name),
                 "ring": ring,
                 "description": result.get("description", f"{tech_name} is used in {count} repositories."),
                 "metadata": {
@@ -238,16 +273,8 @@ Respond with valid JSON only."""
         Returns:
             Ring number (0-3)
         """
-        thresholds = self.config['classification']['thresholds']
-
-        if usage_percentage >= thresholds['adopt'] * 100:
-            return 0  # Adopt
-        elif usage_percentage >= thresholds['trial'] * 100:
-            return 1  # Trial
-        elif usage_percentage >= thresholds['assess'] * 100:
-            return 2  # Assess
-        else:
-            return 3  # Hold
+        # Each cutoff reached moves the tech one ring inwards from Hold (3)
+        return 3 - bisect_right(self._ring_cutoffs, usage_percentage)
 
     def _infer_quadrant(self, tech_name: str) -> int:
         """
@@ -261,24 +288,11 @@ Respond with valid JSON only."""
         """
         tech_lower = tech_name.lower()
 
-        # Languages & Frameworks
-        languages = ['python', 'javascript', 'typescript', 'java', 'go', 'rust', 'php', 'ruby', 'c++', 'c#']
-        frameworks = ['react', 'vue', 'angular', 'django', 'flask', 'express', 'next.js', 'rails', 'laravel']
+        # First quadrant with a keyword in the name, else Techniques
+        for quadrant, pattern in self.QUADRANT_PATTERNS:
+            if pattern.search(tech_lower):
+                return quadrant
 
-        if any(lang in tech_lower for lang in languages + frameworks):
-            return 3
-
-        # Platforms
-        platforms = ['docker', 'kubernetes', 'aws', 'azure', 'gcp', 'postgres', 'mysql', 'mongodb', 'redis']
-        if any(plat in tech_lower for plat in platforms):
-            return 2
-
-        # Tools
-        tools = ['webpack', 'vite', 'jest', 'pytest', 'eslint', 'prettier', 'github', 'gitlab', 'jenkins']
-        if any(tool in tech_lower for tool in tools):
-            return 1
-
-        # Default to Techniques
         return 0
 
     def _get_example_repos(self, tech_name: str, repo_details: List[Dict], limit: int = 5) -> List[str]:
@@ -299,13 +313,7 @@ Respond with valid JSON only."""
 
     def _should_exclude(self, tech_name: str) -> bool:
         """Check if technology should be excluded."""
-        import fnmatch
-
-        exclude_patterns = self.config['classification'].get('exclude_patterns', [])
-        for pattern in exclude_patterns:
-            if fnmatch.fnmatch(tech_name.lower(), pattern.lower()):
-                return True
-        return False
+        return bool(self._exclude_re and self._exclude_re.match(tech_name))
 
     def _fallback_classification(
         self,
@@ -2,14 +2,19 @@
 Enhanced AI-powered technology classification with temporal analysis and confidence scoring.
 """
 
+import re
 import logging
 import json
+import fnmatch
 import backoff
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from openai import OpenAI
 from openai import OpenAIError
 
 from temporal_analyzer import TemporalAnalyzer
+from http_clients import CompletionCache, get_openai_client, get_openai_throttle
 
 logger = logging.getLogger(__name__)
 
@@ -33,21 +38,90 @@ class EnhancedTechnologyClassifier:
         3: "Hold"     # Proceed with caution
     }
 
-    def __init__(self, api_key: str, config: dict):
+    # Instructions shared by every classification request. Kept byte-identical
+    # and ahead of the per-technology data so the provider can reuse the
+    # cached prompt prefix across calls.
+    SYSTEM_PROMPT = """You are a technology expert helping to classify technologies for a tech radar. Provide strategic, industry-informed classifications.
+
+**Quadrants:**
+0 = Techniques (practices, methodologies like CI/CD, DevOps practices)
+1 = Tools (development tools like Maven, GitHub Actions, Jest)
+2 = Platforms (infrastructure like Docker, AWS, Kubernetes, databases)
+3 = Languages & Frameworks (like Java, React, Python, Kotlin)
+
+**Rings (STRATEGIC, not just usage-based):**
+0 = ADOPT: Mature, proven, industry standard. Recommend for production.
+1 = TRIAL: Promising, worth pursuing. Try in new projects.
+2 = ASSESS: Emerging, experimental. Worth exploring.
+3 = HOLD: Legacy, deprecated, or better alternatives exist.
+
+**Your Task:**
+Provide JSON with:
+1. "quadrant": The appropriate quadrant (0-3)
+2. "description": 1-2 sentences explaining what it is and why it's in the suggested ring
+3. "ai_confidence": "high", "medium", or "low"
+
+**Consider:**
+- Industry standards (not just our usage)
+- Technology maturity and ecosystem
+- Better alternatives available?
+- Is low usage due to being new or obsolete?
+
+Respond with valid JSON only."""
+
+    # Name keywords for the fallback quadrant guess, checked in order
+    QUADRANT_KEYWORDS = (
+        # Languages & Frameworks
+        (3, ('python', 'javascript', 'typescript', 'java', 'go', 'rust', 'php', 'ruby', 'kotlin', 'c++', 'c#',
+             'react', 'vue', 'angular', 'django', 'flask', 'express', 'next.js', 'rails', 'laravel')),
+        # Platforms
+        (2, ('docker', 'kubernetes', 'aws', 'azure', 'gcp', 'postgres', 'mysql', 'mongodb', 'redis')),
+        # Tools
+        (1, ('webpack', 'vite', 'jest', 'pytest', 'eslint', 'prettier', 'github', 'maven', 'gradle')),
+    )
+
+    # One compiled alternation per quadrant, scanned once per name
+    QUADRANT_PATTERNS = tuple(
+        (quadrant, re.compile('|'.join(map(re.escape, keywords))))
+        for quadrant, keywords in QUADRANT_KEYWORDS
+    )
+
+    # Completion budget per technology in a batch request
+    BATCH_TOKENS_PER_TECH = 120
+
+    def __init__(self, api_key: str, config: dict, cache_path: Optional[Path] = None):
         """
         Initialize classifier.
 
         Args:
             api_key: OpenAI API key
             config: Configuration dictionary
+            cache_path: Optional shelve path to persist AI responses across runs
         """
-        self.client = OpenAI(api_key=api_key)
+        self.client = get_openai_client(api_key)
         self.config = config
         self.model = config['openai']['model']
         self.max_tokens = config['openai'].get('max_tokens', 1000)
         self.temperature = config['openai'].get('temperature', 0.3)
         self.temporal_analyzer = TemporalAnalyzer()
 
+        # Concurrent AI classifications, throttled to the OpenAI per-minute limit
+        self.concurrency = config['openai'].get('concurrency', 8)
+        self.throttle = get_openai_throttle(config['openai'].get('requests_per_minute', 500))
+
+        # Technologies classified per AI request (one round-trip per batch)
+        self.batch_size = max(1, config['openai'].get('classification_batch_size', 15))
+
+        # Identical prompts (unchanged usage and trend) reuse the stored answer
+        self.response_cache = CompletionCache(cache_path)
+
+        # Exclude globs combined into one case-insensitive regex
+        exclude_patterns = config['classification'].get('exclude_patterns', [])
+        self._exclude_re = (
+            re.compile('|'.join(fnmatch.translate(p) for p in exclude_patterns), re.IGNORECASE)
+            if exclude_patterns else None
+        )
+
     def classify_technologies(
         self,
         tech_counts: Dict[str, int],
@@ -70,6 +144,7 @@ class EnhancedTechnologyClassifier:
         default_min_repos = self.config['classification'].get('min_repos', 2)
         min_repos_by_domain = self.config['classification'].get('min_repos_by_domain', {})
 
+        candidates = []
         for tech_name, count in sorted(tech_counts.items(), key=lambda x: x[1], reverse=True):
             # Domain-aware min_repos check
             should_include = self._meets_domain_threshold(
@@ -86,27 +161,28 @@ class EnhancedTechnologyClassifier:
                 logger.debug(f"Skipping {tech_name} (matches exclude pattern)")
                 continue
 
-            try:
-                usage_percentage = (count / total_repos) * 100
-
-                logger.info(f"Classifying {tech_name} ({count}/{total_repos} repos, {usage_percentage:.1f}%)")
-
-                # Get temporal analysis
-                temporal_data = self.temporal_analyzer.analyze_technology(
-                    tech_name,
-                    repo_details
-                )
-
-                # Classify with enhanced logic
-                classification = self._classify_single_enhanced(
-                    tech_name,
-                    count,
-                    total_repos,
-                    usage_percentage,
-                    temporal_data,
-                    repo_details
-                )
+            candidates.append((tech_name, count))
 
+        # Temporal analysis and ring decisions are local; only the AI text needs the API
+        prepared = [
+            candidate for candidate in (
+                self._prepare_candidate(tech_name, count, total_repos, repo_details)
+                for tech_name, count in candidates
+            )
+            if candidate
+        ]
+
+        # Several technologies share each AI request and batches run
+        # concurrently (network-bound); results keep input order
+        batches = [
+            prepared[i:i + self.batch_size]
+            for i in range(0, len(prepared), self.batch_size)
+        ]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            ai_results = chain.from_iterable(executor.map(self._get_ai_classifications, batches))
+
+            for candidate, ai_result in zip(prepared, ai_results):
+                classification = self._finish_candidate(candidate, ai_result)
                 if classification:
                     # Split based on confidence
                     if classification['confidence'] >= 0.75:
@@ -114,11 +190,67 @@ class EnhancedTechnologyClassifier:
                     else:
                         needs_review.append(classification)
 
-            except Exception as e:
-                logger.error(f"Error classifying {tech_name}: {e}")
-
         return high_confidence, needs_review
 
+    def _prepare_candidate(
+        self,
+        tech_name: str,
+        count: int,
+        total_repos: int,
+        repo_details: List[Dict]
+    ) -> Optional[Dict]:
+        """Run temporal analysis and the ring decision for one technology."""
+        try:
+            usage_percentage = (count / total_repos) * 100
+
+            logger.info(f"Classifying {tech_name} ({count}/{total_repos} repos, {usage_percentage:.1f}%)")
+
+            # Get temporal analysis
+            temporal_data = self.temporal_analyzer.analyze_technology(
+                tech_name,
+                repo_details
+            )
+
+            # Suggested ring for the AI prompt
+            ring, _ = self._smart_ring_decision(
+                usage_percentage / 100,
+                temporal_data['recency_score'],
+                temporal_data['activity_score'],
+                temporal_data['trend'],
+                temporal_data
+            )
+
+            return {
+                'tech_name': tech_name,
+                'count': count,
+                'total_repos': total_repos,
+                'usage_percentage': usage_percentage,
+                'temporal_data': temporal_data,
+                'ring': ring,
+                'repo_details': repo_details
+            }
+
+        except Exception as e:
+            logger.error(f"Error classifying {tech_name}: {e}")
+            return None
+
+    def _finish_candidate(self, candidate: Dict, ai_result: Dict) -> Optional[Dict]:
+        """Build the classification for a prepared technology from its AI result."""
+        try:
+            return self._classify_single_enhanced(
+                candidate['tech_name'],
+                candidate['count'],
+                candidate['total_repos'],
+                candidate['usage_percentage'],
+                candidate['temporal_data'],
+                candidate['repo_details'],
+                ai_result=ai_result
+            )
+
+        except Exception as e:
+            logger.error(f"Error classifying {candidate['tech_name']}: {e}")
+            return None
+
     def _classify_single_enhanced(
         self,
         tech_name: str,
@@ -126,7 +258,8 @@ class EnhancedTechnologyClassifier:
         total_repos: int,
         usage_percentage: float,
         temporal_data: Dict,
-        repo_details: List[Dict]
+        repo_details: List[Dict],
+        ai_result: Optional[Dict] = None
     ) -> Optional[Dict]:
         """
         Classify a single technology with temporal analysis.
@@ -138,6 +271,7 @@ class EnhancedTechnologyClassifier:
             usage_percentage: Percentage of repos using it
             temporal_data: Temporal analysis data
             repo_details: Repository details for context
+            ai_result: AI classification from a batch request (fetched if omitted)
 
         Returns:
             Classification dict or None
@@ -157,12 +291,13 @@ class EnhancedTechnologyClassifier:
         )
 
         # Get AI classification
-        ai_result = self._get_ai_classification(
-            tech_name,
-            usage_percentage,
-            temporal_data,
-            ring
-        )
+        if ai_result is None:
+            ai_result = self._get_ai_classification(
+                tech_name,
+                usage_percentage,
+                temporal_data,
+                ring
+            )
 
         # Convert AI confidence string to float
         ai_confidence_str = ai_result.get('ai_confidence', 'medium')
@@ -219,7 +354,7 @@ class EnhancedTechnologyClassifier:
 
         return {
             "name": tech_name,
-            "quadrant": ai_result.get("quadrant", self._infer_quadrant(tech_name)),
+            "quadrant": ai_result["quadrant"] if "quadrant" in ai_result else self._infer_quadrant(tech_name),
             "ring": ring,
             "description": ai_result.get("description", f"{tech_name} is used in {count} repositories."),
             "confidence": round(confidence, 3),
@@ -432,31 +567,143 @@ class EnhancedTechnologyClassifier:
             suggested_ring
         )
 
+        request = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+
         try:
+            content = self.response_cache.get(request)
+            if content is not None:
+                return json.loads(content)
+
+            self.throttle.wait()
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a technology expert helping to classify technologies for a tech radar. Provide strategic, industry-informed classifications."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
+                **request,
                 response_format={"type": "json_object"}
             )
+            content = response.choices[0].message.content
+            result = json.loads(content)
 
-            result = json.loads(response.choices[0].message.content)
+            # Only parseable answers are stored; fallbacks are retried next run
+            self.response_cache.put(request, content)
             return result
 
         except Exception as e:
             logger.error(f"AI classification failed for {tech_name}: {e}")
             return self._fallback_classification(tech_name, usage_percentage, suggested_ring)
 
+    def _get_ai_classifications(self, batch: List[Dict]) -> List[Dict]:
+        """
+        Get AI classifications for a batch of prepared technologies in one request.
+
+        Technologies missing from the batch answer (or a failed batch) are
+        classified individually.
+
+        Args:
+            batch: Prepared candidates (see _prepare_candidate)
+
+        Returns:
+            AI results in batch order
+        """
+        results = {}
+        if len(batch) > 1:
+            try:
+                results = self._get_ai_classification_batch(batch)
+            except Exception as e:
+                logger.warning(f"Batch classification of {len(batch)} technologies failed, classifying individually: {e}")
+
+        return [
+            results.get(candidate['tech_name']) or self._get_ai_classification(
+                candidate['tech_name'],
+                candidate['usage_percentage'],
+                candidate['temporal_data'],
+                candidate['ring']
+            )
+            for candidate in batch
+        ]
+
+    @backoff.on_exception(
+        backoff.expo,
+        OpenAIError,
+        max_tries=3,
+        max_time=60
+    )
+    def _get_ai_classification_batch(self, batch: List[Dict]) -> Dict[str, Dict]:
+        """Classify several technologies with one AI request (name -> AI result)."""
+        sections = [
+            f"{number}. \"{candidate['tech_name']}\"\n" + self._build_usage_section(
+                candidate['usage_percentage'],
+                candidate['temporal_data'],
+                candidate['ring']
+            )
+            for number, candidate in enumerate(batch, 1)
+        ]
+        prompt = (
+            f"Classify the following {len(batch)} technologies for a tech radar.\n\n"
+            + "\n\n".join(sections)
+            + '\n\nRespond with a JSON object {"classifications": [...]} containing one object '
+            'per technology, in the order given, each with "name" (exactly as given) plus '
+            '"quadrant", "description" and "ai_confidence".'
+        )
+
+        request = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": max(self.max_tokens, self.BATCH_TOKENS_PER_TECH * len(batch)),
+            "temperature": self.temperature
+        }
+
+        content = self.response_cache.get(request)
+        cached = content is not None
+        if not cached:
+            self.throttle.wait()
+            response = self.client.chat.completions.create(
+                **request,
+                response_format={"type": "json_object"}
+            )
+            content = response.choices[0].message.content
+
+        results = {
+            item['name']: item
+            for item in json.loads(content).get('classifications', [])
+            if isinstance(item, dict) and 'name' in item
+        }
+
+        # Store only complete answers; partial ones are retried next run
+        if not cached and all(candidate['tech_name'] in results for candidate in batch):
+            self.response_cache.put(request, content)
+
+        return results
+
+    def save_cache(self) -> None:
+        """Flush persistent AI responses to disk."""
+        self.response_cache.sync()
+
+    def invalidate_cache(self) -> None:
+        """Drop all persisted AI responses."""
+        self.response_cache.clear()
+
     def _build_enhanced_prompt(
         self,
         tech_name: str,
@@ -464,66 +711,36 @@ class EnhancedTechnologyClassifier:
         temporal_data: Dict,
         suggested_ring: int
     ) -> str:
-        """Build enhanced prompt with temporal context."""
-        ring_name = self.RINGS[suggested_ring]
-
+        """Build the per-technology part of the prompt (instructions are in SYSTEM_PROMPT)."""
         return f"""Classify the technology "{tech_name}" for a tech radar.
 
-**Our Usage:**
+""" + self._build_usage_section(usage_percentage, temporal_data, suggested_ring)
+
+    def _build_usage_section(
+        self,
+        usage_percentage: float,
+        temporal_data: Dict,
+        suggested_ring: int
+    ) -> str:
+        """Describe our usage of one technology for the prompt."""
+        ring_name = self.RINGS[suggested_ring]
+
+        return f"""**Our Usage:**
 - Found in {temporal_data['total_repos']} repositories ({usage_percentage:.1f}%)
 - Recent adoption: {temporal_data['recent_repos']} repos in last 6 months
 - Active repos: {temporal_data['active_repos']} out of {temporal_data['total_repos']}
 - Trend: {temporal_data['trend']}
-- Suggested ring: {ring_name}
-
-**Quadrants:**
-0 = Techniques (practices, methodologies like CI/CD, DevOps practices)
-1 = Tools (development tools like Maven, GitHub Actions, Jest)
-2 = Platforms (infrastructure like Docker, AWS, Kubernetes, databases)
-3 = Languages & Frameworks (like Java, React, Python, Kotlin)
-
-**Rings (STRATEGIC, not just usage-based):**
-0 = ADOPT: Mature, proven, industry standard. Recommend for production.
-1 = TRIAL: Promising, worth pursuing. Try in new projects.
-2 = ASSESS: Emerging, experimental. Worth exploring.
-3 = HOLD: Legacy, deprecated, or better alternatives exist.
-
-**Your Task:**
-Provide JSON with:
-1. "quadrant": The appropriate quadrant (0-3)
-2. "description": 1-2 sentences explaining what it is and why it's in {ring_name}
-3. "ai_confidence": "high", "medium", or "low"
-
-**Consider:**
-- Industry standards (not just our usage)
-- Technology maturity and ecosystem
-- Better alternatives available?
-- Is low usage due to being new or obsolete?
-
-Respond with valid JSON only."""
+- Suggested ring: {ring_name}"""
 
     def _infer_quadrant(self, tech_name: str) -> int:
         """Infer quadrant from technology name (fallback)."""
         tech_lower = tech_name.lower()
 
-        # Languages & Frameworks
-        languages = ['python', 'javascript', 'typescript', 'java', 'go', 'rust', 'php', 'ruby', 'kotlin', 'c++', 'c#']
-        frameworks = ['react', 'vue', 'angular', 'django', 'flask', 'express', 'next.js', 'rails', 'laravel']
-
-        if any(lang in tech_lower for lang in languages + frameworks):
-            return 3
-
-        # Platforms
-        platforms = ['docker', 'kubernetes', 'aws', 'azure', 'gcp', 'postgres', 'mysql', 'mongodb', 'redis']
-        if any(plat in tech_lower for plat in platforms):
-            return 2
-
-        # Tools
-        tools = ['webpack', 'vite', 'jest', 'pytest', 'eslint', 'prettier', 'github', 'maven', 'gradle']
-        if any(tool in tech_lower for tool in tools):
-            return 1
+        # First quadrant with a keyword in the name, else Techniques
+        for quadrant, pattern in self.QUADRANT_PATTERNS:
+            if pattern.search(tech_lower):
+                return quadrant
 
-        # Default to Techniques
         return 0
 
     def _convert_ai_confidence(self, ai_confidence: str) -> float:
@@ -567,21 +784,11 @@ Respond with valid JSON only."""
         # Count repos per domain for this technology
         domain_counts = {}
 
-        for repo in repo_details:
-            # Check if this repo uses this technology
-            repo_techs = repo.get('technologies', {})
-            has_tech = False
-
-            for category, techs in repo_techs.items():
-                if tech_name in techs:
-                    has_tech = True
-                    break
-
-            if has_tech:
-                # Domain is a dict: {'domain': 'backend', 'confidence': 0.95, ...}
-                domain_data = repo.get('domain', {})
-                domain = domain_data.get('domain', 'unknown') if domain_data else 'unknown'
-                domain_counts[domain] = domain_counts.get(domain, 0) + 1
+        for repo in self.temporal_analyzer.repos_with_technology(tech_name, repo_details):
+            # Domain is a dict: {'domain': 'backend', 'confidence': 0.95, ...}
+            domain_data = repo.get('domain', {})
+            domain = domain_data.get('domain', 'unknown') if domain_data else 'unknown'
+            domain_counts[domain] = domain_counts.get(domain, 0) + 1
 
         # Check if meets threshold in any domain
         for domain, count in domain_counts.items():
@@ -604,13 +811,7 @@ Respond with valid JSON only."""
 
     def _should_exclude(self, tech_name: str) -> bool:
         """Check if technology should be excluded."""
-        import fnmatch
-
-        exclude_patterns = self.config['classification'].get('exclude_patterns', [])
-        for pattern in exclude_patterns:
-            if fnmatch.fnmatch(tech_name.lower(), pattern.lower()):
-                return True
-        return False
+        return bool(self._exclude_re and self._exclude_re.match(tech_name))
 
     def _fallback_classification(
         self,
@@ -3,14 +3,42 @@ Configuration management for Tech Radar ETL.
 """
 
 import os
+import copy
 import yaml
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader when PyYAML was built with it (same safe subset as SafeLoader)
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@lru_cache(maxsize=None)
+def _parse_yaml_file(path: str) -> Dict[str, Any]:
+    """Parse a YAML file (once per process per path)."""
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
+def load_yaml_config(path: str = 'config/config.yaml') -> Dict[str, Any]:
+    """
+    Load a YAML config file without environment validation (for scripts).
+
+    The file is parsed once per process; each call returns its own copy
+    so callers can modify it freely.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Configuration dictionary
+    """
+    return copy.deepcopy(_parse_yaml_file(os.path.abspath(path)))
+
 
 class Config:
     """Manages configuration from YAML and environment variables."""
@@ -44,7 +72,7 @@ class Config:
         """Load YAML configuration file."""
         try:
             with open(path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YAML_LOADER)
                 logger.info(f"Loaded configuration from {path}")
                 return config
         except FileNotFoundError:
@@ -127,6 +155,25 @@ class Config:
 
         return Path(checkpoint_file)
 
+    def get_cache_dir(self) -> Optional[Path]:
+        """Get on-disk cache directory (None if caching is disabled)."""
+        cache_config = self.config.get('cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+
+        cache_dir = cache_config.get('dir', '.cache')
+
+        # If relative path, make it relative to data-etl directory
+        if not os.path.isabs(cache_dir):
+            base_dir = os.path.dirname(os.path.dirname(__file__))
+            cache_dir = os.path.join(base_dir, cache_dir)
+
+        # Create cache directory if it doesn't exist
+        cache_path = Path(cache_dir)
+        cache_path.mkdir(parents=True, exist_ok=True)
+
+        return cache_path
+
     def __getitem__(self, key: str) -> Any:
         """Allow dict-like access to config."""
         return self.config[key]
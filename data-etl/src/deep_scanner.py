@@ -6,16 +6,69 @@ and identify technologies without hardcoded patterns.
 """
 
 import os
+import re
+import heapq
+import fnmatch
 import json
+import queue
+import shelve
+import hashlib
+import atexit
 import logging
 import tempfile
-import shutil
+import threading
 import subprocess
-from typing import Dict, List, Set
-from openai import OpenAI
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from http_clients import get_openai_client, get_openai_throttle
 
 logger = logging.getLogger(__name__)
 
+# Branch connectors used by the `tree` command: '├── ' / '└── ', or
+# '|-- ' / '`-- ' when tree falls back to ASCII (e.g. under a C locale)
+TREE_CONNECTOR = re.compile('[├└]|[|`]--')
+
+# Failed AI responses are written to disk by a background thread so the
+# retry loop never blocks on file I/O
+_debug_dump_queue = queue.Queue()
+_debug_dump_thread = None
+_debug_dump_lock = threading.Lock()
+
+
+def _write_debug_dumps() -> None:
+    """Drain the debug dump queue, writing each (path, content) pair."""
+    while True:
+        debug_file, content = _debug_dump_queue.get()
+        try:
+            os.makedirs(os.path.dirname(debug_file) or '.', exist_ok=True)
+            with open(debug_file, 'w') as f:
+                f.write(content)
+            logger.error(f"Saved failed response to {debug_file} for debugging")
+        except Exception as e:
+            logger.debug(f"Could not save failed response to {debug_file}: {e}")
+        finally:
+            _debug_dump_queue.task_done()
+
+
+def _queue_debug_dump(debug_file: str, content: str) -> None:
+    """Queue a failed response to be written, starting the writer on first use."""
+    global _debug_dump_thread
+
+    with _debug_dump_lock:
+        if _debug_dump_thread is None:
+            _debug_dump_thread = threading.Thread(
+                target=_write_debug_dumps,
+                name='deep-scan-debug-writer',
+                daemon=True
+            )
+            _debug_dump_thread.start()
+            # Flush pending dumps before the interpreter exits
+            atexit.register(_debug_dump_queue.join)
+
+    _debug_dump_queue.put((debug_file, content))
+
 
 class DeepScanner:
     """
@@ -24,18 +77,22 @@ class DeepScanner:
     Completely organization-agnostic - works with any repo structure.
     """
 
-    def __init__(self, openai_api_key: str, config: Dict):
+    def __init__(self, openai_api_key: str, config: Dict, cache_path: Optional[Path] = None):
         """
         Initialize deep scanner.
 
         Args:
             openai_api_key: OpenAI API key for AI analysis
             config: Configuration dictionary
+            cache_path: Optional shelve path to persist results across runs
         """
-        self.client = OpenAI(api_key=openai_api_key)
+        self.client = get_openai_client(openai_api_key)
         self.config = config
         self.model = config.get('openai', {}).get('model', 'gpt-4o-mini')
 
+        # Shared with every other OpenAI caller (repos are scanned concurrently)
+        self.throttle = get_openai_throttle(config.get('openai', {}).get('requests_per_minute', 500))
+
         # Get deep scan config
         self.deep_scan_config = config.get('deep_scan', {})
         self.tree_max_depth = self.deep_scan_config.get('tree', {}).get('max_depth', 6)
@@ -43,6 +100,22 @@ class DeepScanner:
             '.git', 'node_modules', '.terraform', '__pycache__', '*.pyc'
         ])
 
+        # Ignore globs combined into one regex (matched against entry names, like `tree -I`)
+        self._ignore_re = (
+            re.compile('|'.join(fnmatch.translate(p) for p in self.tree_ignore))
+            if self.tree_ignore else None
+        )
+
+        # On-disk results keyed by tree hash (an unchanged tree skips AI)
+        self.persistent_cache = None
+        self._cache_lock = threading.Lock()
+        if cache_path:
+            try:
+                self.persistent_cache = shelve.open(str(cache_path))
+                logger.info(f"Using deep scan cache: {cache_path} ({len(self.persistent_cache)} entries)")
+            except Exception as e:
+                logger.warning(f"Could not open deep scan cache {cache_path}: {e}")
+
     def should_deep_scan(self, repo_name: str) -> bool:
         """
         Check if repository should be deep scanned.
@@ -71,16 +144,23 @@ class DeepScanner:
         """
         logger.info(f"🔍 Deep scanning {repo.name}...")
 
-        temp_dir = None
         try:
-            # 1. Shallow clone
-            temp_dir = self._shallow_clone(repo)
-
-            # 2. Generate tree
-            tree_content = self._generate_tree(temp_dir, repo.name)
-
-            # 3. AI analyzes tree
-            technologies = self._ai_analyze_tree(repo.name, tree_content)
+            # Temp dir is removed automatically, even if clone or analysis fails
+            with tempfile.TemporaryDirectory(prefix=f'scan_{repo.name}_') as temp_dir:
+                # 1. Shallow clone
+                self._shallow_clone(repo, temp_dir)
+
+                # 2. Generate tree
+                tree_content = self._generate_tree(temp_dir, repo.name)
+
+            # 3. AI analyzes tree (skipped if this exact tree was analyzed before)
+            cache_key = self._tree_key(repo.name, tree_content)
+            technologies = self._lookup_persistent(cache_key)
+            if technologies is None:
+                technologies = self._ai_analyze_tree(repo.name, tree_content)
+                self._store_persistent(cache_key, technologies)
+            else:
+                logger.info(f"Deep scan cache hit for {repo.name}")
 
             logger.info(f"✅ Deep scan found {len(technologies)} technologies in {repo.name}")
             return technologies
@@ -89,23 +169,53 @@ class DeepScanner:
             logger.error(f"Error deep scanning {repo.name}: {e}")
             return set()
 
-        finally:
-            # Always cleanup
-            if temp_dir and os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir, ignore_errors=True)
-
-    def _shallow_clone(self, repo) -> str:
+    def _tree_key(self, repo_name: str, tree_content: str) -> str:
+        """Build persistent cache key from repo name and its tree."""
+        return hashlib.blake2b(
+            f"{repo_name}:{tree_content}".encode(),
+            digest_size=16
+        ).hexdigest()
+
+    def _lookup_persistent(self, cache_key: str) -> Optional[Set[str]]:
+        """Return the stored result for an unchanged tree, if any."""
+        if self.persistent_cache is None:
+            return None
+
+        with self._cache_lock:
+            return self.persistent_cache.get(cache_key)
+
+    def _store_persistent(self, cache_key: str, technologies: Set[str]) -> None:
+        """Write a successful AI result through to the on-disk cache."""
+        # Failed analyses come back empty; retry those next run
+        if self.persistent_cache is None or not technologies:
+            return
+
+        with self._cache_lock:
+            self.persistent_cache[cache_key] = technologies
+
+    def save_cache(self) -> None:
+        """Flush persistent deep scan cache to disk."""
+        if self.persistent_cache is not None:
+            with self._cache_lock:
+                self.persistent_cache.sync()
+
+    def invalidate_cache(self) -> None:
+        """Drop all persisted deep scan results."""
+        if self.persistent_cache is not None:
+            with self._cache_lock:
+                self.persistent_cache.clear()
+
+    def _shallow_clone(self, repo, temp_dir: str) -> str:
         """
-        Shallow clone repository to temp directory.
+        Shallow clone repository into an existing temp directory.
 
         Args:
             repo: GitHub repository object
+            temp_dir: Empty directory to clone into (caller owns cleanup)
 
         Returns:
             Path to cloned repository
         """
-        temp_dir = tempfile.mkdtemp(prefix=f'scan_{repo.name}_')
-
         logger.info(f"Cloning {repo.name} to {temp_dir}...")
 
         try:
@@ -127,18 +237,14 @@ class DeepScanner:
 
         except subprocess.TimeoutExpired:
             raise Exception(f"Git clone timeout for {repo.name}")
-        except Exception as e:
-            # Cleanup on failure
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir, ignore_errors=True)
-            raise e
 
     def _generate_tree(self, repo_path: str, repo_name: str) -> str:
         """
         Generate repository tree structure.
 
         Simple approach: Generate full tree at configured depth.
-        If too large for AI (>100K chars ~= 130K tokens), reduce depth and retry.
+        If too large for AI (>100K chars ~= 130K tokens), prune the deepest
+        level from the output we already have instead of re-running `tree`.
         Let AI discover everything - no hardcoded patterns.
 
         Args:
@@ -153,62 +259,85 @@ class DeepScanner:
         # Build ignore pattern for tree command
         ignore_pattern = '|'.join(self.tree_ignore)
 
-        # Start with configured depth, reduce if needed
+        # Single tree invocation at the configured depth
         depth = self.tree_max_depth
-        max_attempts = 4
 
-        for attempt in range(max_attempts):
-            try:
-                result = subprocess.run([
-                    'tree',
-                    '-a',                    # Show all files
-                    '-I', ignore_pattern,    # Ignore patterns
-                    '--dirsfirst',           # Directories first
-                    '-L', str(depth),        # Current depth
-                    '--noreport',            # No summary
-                    repo_path
-                ], capture_output=True, text=True, timeout=30)
-
-                if result.returncode != 0:
-                    logger.warning(f"tree command failed, using fallback")
-                    return self._fallback_tree(repo_path)
-
-                tree_content = result.stdout
-
-                # Check if within token limits
-                # 128K token limit, ~1.3 tokens/char, so ~98K chars max
-                # Use 80K to be safe with prompt
-                max_chars = 80000
-
-                if len(tree_content) <= max_chars:
-                    logger.info(f"✓ Generated tree at depth {depth} ({len(tree_content)} chars)")
-                    return tree_content
-
-                # Too large, reduce depth and retry
-                if attempt < max_attempts - 1:
-                    depth = max(3, depth - 1)
-                    logger.info(f"Tree too large ({len(tree_content)} chars), retrying with depth={depth}")
-                else:
-                    # Last attempt - truncate but warn
-                    logger.warning(f"Tree still large at depth {depth}, truncating to {max_chars} chars")
-                    return tree_content[:max_chars] + "\n\n... (tree truncated - large repository) ..."
+        try:
+            result = subprocess.run([
+                'tree',
+                '-a',                    # Show all files
+                '-I', ignore_pattern,    # Ignore patterns
+                '--dirsfirst',           # Directories first
+                '-L', str(depth),        # Max depth
+                '--noreport',            # No summary
+                '--charset=utf-8',       # Same connectors whatever the locale
+                repo_path
+            ], capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=30)
 
-            except subprocess.TimeoutExpired:
-                logger.warning(f"tree command timeout, using fallback")
-                return self._fallback_tree(repo_path)
-            except FileNotFoundError:
-                logger.warning(f"tree command not found, using fallback")
-                return self._fallback_tree(repo_path)
-            except Exception as e:
-                logger.warning(f"Tree generation failed: {e}, using fallback")
+            if result.returncode != 0:
+                logger.warning(f"tree command failed, using fallback")
                 return self._fallback_tree(repo_path)
 
-        # Shouldn't reach here, but fallback just in case
-        return self._fallback_tree(repo_path)
+            tree_content = result.stdout
+
+        except subprocess.TimeoutExpired:
+            logger.warning(f"tree command timeout, using fallback")
+            return self._fallback_tree(repo_path)
+        except FileNotFoundError:
+            logger.warning(f"tree command not found, using fallback")
+            return self._fallback_tree(repo_path)
+        except Exception as e:
+            logger.warning(f"Tree generation failed: {e}, using fallback")
+            return self._fallback_tree(repo_path)
+
+        # Check if within token limits
+        # 128K token limit, ~1.3 tokens/char, so ~98K chars max
+        # Use 80K to be safe with prompt
+        max_chars = 80000
+
+        # Too large, drop the deepest level (down to depth 3) and re-check
+        while len(tree_content) > max_chars and depth > 3:
+            depth -= 1
+            logger.info(f"Tree too large ({len(tree_content)} chars), reducing to depth={depth}")
+            tree_content = self._prune_tree_depth(tree_content, depth)
+
+        if len(tree_content) > max_chars:
+            # Still too large - truncate but warn
+            logger.warning(f"Tree still large at depth {depth}, truncating to {max_chars} chars")
+            return tree_content[:max_chars] + "\n\n... (tree truncated - large repository) ..."
+
+        logger.info(f"✓ Generated tree at depth {depth} ({len(tree_content)} chars)")
+        return tree_content
+
+    @staticmethod
+    def _prune_tree_depth(tree_content: str, depth: int) -> str:
+        """
+        Drop entries deeper than `depth` from `tree` command output.
+
+        Each nesting level in `tree` output is a 4-char prefix ('│   ', '|   '
+        or '    '), so an entry's level is the offset of its connector / 4 + 1.
+        This yields the same result as re-running `tree -L depth`.
+
+        Args:
+            tree_content: Output of the tree command
+            depth: Maximum depth to keep
+
+        Returns:
+            Pruned tree structure as string
+        """
+        kept = []
+        for line in tree_content.splitlines():
+            match = TREE_CONNECTOR.search(line)
+            if match is None or match.start() // 4 < depth:
+                kept.append(line)
+        return '\n'.join(kept)
 
     def _fallback_tree(self, repo_path: str) -> str:
         """
-        Fallback tree generation using os.walk.
+        Fallback tree generation when the `tree` command is unavailable.
+
+        Uses git's list of tracked files for a checkout, otherwise walks
+        the filesystem.
 
         Args:
             repo_path: Path to repository
@@ -216,31 +345,135 @@ class DeepScanner:
         Returns:
             Tree-like structure as string
         """
-        tree_lines = []
+        if os.path.isdir(os.path.join(repo_path, '.git')):
+            tree_content = self._git_tree(repo_path)
+            if tree_content is not None:
+                return tree_content
+
+        return self._walk_tree(repo_path)
+
+    def _git_tree(self, repo_path: str) -> Optional[str]:
+        """
+        Build the fallback tree from `git ls-tree` (one call, no directory walk).
+
+        Args:
+            repo_path: Path to a git checkout
 
-        for root, dirs, files in os.walk(repo_path):
-            # Skip ignored directories
-            dirs[:] = [d for d in dirs if not any(
-                d.startswith(ignore.rstrip('*'))
-                for ignore in self.tree_ignore
-            )]
-
-            # Calculate depth
-            depth = root.replace(repo_path, '').count(os.sep)
-            if depth >= self.tree_max_depth:
-                dirs.clear()  # Stop going deeper
+        Returns:
+            Tree-like structure as string, or None if git failed
+        """
+        try:
+            # -z paths are raw bytes; replace anything that isn't UTF-8 rather than fail
+            result = subprocess.run(
+                ['git', '-C', repo_path, 'ls-tree', '-r', '-z', '--name-only', 'HEAD'],
+                capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=30
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+        if result.returncode != 0:
+            return None
+
+        # Group tracked files by directory and record each directory's subdirectories
+        files_by_dir = defaultdict(list)
+        subdirs = defaultdict(set)
+        for path in result.stdout.split('\0'):
+            if not path:
                 continue
+            parent, _, name = path.rpartition('/')
+            files_by_dir[parent].append(name)
+            while parent:
+                grandparent, _, dirname = parent.rpartition('/')
+                subdirs[grandparent].add(dirname)
+                parent = grandparent
+
+        tree_lines = []
+        indents = ['│   ' * i for i in range(self.tree_max_depth + 1)]
+        ignored = self._ignore_re.match if self._ignore_re else None
+
+        # Same layout as _walk_tree, in sorted order
+        stack = [('', os.path.basename(repo_path), 0)] if self.tree_max_depth > 0 else []
+        while stack:
+            path, folder, depth = stack.pop()
+
+            if folder:
+                tree_lines.append(indents[depth] + '├── ' + folder + '/')
+
+            file_prefix = indents[depth + 1] + '├── '
+            files = [name for name in files_by_dir.get(path, ()) if not (ignored and ignored(name))]
+            for file in heapq.nsmallest(50, files):  # First 50 files per directory, sorted
+                tree_lines.append(file_prefix + file)
+
+            if depth + 1 < self.tree_max_depth:
+                stack.extend(
+                    (f"{path}/{name}" if path else name, name, depth + 1)
+                    for name in sorted(subdirs.get(path, ()), reverse=True)
+                    if not (ignored and ignored(name))
+                )
+
+        return '\n'.join(tree_lines)
+
+    def _walk_tree(self, repo_path: str) -> str:
+        """
+        Build the fallback tree by walking the filesystem.
+
+        Walks with os.scandir, whose entries carry the file type from the
+        directory listing, so no per-entry stat calls are needed.
+
+        Args:
+            repo_path: Path to repository
+
+        Returns:
+            Tree-like structure as string
+        """
+        tree_lines = []
+
+        # Indent prefixes per depth, built once instead of per entry
+        indents = ['│   ' * i for i in range(self.tree_max_depth + 1)]
+        ignored = self._ignore_re.match if self._ignore_re else None
+
+        # Depth-first in os.walk order; directories at max depth are never listed
+        stack = [(repo_path, 0)] if self.tree_max_depth > 0 else []
+        while stack:
+            path, depth = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue  # Skip unreadable directories
+
+            dirs = []
+            files = []
+            for entry in entries:
+                # Match the name before touching the entry's type
+                if ignored and ignored(entry.name):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    dirs.append(entry)
+                else:
+                    files.append(entry.name)
 
             # Format directory
-            indent = '│   ' * depth
-            folder = os.path.basename(root)
+            folder = os.path.basename(path)
             if folder:
-                tree_lines.append(f"{indent}├── {folder}/")
+                tree_lines.append(indents[depth] + '├── ' + folder + '/')
 
             # Format files
-            subindent = '│   ' * (depth + 1)
-            for file in sorted(files)[:50]:  # Limit files per directory
-                tree_lines.append(f"{subindent}├── {file}")
+            file_prefix = indents[depth + 1] + '├── '
+            for file in heapq.nsmallest(50, files):  # First 50 files per directory, sorted
+                tree_lines.append(file_prefix + file)
+
+            # Push subdirectories in reverse so they are visited in listing order
+            # (symlinked directories are not followed)
+            if depth + 1 < self.tree_max_depth:
+                stack.extend(
+                    (entry.path, depth + 1)
+                    for entry in reversed(dirs)
+                    if not entry.is_symlink()
+                )
 
         return '\n'.join(tree_lines)
 
@@ -320,6 +553,7 @@ Only include technologies you can reasonably infer from the tree structure.
         max_retries = 3
         for attempt in range(max_retries):
             try:
+                self.throttle.wait()
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=[
@@ -375,12 +609,17 @@ Only include technologies you can reasonably infer from the tree structure.
 
                 # Extract technology names
                 technologies = set()
+                log_evidence = logger.isEnabledFor(logging.DEBUG)
                 for tech in result.get('technologies', []):
                     tech_name = tech.get('name')
                     confidence = tech.get('confidence', 'low')
 
-                    # Log discovery with evidence
-                    logger.info(f"  Found: {tech_name} ({confidence} confidence) - {tech.get('evidence', 'N/A')[:100]}")
+                    # Log discovery with evidence (summary is logged by caller)
+                    if log_evidence:
+                        logger.debug(
+                            "  Found: %s (%s confidence) - %s",
+                            tech_name, confidence, tech.get('evidence', 'N/A')[:100]
+                        )
 
                     # Only include medium+ confidence
                     if confidence in ['high', 'medium']:
@@ -398,13 +637,7 @@ Only include technologies you can reasonably infer from the tree structure.
                 # Save failed response for debugging
                 if attempt == max_retries - 1:
                     debug_file = f"logs/deep_scan_failed_{repo_name}.json"
-                    try:
-                        os.makedirs('logs', exist_ok=True)
-                        with open(debug_file, 'w') as f:
-                            f.write(content)
-                        logger.error(f"Saved failed response to {debug_file} for debugging")
-                    except:
-                        pass
+                    _queue_debug_dump(debug_file, content)
 
                 if attempt < max_retries - 1:
                     logger.info(f"Retrying in 2 seconds...")
@@ -4,14 +4,33 @@ Technology detection from repository files.
 
 import json
 import re
+import shelve
+import tomllib
 import logging
-from typing import Dict, List, Set
+import threading
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, Set, Optional
 from github.Repository import Repository
 from github.GithubException import GithubException
 
 logger = logging.getLogger(__name__)
 
 
+def is_backpressure_error(error: Exception) -> bool:
+    """
+    Check whether a GitHub error means "slow down" rather than "not there".
+
+    Rate limits (403/429) and server errors (5xx) are raised to the scanner
+    so it can pause and shrink its concurrency; other errors (e.g. 404)
+    are handled where they occur.
+    """
+    if not isinstance(error, GithubException) or error.status is None:
+        return False
+    return error.status in (403, 429) or error.status >= 500
+
+
 class TechnologyDetector:
     """Detects technologies used in repositories."""
 
@@ -31,9 +50,87 @@ class TechnologyDetector:
         '.github/workflows': 'detect_github_actions',
     }
 
-    def __init__(self):
-        """Initialize detector."""
+    # package.json dependency -> (category, technology)
+    NODE_DEPENDENCIES = {
+        # Frameworks
+        'react': ('frameworks', 'React'),
+        'next': ('frameworks', 'Next.js'),
+        'vue': ('frameworks', 'Vue.js'),
+        'angular': ('frameworks', 'Angular'),
+        '@angular/core': ('frameworks', 'Angular'),
+        'svelte': ('frameworks', 'Svelte'),
+        'express': ('frameworks', 'Express.js'),
+        'nestjs': ('frameworks', 'NestJS'),
+        '@nestjs/core': ('frameworks', 'NestJS'),
+        'tailwindcss': ('frameworks', 'Tailwind CSS'),
+        # Tools
+        'typescript': ('tools', 'TypeScript'),
+        'webpack': ('tools', 'Webpack'),
+        'vite': ('tools', 'Vite'),
+        'jest': ('tools', 'Jest'),
+        'playwright': ('tools', 'Playwright'),
+        '@playwright/test': ('tools', 'Playwright'),
+        'eslint': ('tools', 'ESLint'),
+        'prettier': ('tools', 'Prettier'),
+    }
+
+    # Python package keyword -> (category, technology), first match wins
+    PYTHON_PACKAGES = (
+        # Frameworks
+        ('django', 'frameworks', 'Django'),
+        ('flask', 'frameworks', 'Flask'),
+        ('fastapi', 'frameworks', 'FastAPI'),
+        ('streamlit', 'frameworks', 'Streamlit'),
+        ('torch', 'frameworks', 'PyTorch'),  # also matches pytorch
+        ('tensorflow', 'frameworks', 'TensorFlow'),
+        # Tools
+        ('pytest', 'tools', 'pytest'),
+        ('black', 'tools', 'Black'),
+        ('mypy', 'tools', 'mypy'),
+    )
+
+    # pyproject.toml build-backend prefixes
+    PY_BUILD_BACKENDS = {
+        'poetry.core': 'Poetry',
+        'hatchling': 'Hatch',
+        'setuptools': 'setuptools',
+        'pdm': 'PDM',
+        'flit_core': 'Flit',
+    }
+
+    # Part of the persistent cache key; bump when detection rules change so
+    # results cached by older rules are not reused
+    DETECTOR_VERSION = 2
+
+    def __init__(self, cache_path: Optional[Path] = None, graphql=None):
+        """
+        Initialize detector.
+
+        Args:
+            cache_path: Optional shelve path to persist results across runs
+            graphql: Optional GitHubGraphQL client for batched language prefetch
+        """
         self.detected_cache = {}
+        self.persistent_cache = None
+        # shelve is not thread-safe and repos are scanned concurrently
+        self._cache_lock = threading.Lock()
+        # Per-thread flag set when a file probe fails for a reason other than 404
+        self._probe_state = threading.local()
+        self.graphql = graphql
+        self.languages_cache = {}
+        # Resolve TECH_FILES method names once, instead of getattr per file per
+        # repo; bound on the instance so subclass overrides are honored
+        self._detectors = tuple(
+            (file_pattern, getattr(self, detect_method))
+            for file_pattern, detect_method in self.TECH_FILES.items()
+        )
+
+        if cache_path:
+            try:
+                self.persistent_cache = shelve.open(str(cache_path))
+                logger.info(f"Using detection cache: {cache_path} ({len(self.persistent_cache)} entries)")
+            except Exception as e:
+                logger.warning(f"Could not open detection cache {cache_path}: {e}")
 
     def detect_technologies(self, repo: Repository) -> Dict[str, Set[str]]:
         """
@@ -45,6 +142,14 @@ class TechnologyDetector:
         Returns:
             Dict mapping tech categories to sets of technology names
         """
+        cache_key = self._cache_key(repo)
+        if cache_key:
+            with self._cache_lock:
+                cached = self.persistent_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Detection cache hit for {repo.name}")
+                return cached
+
         technologies = {
             'languages': set(),
             'frameworks': set(),
@@ -52,76 +157,166 @@ class TechnologyDetector:
             'platforms': set(),
         }
 
+        self._probe_state.failed = False
+        self._probe_state.rejection = None
+
         try:
-            # Detect from GitHub's language detection
-            languages = repo.get_languages()
-            for lang in languages.keys():
-                technologies['languages'].add(lang)
+            # Detect from GitHub's language detection (prefetched if available)
+            languages = self.languages_cache.pop(repo.full_name, None)
+            if languages is None:
+                languages = repo.get_languages().keys()
+            technologies['languages'].update(languages)
 
             # Detect from specific files
-            for file_pattern, detect_method in self.TECH_FILES.items():
+            for file_pattern, detect_fn in self._detectors:
                 try:
-                    if hasattr(self, detect_method):
-                        detected = getattr(self, detect_method)(repo)
-                        for category, techs in detected.items():
-                            technologies[category].update(techs)
+                    detected = detect_fn(repo)
+                    for category, techs in detected.items():
+                        technologies[category].update(techs)
                 except GithubException as e:
                     if e.status != 404:  # File not found is expected
+                        self._probe_state.failed = True
                         logger.debug(f"Error checking {file_pattern} in {repo.name}: {e}")
                 except Exception as e:
+                    self._probe_state.failed = True
                     logger.debug(f"Error detecting from {file_pattern}: {e}")
 
+                # GitHub pushed back; stop probing this repo
+                if self._probe_state.rejection is not None:
+                    break
+
         except Exception as e:
+            if is_backpressure_error(e):
+                raise
             logger.error(f"Error detecting technologies in {repo.name}: {e}")
+            return technologies  # Partial result, don't cache
+
+        # Let the scanner pause and back off (the probes swallow their errors)
+        if self._probe_state.rejection is not None:
+            raise self._probe_state.rejection
+
+        if self._probe_state.failed:
+            # Cached results are kept until the next push, so never store a partial one
+            logger.debug(f"Not caching detection for {repo.name} (a file probe failed)")
+        elif cache_key:
+            with self._cache_lock:
+                self.persistent_cache[cache_key] = technologies
 
         return technologies
 
+    def prefetch_languages(self, repos: List[Repository]) -> None:
+        """
+        Fetch languages for many repositories with batched GraphQL queries.
+
+        Results are used by detect_technologies instead of one
+        get_languages() REST call per repo. Repos already in the persistent
+        cache are skipped. Failures fall back to per-repo REST calls.
+
+        Args:
+            repos: Repositories about to be scanned
+        """
+        if not self.graphql:
+            return
+
+        # Scan workers from earlier pages may be writing to the shelve
+        full_names = []
+        with self._cache_lock:
+            for repo in repos:
+                cache_key = self._cache_key(repo)
+                if not (cache_key and cache_key in self.persistent_cache):
+                    full_names.append(repo.full_name)
+        if not full_names:
+            return
+
+        try:
+            results = self.graphql.fetch_repositories(
+                full_names,
+                'languages(first: 100) { nodes { name } }'
+            )
+        except Exception as e:
+            logger.warning(f"Language prefetch failed, using per-repo lookups: {e}")
+            return
+
+        for full_name, repo_data in results.items():
+            self.languages_cache[full_name] = {
+                node['name'] for node in repo_data['languages']['nodes']
+            }
+
+        logger.info(f"Prefetched languages for {len(results)}/{len(full_names)} repositories")
+
+    def _cache_key(self, repo: Repository) -> Optional[str]:
+        """
+        Build persistent cache key for a repository.
+
+        Uses the last push time (already part of the repo listing, so no extra
+        API call); any push invalidates the cached result, as does a change
+        of DETECTOR_VERSION.
+
+        Returns:
+            Cache key, or None if caching is disabled or push time unknown
+        """
+        if self.persistent_cache is None or not repo.pushed_at:
+            return None
+        return f"v{self.DETECTOR_VERSION}:{repo.full_name}@{repo.pushed_at.isoformat()}"
+
+    def save_cache(self) -> None:
+        """Flush persistent detection cache to disk."""
+        if self.persistent_cache is not None:
+            with self._cache_lock:
+                self.persistent_cache.sync()
+
+    def invalidate_cache(self) -> None:
+        """Drop all persisted detection results."""
+        if self.persistent_cache is not None:
+            with self._cache_lock:
+                self.persistent_cache.clear()
+            logger.info("Detection cache invalidated")
+
+    def _get_contents(self, repo: Repository, path: str):
+        """
+        Fetch a file for a probe, noting failures other than "not found".
+
+        The probes treat any error as "file absent"; this records rate
+        limits, server errors and network failures so the (possibly
+        incomplete) result is not cached, and keeps rate limit / server
+        errors so detect_technologies can re-raise them.
+
+        Args:
+            repo: Repository object
+            path: File or directory path
+
+        Returns:
+            PyGithub ContentFile (or list for a directory)
+        """
+        try:
+            return repo.get_contents(path)
+        except GithubException as e:
+            if e.status != 404:
+                self._probe_state.failed = True
+            if is_backpressure_error(e):
+                self._probe_state.rejection = e
+            raise
+        except Exception:
+            self._probe_state.failed = True
+            raise
+
     def detect_node(self, repo: Repository) -> Dict[str, Set[str]]:
         """Detect Node.js/JavaScript technologies."""
         techs = {'frameworks': set(), 'tools': set()}
 
         try:
-            content = repo.get_contents("package.json")
-            package_json = json.loads(content.decoded_content.decode())
+            content = self._get_contents(repo, "package.json")
+            package_json = json.loads(content.decoded_content)
 
             # Check dependencies
             deps = package_json.get('dependencies', {})
             dev_deps = package_json.get('devDependencies', {})
             all_deps = {**deps, **dev_deps}
 
-            # Frameworks
-            if 'react' in all_deps:
-                techs['frameworks'].add('React')
-            if 'next' in all_deps:
-                techs['frameworks'].add('Next.js')
-            if 'vue' in all_deps:
-                techs['frameworks'].add('Vue.js')
-            if 'angular' in all_deps or '@angular/core' in all_deps:
-                techs['frameworks'].add('Angular')
-            if 'svelte' in all_deps:
-                techs['frameworks'].add('Svelte')
-            if 'express' in all_deps:
-                techs['frameworks'].add('Express.js')
-            if 'nestjs' in all_deps or '@nestjs/core' in all_deps:
-                techs['frameworks'].add('NestJS')
-
-            # Tools
-            if 'typescript' in all_deps:
-                techs['tools'].add('TypeScript')
-            if 'webpack' in all_deps:
-                techs['tools'].add('Webpack')
-            if 'vite' in all_deps:
-                techs['tools'].add('Vite')
-            if 'jest' in all_deps:
-                techs['tools'].add('Jest')
-            if 'playwright' in all_deps or '@playwright/test' in all_deps:
-                techs['tools'].add('Playwright')
-            if 'eslint' in all_deps:
-                techs['tools'].add('ESLint')
-            if 'prettier' in all_deps:
-                techs['tools'].add('Prettier')
-            if 'tailwindcss' in all_deps:
-                techs['frameworks'].add('Tailwind CSS')
+            # Only look at dependencies we know how to classify
+            for dep in all_deps.keys() & self.NODE_DEPENDENCIES.keys():
+                category, tech_name = self.NODE_DEPENDENCIES[dep]
+                techs[category].add(tech_name)
 
         except Exception as e:
             logger.debug(f"Error parsing package.json: {e}")
@@ -133,7 +328,7 @@ class TechnologyDetector:
         techs = {'frameworks': set(), 'tools': set()}
 
         try:
-            content = repo.get_contents("requirements.txt")
+            content = self._get_contents(repo, "requirements.txt")
             requirements = content.decoded_content.decode().split('\n')
 
             for line in requirements:
@@ -143,59 +338,68 @@ class TechnologyDetector:
 
                 # Extract package name (before ==, >=, etc.)
                 package = re.split('[=<>!]', line)[0].strip()
-
-                # Frameworks
-                if 'django' in package:
-                    techs['frameworks'].add('Django')
-                elif 'flask' in package:
-                    techs['frameworks'].add('Flask')
-                elif 'fastapi' in package:
-                    techs['frameworks'].add('FastAPI')
-                elif 'streamlit' in package:
-                    techs['frameworks'].add('Streamlit')
-                elif 'pytorch' in package or 'torch' in package:
-                    techs['frameworks'].add('PyTorch')
-                elif 'tensorflow' in package:
-                    techs['frameworks'].add('TensorFlow')
-
-                # Tools
-                elif 'pytest' in package:
-                    techs['tools'].add('pytest')
-                elif 'black' in package:
-                    techs['tools'].add('Black')
-                elif 'mypy' in package:
-                    techs['tools'].add('mypy')
+                self._match_python_package(package, techs)
 
         except Exception as e:
             logger.debug(f"Error parsing requirements.txt: {e}")
 
         return techs
 
+    def _match_python_package(self, package: str, techs: Dict[str, Set[str]]) -> None:
+        """Add the first framework/tool whose keyword appears in a lowercase package name."""
+        for keyword, category, tech_name in self.PYTHON_PACKAGES:
+            if keyword in package:
+                techs[category].add(tech_name)
+                return
+
     def detect_python_pipfile(self, repo: Repository) -> Dict[str, Set[str]]:
         """Detect Python technologies from Pipfile."""
         techs = {'tools': set()}
         try:
-            repo.get_contents("Pipfile")
+            self._get_contents(repo, "Pipfile")
             techs['tools'].add('Pipenv')
         except:
             pass
         return techs
 
     def detect_python_pyproject(self, repo: Repository) -> Dict[str, Set[str]]:
-        """Detect Python technologies from pyproject.toml."""
-        techs = {'tools': set()}
+        """Detect Python build backend and dependencies from pyproject.toml."""
+        techs = {'frameworks': set(), 'tools': set()}
         try:
-            repo.get_contents("pyproject.toml")
-            techs['tools'].add('Poetry')
-        except:
-            pass
+            content = self._get_contents(repo, "pyproject.toml")
+            pyproject = tomllib.loads(content.decoded_content.decode())
+
+            # Build backend / packaging tool
+            backend = pyproject.get('build-system', {}).get('build-backend', '')
+            for prefix, tool in self.PY_BUILD_BACKENDS.items():
+                if backend.startswith(prefix):
+                    techs['tools'].add(tool)
+                    break
+
+            poetry = pyproject.get('tool', {}).get('poetry', {})
+            if poetry:
+                techs['tools'].add('Poetry')
+
+            # Declared dependencies (PEP 621 list and Poetry tables)
+            packages = [
+                re.split(r'[=<>!~;\[\s]', dep)[0]
+                for dep in pyproject.get('project', {}).get('dependencies', [])
+            ]
+            packages.extend(poetry.get('dependencies', {}))
+            packages.extend(poetry.get('dev-dependencies', {}))
+
+            for package in packages:
+                self._match_python_package(package.strip().lower(), techs)
+
+        except Exception as e:
+            logger.debug(f"Error parsing pyproject.toml: {e}")
         return techs
 
     def detect_go(self, repo: Repository) -> Dict[str, Set[str]]:
         """Detect Go technologies."""
         techs = {'languages': set()}
         try:
-            repo.get_contents("go.mod")
+            self._get_contents(repo, "go.mod")
             techs['languages'].add('Go')
         except:
             pass
@@ -205,7 +409,7 @@ class TechnologyDetector:
         """Detect Rust technologies."""
         techs = {'languages': set()}
         try:
-            repo.get_contents("Cargo.toml")
+            self._get_contents(repo, "Cargo.toml")
             techs['languages'].add('Rust')
         except:
             pass
@@ -215,7 +419,7 @@ class TechnologyDetector:
         """Detect Java/Maven technologies."""
         techs = {'languages': set(), 'tools': set()}
         try:
-            repo.get_contents("pom.xml")
+            self._get_contents(repo, "pom.xml")
             techs['languages'].add('Java')
             techs['tools'].add('Maven')
         except:
@@ -226,7 +430,7 @@ class TechnologyDetector:
         """Detect Java/Gradle technologies."""
         techs = {'languages': set(), 'tools': set()}
         try:
-            repo.get_contents("build.gradle")
+            self._get_contents(repo, "build.gradle")
             techs['languages'].add('Java')
             techs['tools'].add('Gradle')
         except:
@@ -237,7 +441,7 @@ class TechnologyDetector:
         """Detect Ruby technologies."""
         techs = {'languages': set(), 'frameworks': set()}
         try:
-            content = repo.get_contents("Gemfile")
+            content = self._get_contents(repo, "Gemfile")
             gemfile = content.decoded_content.decode()
             techs['languages'].add('Ruby')
             if 'rails' in gemfile.lower():
@@ -250,8 +454,8 @@ class TechnologyDetector:
         """Detect PHP technologies."""
         techs = {'languages': set(), 'frameworks': set(), 'tools': set()}
         try:
-            content = repo.get_contents("composer.json")
-            composer = json.loads(content.decoded_content.decode())
+            content = self._get_contents(repo, "composer.json")
+            composer = json.loads(content.decoded_content)
             techs['languages'].add('PHP')
             techs['tools'].add('Composer')
 
@@ -269,7 +473,7 @@ class TechnologyDetector:
         """Detect Docker usage."""
         techs = {'platforms': set()}
         try:
-            repo.get_contents("Dockerfile")
+            self._get_contents(repo, "Dockerfile")
             techs['platforms'].add('Docker')
         except:
             pass
@@ -279,7 +483,7 @@ class TechnologyDetector:
         """Detect GitHub Actions usage."""
         techs = {'tools': set()}
         try:
-            workflows = repo.get_contents(".github/workflows")
+            workflows = self._get_contents(repo, ".github/workflows")
             if workflows:
                 techs['tools'].add('GitHub Actions')
         except:
@@ -296,16 +500,12 @@ class TechnologyDetector:
         Returns:
             Dict mapping technology name to count of repos using it
         """
-        tech_counts = {}
-
-        for repo_techs in all_repo_techs:
-            # Flatten all categories
-            all_techs = set()
-            for category_techs in repo_techs.values():
-                all_techs.update(category_techs)
+        # Flatten categories into one set per repo so a tech listed under
+        # several categories is only counted once for that repo
+        tech_counts = Counter(chain.from_iterable(
+            set(chain.from_iterable(repo_techs.values()))
+            for repo_techs in all_repo_techs
+        ))
 
-            # Count occurrences
-            for tech in all_techs:
-                tech_counts[tech] = tech_counts.get(tech, 0) + 1
+        return dict(tech_counts)
 
-        return tech_counts
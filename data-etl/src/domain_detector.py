@@ -5,15 +5,201 @@ Analyzes repository structure, files, and content to intelligently
 determine the engineering domain without hardcoded patterns.
 """
 
+import re
+import time
+import heapq
 import logging
 import json
-from typing import Dict, Set, Optional, List
+import shelve
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from itertools import islice
+from functools import lru_cache
+from collections import OrderedDict, defaultdict
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Set, Optional, List, Literal, Tuple
+from pydantic import BaseModel
 from github.Repository import Repository
 from github.GithubException import GithubException
-from openai import OpenAI
+
+from http_clients import get_openai_client, get_openai_throttle
 
 logger = logging.getLogger(__name__)
 
+# System prompt for repository domain classification
+SYSTEM_PROMPT = """You are an expert at analyzing software repositories and determining their engineering domain.
+
+Analyze the provided repository information and classify it into one of these domains:
+- mobile: Mobile applications (iOS, Android, cross-platform)
+- backend: Backend services, APIs, microservices
+- frontend: Web frontends, SPAs, user interfaces
+- infrastructure: Infrastructure as code, DevOps, deployment
+- data: Data pipelines, ETL, analytics, warehousing
+- ml: Machine learning, AI models, inference services
+- library: Shared libraries, SDKs, frameworks
+- tooling: Developer tools, CLI applications, scripts
+
+Return ONLY a valid JSON object with this exact structure:
+{
+  "domain": "backend",
+  "confidence": 0.95,
+  "reasoning": "Brief explanation of why this classification was chosen",
+  "all_domains": [
+    {"domain": "backend", "confidence": 0.95},
+    {"domain": "infrastructure", "confidence": 0.3}
+  ]
+}
+
+Rules:
+- confidence is 0.0 to 1.0
+- reasoning should be 1-2 sentences
+- all_domains should include any domain with confidence > 0.2
+- Use "unknown" if truly unclear (confidence < 0.4)"""
+
+# System prompt when several repositories share one request. It starts with
+# SYSTEM_PROMPT byte for byte so OpenAI's prompt cache can reuse the prefix.
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+
+You will receive multiple repositories, numbered [1], [2], ...
+Return ONLY a valid JSON object of the form {"results": [...]} where element i is
+the classification object (same structure as above) for repository [i], in the
+same order, with an extra "repository" field holding the repository name."""
+
+# Root files that indicate application code (rules out infra-only repos)
+APP_MANIFESTS = frozenset({
+    'package.json', 'go.mod', 'pom.xml', 'build.gradle', 'build.gradle.kts',
+    'requirements.txt', 'pyproject.toml', 'cargo.toml', 'gemfile', 'composer.json',
+})
+
+FRONTEND_CONFIGS = frozenset({
+    'next.config.js', 'next.config.mjs', 'next.config.ts',
+    'nuxt.config.js', 'nuxt.config.ts', 'angular.json',
+    'svelte.config.js', 'gatsby-config.js',
+})
+
+# Unambiguous layouts: (predicate over root facts, domain, confidence, reasoning)
+DOMAIN_RULES = (
+    (lambda f: 'pubspec.yaml' in f['files'],
+     'mobile', 0.95, 'Flutter project (pubspec.yaml at root).'),
+    (lambda f: 'podfile' in f['files'] or {'ios', 'android'} <= f['dirs'],
+     'mobile', 0.9, 'Native mobile layout (Podfile or ios/ and android/ directories).'),
+    (lambda f: bool(f['files'] & FRONTEND_CONFIGS),
+     'frontend', 0.9, 'Web frontend framework configuration at root.'),
+    (lambda f: 'dbt_project.yml' in f['files'],
+     'data', 0.95, 'dbt project (dbt_project.yml at root).'),
+    (lambda f: 'tf' in f['file_types'] and not f['files'] & APP_MANIFESTS,
+     'infrastructure', 0.9, 'Terraform configuration with no application code.'),
+    (lambda f: 'chart.yaml' in f['files'],
+     'infrastructure', 0.9, 'Helm chart (Chart.yaml at root).'),
+)
+
+
+# Prompt section display order (selection order is by priority, see _build_classification_prompt)
+PROMPT_SECTION_ORDER = (
+    'description', 'root_directories', 'root_files', 'file_types',
+    'technologies', 'topics', 'readme',
+)
+
+# File extensions implied by a detected language (lowercase technology names)
+EXTENSION_LANGUAGES = {
+    'py': 'python', 'js': 'javascript', 'ts': 'typescript', 'go': 'go',
+    'java': 'java', 'kt': 'kotlin', 'rb': 'ruby', 'php': 'php', 'rs': 'rust',
+    'swift': 'swift', 'dart': 'dart', 'cs': 'c#', 'scala': 'scala', 'sh': 'shell',
+    'tf': 'hcl',
+}
+
+# README markdown/boilerplate stripped before truncation: (pattern, replacement)
+README_NOISE = (
+    (re.compile(r'```.*?(?:```|$)', re.S), ' '),
+    (re.compile(r'!\[[^\]]*\]\([^)]*\)'), ' '),
+    (re.compile(r'\[([^\]]*)\]\([^)]*\)'), r'\1'),
+    (re.compile(r'<[^>]+>'), ' '),
+    (re.compile(r'^#+\s*', re.M), ''),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+DomainName = Literal[
+    'mobile', 'backend', 'frontend', 'infrastructure',
+    'data', 'ml', 'library', 'tooling', 'unknown',
+]
+
+
+class DomainScore(BaseModel):
+    """Confidence for one candidate domain."""
+
+    domain: DomainName
+    confidence: float
+
+
+class DomainClassification(BaseModel):
+    """Structured output schema for one repository's classification."""
+
+    domain: DomainName
+    confidence: float
+    reasoning: str
+    all_domains: List[DomainScore]
+
+    def to_result(self) -> Dict[str, any]:
+        """Convert to the result dict used throughout the pipeline."""
+        return {
+            'domain': self.domain,
+            'confidence': self.confidence,
+            'reasoning': self.reasoning,
+            'all_domains': {score.domain: score.confidence for score in self.all_domains}
+        }
+
+
+class RepositoryClassification(DomainClassification):
+    """Classification tagged with its repository (batched requests)."""
+
+    repository: str
+
+
+class BatchClassification(BaseModel):
+    """Structured output schema for a batched request."""
+
+    results: List[RepositoryClassification]
+
+
+@lru_cache(maxsize=1024)
+def _clean_readme(readme: str) -> str:
+    """Strip README_NOISE (cached: template READMEs repeat verbatim across repos)."""
+    for pattern, replacement in README_NOISE:
+        readme = pattern.sub(replacement, readme)
+    return readme.strip()
+
+
+class _LRUCache(OrderedDict):
+    """Thread-safe mapping that evicts the least recently used entry past maxsize."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self:
+                return default
+            return self[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            if len(self) > self.maxsize:
+                self.popitem(last=False)
+
 
 class DomainDetector:
     """AI-powered repository domain detector."""
@@ -30,21 +216,73 @@ class DomainDetector:
         'tooling',
     ]
 
-    def __init__(self, openai_api_key: str, config: Optional[dict] = None):
+    # Batch API polling (seconds); batches may take up to 24h
+    BATCH_POLL_INTERVAL = 30
+    BATCH_POLL_MAX_INTERVAL = 600
+
+    def __init__(
+        self,
+        openai_api_key: str,
+        config: Optional[dict] = None,
+        cache_path: Optional[Path] = None
+    ):
         """
         Initialize domain detector.
 
         Args:
             openai_api_key: OpenAI API key for AI analysis
             config: Optional configuration dict
+            cache_path: Optional shelve path to persist results across runs
         """
-        self.client = OpenAI(api_key=openai_api_key)
+        self.client = get_openai_client(openai_api_key)
         self.config = config or {}
-        self.detection_cache = {}
+        # In-memory results, bounded so long runs don't hold every repo
+        self.detection_cache = _LRUCache(
+            self.config.get('domain_detection', {}).get('cache_max_entries', 20000)
+        )
+        self._cache_lock = threading.Lock()
+
+        # On-disk results keyed by repo + signals hash (unchanged repos skip AI)
+        self.persistent_cache = None
+        if cache_path:
+            try:
+                self.persistent_cache = shelve.open(str(cache_path))
+                logger.info(f"Using domain cache: {cache_path} ({len(self.persistent_cache)} entries)")
+            except Exception as e:
+                logger.warning(f"Could not open domain cache {cache_path}: {e}")
+
+        # Route uncached repos through the (cheaper, slower) OpenAI Batch API
+        self.use_batch_api = False
 
         # Get AI model from config
         self.model = self.config.get('ai', {}).get('model', 'gpt-4o-mini')
 
+        # Constant system messages, identical on every call (prompt caching)
+        self._base_messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        self._batch_base_messages = [{"role": "system", "content": BATCH_SYSTEM_PROMPT}]
+
+        # Repositories classified per AI request in batch_detect_domains
+        self.batch_size = self.config.get('domain_detection', {}).get('batch_size', 25)
+
+        # Approximate prompt budget per repository (~4 chars per token)
+        self.max_prompt_chars = self.config.get('domain_detection', {}).get('max_prompt_chars', 1600)
+
+        # Rule-based results at or above this confidence skip the AI call
+        self.rule_confidence_threshold = self.config.get('domain_detection', {}).get(
+            'rule_confidence_threshold', 0.85
+        )
+
+        # Concurrent AI requests, throttled to the OpenAI per-minute limit
+        openai_config = self.config.get('openai', {})
+        self.concurrency = openai_config.get('concurrency', 8)
+        self.throttle = get_openai_throttle(openai_config.get('requests_per_minute', 500))
+
+        # Per-repo GitHub lookups (contents, README, topics) run in parallel
+        self._signal_executor = ThreadPoolExecutor(
+            max_workers=3 * self.concurrency,
+            thread_name_prefix='repo-signals'
+        )
+
     def detect_domain(
         self,
         repo: Repository,
@@ -66,24 +304,32 @@ class DomainDetector:
                 'all_domains': {'backend': 0.95, 'infrastructure': 0.3}
             }
         """
-        # Cache check
+        # Snapshot identifiers once (repo attributes may be lazily completed)
+        name = repo.name
         cache_key = repo.full_name
-        if cache_key in self.detection_cache:
-            return self.detection_cache[cache_key]
+
+        # Cache check
+        cached = self.detection_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
             # Gather repository signals
             signals = self._gather_repo_signals(repo, technologies)
 
-            # Use AI to classify
-            result = self._ai_classify_domain(repo.name, signals)
+            # Unchanged repos and unambiguous layouts skip the AI call
+            result = self._lookup_persistent(repo, signals) or self._rule_based_classify(signals)
+            if not result:
+                result = self._ai_classify_domain(name, signals)
+                self._store_persistent(repo, signals, result)
 
             # Cache result
-            self.detection_cache[cache_key] = result
+            with self._cache_lock:
+                self.detection_cache[cache_key] = result
             return result
 
         except Exception as e:
-            logger.error(f"Error detecting domain for {repo.name}: {e}")
+            logger.error(f"Error detecting domain for {name}: {e}")
             return {
                 'domain': 'unknown',
                 'confidence': 0.0,
@@ -117,40 +363,99 @@ class DomainDetector:
             'topics': []
         }
 
+        # The three lookups are independent round trips, so issue them together
+        contents = self._signal_executor.submit(self._fetch_root_contents, repo)
+        readme = self._signal_executor.submit(self._fetch_readme_snippet, repo)
+        topics = self._signal_executor.submit(self._fetch_topics, repo)
+
+        signals.update(contents.result())
+        signals['readme_snippet'] = readme.result()
+        signals['topics'] = topics.result()
+
+        return signals
+
+    def _fetch_root_contents(self, repo: Repository) -> Dict[str, any]:
+        """Get root files, directories and file extension counts."""
+        structure = {
+            'root_files': [],
+            'root_directories': [],
+            'file_types': {}
+        }
+
         try:
-            # Get root directory structure
-            contents = repo.get_contents("")
+            # Get root directory structure (one flat tree response, no per-entry objects)
+            tree = repo.get_git_tree(repo.default_branch).tree
 
-            for item in contents[:50]:  # Limit to avoid rate limits
-                if item.type == 'dir':
-                    signals['root_directories'].append(item.name)
+            for item in islice(tree, 50):  # Limit prompt size
+                if item.type == 'tree':
+                    structure['root_directories'].append(item.path)
                 else:
-                    signals['root_files'].append(item.name)
+                    structure['root_files'].append(item.path)
 
                     # Track file extensions
-                    if '.' in item.name:
-                        ext = item.name.split('.')[-1]
-                        signals['file_types'][ext] = signals['file_types'].get(ext, 0) + 1
+                    _, dot, ext = item.path.rpartition('.')
+                    if dot:
+                        structure['file_types'][ext] = structure['file_types'].get(ext, 0) + 1
 
         except GithubException as e:
             logger.debug(f"Could not fetch contents for {repo.name}: {e}")
 
-        # Get README snippet
+        return structure
+
+    def _fetch_readme_snippet(self, repo: Repository) -> str:
+        """Get README snippet."""
         try:
             readme = repo.get_readme()
             readme_content = readme.decoded_content.decode('utf-8', errors='ignore')
             # Get first 500 chars for context
-            signals['readme_snippet'] = readme_content[:500]
+            return readme_content[:500]
         except:
-            pass
+            return ''
 
-        # Get topics
+    def _fetch_topics(self, repo: Repository) -> List[str]:
+        """Get repository topics."""
         try:
-            signals['topics'] = repo.get_topics()
+            return repo.get_topics()
         except:
-            pass
+            return []
 
-        return signals
+    def _rule_based_classify(self, signals: Dict) -> Optional[Dict[str, any]]:
+        """
+        Classify trivially recognisable repositories from their signals.
+
+        Returns a result only when every matching rule agrees on one domain
+        and the confidence reaches rule_confidence_threshold.
+
+        Args:
+            signals: Gathered repository signals
+
+        Returns:
+            Classification result dict, or None to fall back to AI
+        """
+        facts = {
+            'files': frozenset(name.lower() for name in signals['root_files']),
+            'dirs': frozenset(name.lower() for name in signals['root_directories']),
+            'file_types': signals['file_types'],
+        }
+
+        matches = [
+            (confidence, domain, reasoning)
+            for predicate, domain, confidence, reasoning in DOMAIN_RULES
+            if predicate(facts)
+        ]
+        if not matches or len({domain for _, domain, _ in matches}) > 1:
+            return None
+
+        confidence, domain, reasoning = max(matches)
+        if confidence < self.rule_confidence_threshold:
+            return None
+
+        return {
+            'domain': domain,
+            'confidence': confidence,
+            'reasoning': reasoning,
+            'all_domains': {domain: confidence}
+        }
 
     def _ai_classify_domain(self, repo_name: str, signals: Dict) -> Dict[str, any]:
         """
@@ -167,65 +472,18 @@ class DomainDetector:
         prompt = self._build_classification_prompt(repo_name, signals)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert at analyzing software repositories and determining their engineering domain.
-
-Analyze the provided repository information and classify it into one of these domains:
-- mobile: Mobile applications (iOS, Android, cross-platform)
-- backend: Backend services, APIs, microservices
-- frontend: Web frontends, SPAs, user interfaces
-- infrastructure: Infrastructure as code, DevOps, deployment
-- data: Data pipelines, ETL, analytics, warehousing
-- ml: Machine learning, AI models, inference services
-- library: Shared libraries, SDKs, frameworks
-- tooling: Developer tools, CLI applications, scripts
-
-Return ONLY a valid JSON object with this exact structure:
-{
-  "domain": "backend",
-  "confidence": 0.95,
-  "reasoning": "Brief explanation of why this classification was chosen",
-  "all_domains": {
-    "backend": 0.95,
-    "infrastructure": 0.3
-  }
-}
-
-Rules:
-- confidence is 0.0 to 1.0
-- reasoning should be 1-2 sentences
-- all_domains should include any domain with confidence > 0.2
-- Use "unknown" if truly unclear (confidence < 0.4)"""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=300
+            self.throttle.wait()
+            response = self.client.beta.chat.completions.parse(
+                **self._classification_request(prompt),
+                response_format=DomainClassification
             )
 
-            # Parse response
-            content = response.choices[0].message.content.strip()
-
-            # Extract JSON from potential markdown code blocks
-            if '```json' in content:
-                content = content.split('```json')[1].split('```')[0].strip()
-            elif '```' in content:
-                content = content.split('```')[1].split('```')[0].strip()
+            # Structured output is schema-validated; None means a refusal
+            parsed = response.choices[0].message.parsed
+            if parsed is None:
+                raise ValueError(response.choices[0].message.refusal or "No classification returned")
 
-            result = json.loads(content)
-
-            # Validate result
-            if not all(k in result for k in ['domain', 'confidence', 'reasoning']):
-                raise ValueError("Invalid response format from AI")
-
-            return result
+            return parsed.to_result()
 
         except Exception as e:
             logger.error(f"Error in AI classification for {repo_name}: {e}")
@@ -236,6 +494,163 @@ Rules:
                 'all_domains': {}
             }
 
+    def _classification_request(self, prompt: str) -> Dict:
+        """Build chat completion parameters for a single-repository prompt."""
+        return {
+            'model': self.model,
+            'messages': self._base_messages + [{"role": "user", "content": prompt}],
+            'temperature': 0.3,
+            'max_tokens': 300
+        }
+
+    def _ai_classify_domains_batch(self, items: List[Tuple[str, Dict]]) -> List[Dict[str, any]]:
+        """
+        Classify several repositories with a single AI request.
+
+        Results are matched to inputs by position (falling back to the
+        returned repository name). Any repository missing or invalid in the
+        batched response is classified on its own.
+
+        Args:
+            items: List of (repo_name, signals) tuples
+
+        Returns:
+            Classification result dicts, in input order
+        """
+        if len(items) == 1:
+            return [self._ai_classify_domain(*items[0])]
+
+        sections = [
+            f"[{i}] {self._build_classification_prompt(repo_name, signals)}"
+            for i, (repo_name, signals) in enumerate(items, 1)
+        ]
+        prompt = f"Classify each of the following {len(items)} repositories.\n\n" + '\n\n'.join(sections)
+
+        try:
+            self.throttle.wait()
+            response = self.client.beta.chat.completions.parse(
+                model=self.model,
+                messages=self._batch_base_messages + [{"role": "user", "content": prompt}],
+                temperature=0.3,
+                max_tokens=200 * len(items) + 100,
+                response_format=BatchClassification
+            )
+
+            parsed = response.choices[0].message.parsed
+            entries = parsed.results if parsed else []
+
+        except Exception as e:
+            logger.warning(f"Batched domain classification failed for {len(items)} repos: {e}")
+            entries = []
+
+        by_name = {entry.repository: entry for entry in entries}
+
+        results = []
+        for i, (repo_name, signals) in enumerate(items):
+            entry = entries[i] if i < len(entries) else None
+            if entry is None or entry.repository != repo_name:
+                entry = by_name.get(repo_name)
+
+            if entry is not None:
+                results.append(entry.to_result())
+            else:
+                logger.debug(f"No batched classification for {repo_name}, classifying individually")
+                results.append(self._ai_classify_domain(repo_name, signals))
+
+        return results
+
+    def prepare_batch_jsonl(self, items: List[Tuple[str, str, Dict]]) -> Path:
+        """
+        Write one Batch API request per repository to a JSONL file.
+
+        Args:
+            items: List of (full_name, repo_name, signals) tuples
+
+        Returns:
+            Path to the JSONL file (caller removes it)
+        """
+        with tempfile.NamedTemporaryFile(
+            'w', prefix='domain_batch_', suffix='.jsonl', delete=False
+        ) as f:
+            for full_name, repo_name, signals in items:
+                body = self._classification_request(
+                    self._build_classification_prompt(repo_name, signals)
+                )
+                # Batch lines are validated against DomainClassification on return
+                body['response_format'] = {"type": "json_object"}
+                request = {
+                    'custom_id': full_name,
+                    'method': 'POST',
+                    'url': '/v1/chat/completions',
+                    'body': body
+                }
+                f.write(json.dumps(request) + '\n')
+
+        return Path(f.name)
+
+    def submit_and_wait(self, batch_path: Path) -> Dict[str, Dict]:
+        """
+        Run a JSONL file through the OpenAI Batch API and wait for results.
+
+        Valid results are merged into the detection cache.
+
+        Args:
+            batch_path: File from prepare_batch_jsonl()
+
+        Returns:
+            Dict mapping repo full names to domain results
+
+        Raises:
+            RuntimeError: If the batch does not complete
+        """
+        with open(batch_path, 'rb') as f:
+            input_file = self.client.files.create(file=f, purpose='batch')
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        logger.info(f"Submitted domain classification batch {batch.id}, waiting for results...")
+
+        # Poll with exponential backoff
+        interval = self.BATCH_POLL_INTERVAL
+        while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            time.sleep(interval)
+            interval = min(interval * 2, self.BATCH_POLL_MAX_INTERVAL)
+            batch = self.client.batches.retrieve(batch.id)
+            logger.debug(f"Batch {batch.id} status: {batch.status}")
+
+        if batch.status != 'completed' or not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+        results = {}
+        output = self.client.files.content(batch.output_file_id).text
+
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+
+            entry = json.loads(line)
+            full_name = entry.get('custom_id')
+            response = entry.get('response') or {}
+            if response.get('status_code') != 200:
+                logger.debug(f"Batch request failed for {full_name}: {entry.get('error')}")
+                continue
+
+            try:
+                content = response['body']['choices'][0]['message']['content']
+                results[full_name] = DomainClassification.model_validate_json(content).to_result()
+            except (KeyError, IndexError, ValueError) as e:
+                logger.debug(f"Unparseable batch result for {full_name}: {e}")
+
+        with self._cache_lock:
+            for full_name, result in results.items():
+                self.detection_cache[full_name] = result
+
+        logger.info(f"Batch {batch.id} classified {len(results)} repositories")
+        return results
+
     def _build_classification_prompt(self, repo_name: str, signals: Dict) -> str:
         """
         Build prompt for AI classification.
@@ -247,53 +662,80 @@ Rules:
         Returns:
             Formatted prompt string
         """
-        # Convert sets to lists for JSON serialization
-        tech_summary = {}
-        for category, techs in signals.get('technologies', {}).items():
-            if techs:
-                tech_summary[category] = list(techs)
-
-        prompt_parts = [
-            f"Repository: {repo_name}",
-            ""
-        ]
+        signals = self._compress_signals(signals)
+
+        # Sections keyed by name, in priority order for the character budget
+        sections = {}
+
+        if signals.get('topics'):
+            sections['topics'] = f"\nTopics: {', '.join(signals['topics'])}"
 
         if signals.get('description'):
-            prompt_parts.append(f"Description: {signals['description']}")
-            prompt_parts.append("")
+            sections['description'] = f"Description: {signals['description']}\n"
+
+        # Technology sets are read directly (no list copies)
+        tech_lines = '\n'.join(
+            f"  {category}: {', '.join(islice(techs, 5))}"
+            for category, techs in signals.get('technologies', {}).items()
+            if techs
+        )
+        if tech_lines:
+            sections['technologies'] = f"\nTechnologies:\n{tech_lines}"
 
         if signals.get('root_directories'):
-            dirs = ', '.join(signals['root_directories'][:10])
-            prompt_parts.append(f"Root Directories: {dirs}")
+            dirs = ', '.join(islice(signals['root_directories'], 10))
+            sections['root_directories'] = f"Root Directories: {dirs}"
 
         if signals.get('root_files'):
-            files = ', '.join(signals['root_files'][:15])
-            prompt_parts.append(f"Root Files: {files}")
+            files = ', '.join(islice(signals['root_files'], 15))
+            sections['root_files'] = f"Root Files: {files}"
 
         if signals.get('file_types'):
             # Show top file types
-            sorted_types = sorted(
-                signals['file_types'].items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:8]
-            types_str = ', '.join(f"{ext}({count})" for ext, count in sorted_types)
-            prompt_parts.append(f"File Types: {types_str}")
-
-        if tech_summary:
-            prompt_parts.append(f"\nTechnologies:")
-            for category, techs in tech_summary.items():
-                if techs:
-                    prompt_parts.append(f"  {category}: {', '.join(techs[:5])}")
-
-        if signals.get('topics'):
-            prompt_parts.append(f"\nTopics: {', '.join(signals['topics'])}")
+            top_types = heapq.nlargest(8, signals['file_types'].items(), key=itemgetter(1))
+            types_str = ', '.join(f"{ext}({count})" for ext, count in top_types)
+            sections['file_types'] = f"File Types: {types_str}"
 
         if signals.get('readme_snippet'):
-            prompt_parts.append(f"\nREADME Snippet:")
-            prompt_parts.append(signals['readme_snippet'])
+            sections['readme'] = f"\nREADME Snippet:\n{signals['readme_snippet']}"
+
+        header = f"Repository: {repo_name}\n"
+        budget = self.max_prompt_chars - len(header) - 1
+        included = {}
+        for name, text in sections.items():
+            if len(text) > budget:
+                # README is last and still useful when cut short
+                if name != 'readme' or budget < 100:
+                    continue
+                text = text[:budget]
+            included[name] = text
+            budget -= len(text) + 1
+
+        return '\n'.join(
+            [header] + [included[name] for name in PROMPT_SECTION_ORDER if name in included]
+        )
+
+    def _compress_signals(self, signals: Dict) -> Dict:
+        """
+        Drop low-value signal detail before it is sent to the model.
+
+        Keeps only file types seen more than twice and not already implied
+        by a detected technology, and strips markdown noise from the README.
+        """
+        covered = {
+            tech.lower()
+            for techs in signals.get('technologies', {}).values()
+            for tech in techs
+        }
+        file_types = {
+            ext: count
+            for ext, count in signals.get('file_types', {}).items()
+            if count > 2 and EXTENSION_LANGUAGES.get(ext) not in covered
+        }
+
+        readme = _clean_readme(signals.get('readme_snippet', ''))
 
-        return '\n'.join(prompt_parts)
+        return {**signals, 'file_types': file_types, 'readme_snippet': readme}
 
     def batch_detect_domains(
         self,
@@ -302,28 +744,202 @@ Rules:
         """
         Detect domains for multiple repositories efficiently.
 
+        Repositories not already cached are classified `batch_size` at a
+        time, sharing one AI request (and system prompt) per batch. Up to
+        `concurrency` batches run in parallel.
+
         Args:
             repo_data: List of dicts with 'repo' and 'technologies'
 
         Returns:
-            Dict mapping repo names to domain results
+            Dict mapping repo full names to domain results
         """
         results = {}
+        pending = []
+
+        # Snapshot identifiers once per repo (repo attributes may be lazily completed)
+        names = [(item['repo'].name, item['repo'].full_name) for item in repo_data]
+
+        for item, (_, full_name) in zip(repo_data, names):
+            cached = self.detection_cache.get(full_name)
+            if cached is not None:
+                results[full_name] = cached
+            else:
+                pending.append(item)
+
+        if self.use_batch_api and pending:
+            results.update(self._detect_domains_batch_api(pending))
+            # Anything the Batch API did not return goes through direct requests
+            pending = [item for item in pending if item['repo'].full_name not in results]
+
+        batches = [
+            pending[start:start + self.batch_size]
+            for start in range(0, len(pending), self.batch_size)
+        ]
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as executor:
+                for batch_results in executor.map(self._detect_domain_batch, batches):
+                    results.update(batch_results)
+
+        for name, full_name in names:
+            domain_result = results[full_name]
+            logger.info(
+                f"  {name}: {domain_result['domain']} "
+                f"(confidence: {domain_result['confidence']:.2f})"
+            )
+
+        return results
+
+    def _detect_domains_batch_api(self, items: List[Dict]) -> Dict[str, Dict]:
+        """
+        Classify repositories through the OpenAI Batch API.
+
+        Args:
+            items: List of dicts with 'repo' and 'technologies'
 
-        for item in repo_data:
+        Returns:
+            Dict mapping repo full names to domain results
+        """
+        results = {}
+        gathered = []
+        for item in items:
             repo = item['repo']
-            technologies = item.get('technologies')
+            try:
+                signals = self._gather_repo_signals(repo, item.get('technologies'))
+                gathered.append((repo, signals))
+            except Exception as e:
+                logger.error(f"Error gathering signals for {repo.name}: {e}")
+
+        gathered = self._apply_domain_rules(gathered, results)
+        if not gathered:
+            return results
+
+        batch_path = self.prepare_batch_jsonl(
+            [(repo.full_name, repo.name, signals) for repo, signals in gathered]
+        )
+        try:
+            batch_results = self.submit_and_wait(batch_path)
+            for repo, signals in gathered:
+                if repo.full_name in batch_results:
+                    self._store_persistent(repo, signals, batch_results[repo.full_name])
+            results.update(batch_results)
+        except Exception as e:
+            logger.warning(f"Batch API classification failed, using direct requests: {e}")
+        finally:
+            batch_path.unlink(missing_ok=True)
 
-            domain_result = self.detect_domain(repo, technologies)
-            results[repo.full_name] = domain_result
+        return results
 
-            logger.info(
-                f"  {repo.name}: {domain_result['domain']} "
-                f"(confidence: {domain_result['confidence']:.2f})"
+    def _detect_domain_batch(self, batch: List[Dict]) -> Dict[str, Dict]:
+        """
+        Gather signals and classify one batch of uncached repositories.
+
+        Args:
+            batch: List of dicts with 'repo' and 'technologies'
+
+        Returns:
+            Dict mapping repo full names to domain results
+        """
+        results = {}
+        gathered = []
+
+        for item in batch:
+            repo = item['repo']
+            try:
+                signals = self._gather_repo_signals(repo, item.get('technologies'))
+                gathered.append((repo, signals))
+            except Exception as e:
+                logger.error(f"Error detecting domain for {repo.name}: {e}")
+                results[repo.full_name] = {
+                    'domain': 'unknown',
+                    'confidence': 0.0,
+                    'reasoning': f'Error during detection: {str(e)}',
+                    'all_domains': {}
+                }
+
+        gathered = self._apply_domain_rules(gathered, results)
+
+        if gathered:
+            classifications = self._ai_classify_domains_batch(
+                [(repo.name, signals) for repo, signals in gathered]
             )
+            with self._cache_lock:
+                for (repo, signals), result in zip(gathered, classifications):
+                    self.detection_cache[repo.full_name] = result
+                    results[repo.full_name] = result
+            for (repo, signals), result in zip(gathered, classifications):
+                self._store_persistent(repo, signals, result)
 
         return results
 
+    def _apply_domain_rules(
+        self,
+        gathered: List[Tuple[Repository, Dict]],
+        results: Dict[str, Dict]
+    ) -> List[Tuple[Repository, Dict]]:
+        """
+        Resolve repositories from the on-disk cache or rules, without AI.
+
+        Matches are cached and added to `results`.
+
+        Returns:
+            The (repo, signals) pairs that still need AI classification
+        """
+        remaining = []
+        for repo, signals in gathered:
+            result = self._lookup_persistent(repo, signals) or self._rule_based_classify(signals)
+            if result:
+                with self._cache_lock:
+                    self.detection_cache[repo.full_name] = result
+                results[repo.full_name] = result
+            else:
+                remaining.append((repo, signals))
+
+        return remaining
+
+    def _signals_key(self, repo: Repository, signals: Dict) -> str:
+        """Build persistent cache key from repo name and its gathered signals."""
+        # sort_keys + sorted sets keep the hash stable across runs
+        stable = json.dumps(signals, sort_keys=True, default=sorted)
+        return hashlib.blake2b(
+            f"{repo.full_name}:{stable}".encode(),
+            digest_size=16
+        ).hexdigest()
+
+    def _lookup_persistent(self, repo: Repository, signals: Dict) -> Optional[Dict]:
+        """Return the stored result for unchanged signals, if any."""
+        if self.persistent_cache is None:
+            return None
+
+        with self._cache_lock:
+            result = self.persistent_cache.get(self._signals_key(repo, signals))
+
+        if result:
+            logger.debug(f"Domain cache hit for {repo.name}")
+        return result
+
+    def _store_persistent(self, repo: Repository, signals: Dict, result: Dict) -> None:
+        """Write a successful AI result through to the on-disk cache."""
+        # Failed classifications come back with zero confidence; retry those next run
+        if self.persistent_cache is None or not result.get('confidence'):
+            return
+
+        with self._cache_lock:
+            self.persistent_cache[self._signals_key(repo, signals)] = result
+
+    def save_cache(self) -> None:
+        """Flush persistent domain cache to disk."""
+        if self.persistent_cache is not None:
+            with self._cache_lock:
+                self.persistent_cache.sync()
+
+    def invalidate_cache(self) -> None:
+        """Drop all persisted domain results."""
+        if self.persistent_cache is not None:
+            with self._cache_lock:
+                self.persistent_cache.clear()
+            logger.info("Domain cache invalidated")
+
     def get_domain_statistics(self, domain_results: Dict[str, Dict]) -> Dict:
         """
         Calculate statistics across detected domains.
@@ -334,30 +950,27 @@ Rules:
         Returns:
             Statistics dict
         """
-        from collections import Counter
+        # Single pass: per-domain counts and confidence sums
+        counts = defaultdict(int)
+        confidence_sums = defaultdict(float)
+        for result in domain_results.values():
+            domain = result['domain']
+            counts[domain] += 1
+            confidence_sums[domain] += result['confidence']
 
-        domains = [result['domain'] for result in domain_results.values()]
-        domain_counts = Counter(domains)
-        total = len(domains)
+        total = len(domain_results)
 
         stats = {
             'total_repos': total,
             'by_domain': {},
-            'avg_confidence': sum(r['confidence'] for r in domain_results.values()) / total if total > 0 else 0,
+            'avg_confidence': sum(confidence_sums.values()) / total if total > 0 else 0,
         }
 
-        for domain, count in domain_counts.items():
+        for domain, count in counts.items():
             stats['by_domain'][domain] = {
                 'count': count,
                 'percentage': round(count / total * 100, 1),
-                'avg_confidence': round(
-                    sum(
-                        r['confidence']
-                        for r in domain_results.values()
-                        if r['domain'] == domain
-                    ) / count,
-                    2
-                )
+                'avg_confidence': round(confidence_sums[domain] / count, 2)
             }
 
         return stats
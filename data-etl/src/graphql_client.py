@@ -0,0 +1,99 @@
+"""
+Minimal GitHub GraphQL client for batched repository queries.
+
+One GraphQL request can cover many repositories via aliases, replacing one
+REST round-trip per repository.
+"""
+
+import logging
+from typing import Dict, List
+
+from http_clients import create_http_session
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubGraphQL:
+    """Runs batched repository queries against the GitHub GraphQL API."""
+
+    API_URL = 'https://api.github.com/graphql'
+
+    # Repositories per request (well under GitHub's node limits)
+    BATCH_SIZE = 100
+
+    def __init__(self, github_token: str, timeout: int = 30):
+        """
+        Initialize GraphQL client.
+
+        Args:
+            github_token: GitHub personal access token
+            timeout: Request timeout in seconds
+        """
+        self.timeout = timeout
+        self.session = create_http_session()
+        self.session.headers['Authorization'] = f'bearer {github_token}'
+
+    def query(self, query: str, variables: Dict = None) -> Dict:
+        """
+        Execute a GraphQL query.
+
+        Args:
+            query: GraphQL query string
+            variables: Query variables
+
+        Returns:
+            The `data` object of the response (may be partial)
+
+        Raises:
+            requests.HTTPError: On HTTP-level failure
+        """
+        response = self.session.post(
+            self.API_URL,
+            json={'query': query, 'variables': variables or {}},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        payload = response.json()
+
+        # Per-repo errors (e.g. NOT_FOUND) still return data for the rest
+        for error in payload.get('errors', []):
+            logger.debug(f"GraphQL error: {error.get('message')}")
+
+        return payload.get('data') or {}
+
+    def fetch_repositories(self, full_names: List[str], fields: str) -> Dict[str, Dict]:
+        """
+        Fetch the same fields for many repositories, BATCH_SIZE per request.
+
+        Args:
+            full_names: Repository names (org/repo)
+            fields: GraphQL selection applied to each repository
+
+        Returns:
+            Dict mapping full name to the repository's result
+            (repos that could not be resolved are omitted)
+        """
+        results = {}
+
+        for start in range(0, len(full_names), self.BATCH_SIZE):
+            batch = full_names[start:start + self.BATCH_SIZE]
+
+            params = []
+            selections = []
+            variables = {}
+            for i, full_name in enumerate(batch):
+                owner, name = full_name.split('/', 1)
+                params.append(f'$o{i}: String!, $n{i}: String!')
+                selections.append(f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ {fields} }}')
+                variables[f'o{i}'] = owner
+                variables[f'n{i}'] = name
+
+            query = f"query({', '.join(params)}) {{\n" + '\n'.join(selections) + '\n}'
+            data = self.query(query, variables)
+
+            for i, full_name in enumerate(batch):
+                repo_data = data.get(f'r{i}')
+                if repo_data is not None:
+                    results[full_name] = repo_data
+
+        return results
@@ -0,0 +1,172 @@
+"""
+Shared API clients for GitHub and OpenAI.
+
+Components get their clients here so concurrent calls reuse pooled
+keep-alive connections instead of each component opening its own.
+"""
+
+import hashlib
+import json
+import logging
+import shelve
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from github import Auth, Github
+from openai import OpenAI
+
+from rate_limiter import RequestThrottle
+
+logger = logging.getLogger(__name__)
+
+# Keep-alive connections per host (covers the largest thread pools in use)
+POOL_SIZE = 32
+
+_openai_clients = {}
+_openai_lock = threading.Lock()
+_openai_throttle = None
+
+
+def create_github_client(github_token: str) -> Github:
+    """
+    Create a PyGithub client with a connection pool sized for concurrent use.
+
+    Args:
+        github_token: GitHub personal access token
+
+    Returns:
+        Github instance
+    """
+    return Github(auth=Auth.Token(github_token), per_page=100, pool_size=POOL_SIZE)
+
+
+def create_http_session() -> requests.Session:
+    """
+    Create a requests session with pooled keep-alive connections.
+
+    Transient server errors (5xx) are retried with exponential backoff.
+    POST is included because the session carries read-only GraphQL queries.
+
+    Returns:
+        requests.Session instance
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=None,
+        raise_on_status=False  # Hand the final response back to the caller
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
+
+
+def get_openai_client(api_key: str) -> OpenAI:
+    """
+    Get the process-wide OpenAI client for an API key.
+
+    OpenAI clients are thread-safe, so one client (and its HTTP pool)
+    is shared by every component.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        OpenAI instance
+    """
+    with _openai_lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            client = OpenAI(api_key=api_key)
+            _openai_clients[api_key] = client
+        return client
+
+
+def get_openai_throttle(requests_per_minute: int = 500) -> RequestThrottle:
+    """
+    Get the process-wide OpenAI request throttle.
+
+    Every component that calls OpenAI waits on this one throttle, so the
+    configured per-minute limit holds for the whole process rather than
+    for each component separately. The first caller's limit is used.
+
+    Args:
+        requests_per_minute: Maximum requests per minute across all threads
+
+    Returns:
+        RequestThrottle instance
+    """
+    global _openai_throttle
+    with _openai_lock:
+        if _openai_throttle is None:
+            _openai_throttle = RequestThrottle(requests_per_minute)
+        return _openai_throttle
+
+
+class CompletionCache:
+    """
+    On-disk cache of OpenAI chat completion responses.
+
+    Entries are keyed by a hash of the request (model, messages and sampling
+    parameters), so rerunning with identical prompts skips the API call.
+    A cache without a path stores nothing.
+    """
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        """
+        Initialize completion cache.
+
+        Args:
+            cache_path: Optional shelve path to persist responses across runs
+        """
+        self.store = None
+        self._lock = threading.Lock()
+        if cache_path:
+            try:
+                self.store = shelve.open(str(cache_path))
+                logger.info(f"Using completion cache: {cache_path} ({len(self.store)} entries)")
+            except Exception as e:
+                logger.warning(f"Could not open completion cache {cache_path}: {e}")
+
+    @staticmethod
+    def key(request: Dict) -> str:
+        """Build the cache key for a chat completion request."""
+        return hashlib.blake2b(
+            json.dumps(request, sort_keys=True).encode(),
+            digest_size=16
+        ).hexdigest()
+
+    def get(self, request: Dict) -> Optional[str]:
+        """Return the cached response content for a request, if any."""
+        if self.store is None:
+            return None
+
+        with self._lock:
+            return self.store.get(self.key(request))
+
+    def put(self, request: Dict, content: str) -> None:
+        """Store the response content for a request."""
+        if self.store is None:
+            return
+
+        with self._lock:
+            self.store[self.key(request)] = content
+
+    def sync(self) -> None:
+        """Flush cached responses to disk."""
+        if self.store is not None:
+            with self._lock:
+                self.store.sync()
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        if self.store is not None:
+            with self._lock:
+                self.store.clear()
@@ -50,6 +50,9 @@ Examples:
   # Start fresh (clear checkpoint)
   python main.py --fresh
 
+  # Large overnight scan using the OpenAI Batch API
+  python main.py --batch
+
   # Custom config and output
   python main.py --config custom.yaml --output custom.ai.json
         """
@@ -104,6 +107,24 @@ Examples:
         help='Limit number of repositories to scan (e.g., --limit 100)'
     )
 
+    parser.add_argument(
+        '--invalidate-cache',
+        action='store_true',
+        help='Discard cached technology detection, domain classifications, deep scan results and AI responses and re-run them'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore the on-disk caches for this run (nothing is read or written)'
+    )
+
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Classify repository domains via the OpenAI Batch API (cheaper, can take hours)'
+    )
+
     return parser.parse_args()
 
 
@@ -131,6 +152,10 @@ def main():
             config.config['github']['organizations'] = [args.org]
             logger.info(f"Overriding organization: {args.org}")
 
+        if args.no_cache:
+            config.config.setdefault('cache', {})['enabled'] = False
+            logger.info("On-disk caches disabled for this run")
+
         output_path = Path(args.output) if args.output else config.get_output_path()
 
         # Initialize progress tracker
@@ -164,7 +189,8 @@ def main():
             config.get_github_token(),
             config.to_dict(),
             progress_tracker,
-            config.get_openai_key()  # Enable domain detection
+            config.get_openai_key(),  # Enable domain detection
+            config.get_cache_dir()
         )
 
         # Set repo limit if specified
@@ -172,6 +198,18 @@ def main():
             scanner.repo_limit = args.limit
             logger.info(f"Limiting scan to {args.limit} repositories")
 
+        if args.invalidate_cache:
+            scanner.detector.invalidate_cache()
+            if scanner.domain_detector:
+                scanner.domain_detector.invalidate_cache()
+            if scanner.deep_scanner:
+                scanner.deep_scanner.invalidate_cache()
+
+        # Use the OpenAI Batch API for domain detection
+        if args.batch and scanner.domain_detector:
+            scanner.domain_detector.use_batch_api = True
+            logger.info("Using OpenAI Batch API for domain detection")
+
         # Scan repositories
         logger.info("Scanning repositories...")
         print()
@@ -189,10 +227,14 @@ def main():
 
         # Classify technologies with enhanced temporal analysis
         logger.info("Classifying technologies with AI and temporal analysis...")
+        cache_dir = config.get_cache_dir()
         classifier = EnhancedTechnologyClassifier(
             config.get_openai_key(),
-            config.to_dict()
+            config.to_dict(),
+            cache_path=cache_dir / 'classifications' if cache_dir else None
         )
+        if args.invalidate_cache:
+            classifier.invalidate_cache()
 
         total_repos = stats['repos_scanned']
         high_confidence, needs_review = classifier.classify_technologies(
@@ -200,6 +242,7 @@ def main():
             total_repos,
             repo_details
         )
+        classifier.save_cache()
 
         logger.info(f"Classified {len(high_confidence)} high-confidence + {len(needs_review)} needs-review technologies")
 
@@ -238,15 +281,16 @@ def main():
             # Save filtering report to separate file
             if not args.dry_run:
                 report_path = output_path.parent / 'filtering_report.json'
-                with open(report_path, 'w') as f:
-                    json.dump(filtering_report, f, indent=2, default=str)
+                # Encode in one go and write once (json.dump issues a write per token)
+                report_path.write_text(json.dumps(filtering_report, indent=2, default=str))
                 logger.info(f"Filtering report saved to: {report_path}")
         else:
             logger.info("Filtering disabled in config")
 
         # Separate back into high_confidence and needs_review for output
-        high_confidence = [t for t in filtered_techs if not t.get('needs_review', False)]
-        needs_review = [t for t in filtered_techs if t.get('needs_review', False)]
+        high_confidence, needs_review = [], []
+        for tech in filtered_techs:
+            (needs_review if tech.get('needs_review', False) else high_confidence).append(tech)
 
         # Generate unified output
         if args.dry_run:
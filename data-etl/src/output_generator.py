@@ -4,11 +4,30 @@ Unified output generator for data.ai.json with review metadata
 
 import json
 import logging
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Classifier metadata fields copied into the unified output (in output order)
+METADATA_KEYS = (
+    'repos_count',
+    'usage_percentage',
+    'total_repos',
+    'ai_confidence',
+    'ai_model',
+    'temporal_data',
+    'usage_score',
+    'recency_score',
+    'activity_score',
+)
+
+# Output file buffer (default 8 KiB means a write() syscall every few entries)
+WRITE_BUFFER_SIZE = 1 << 18  # 256 KiB
+
 
 class UnifiedOutputGenerator:
     """Generates unified data.ai.json with review metadata for all technologies."""
@@ -57,33 +76,15 @@ class UnifiedOutputGenerator:
         config: Dict
     ) -> List[Dict]:
         """Prepare unified output with all technologies."""
-        all_technologies = []
-
-        # Add high-confidence entries (needs_review = false)
-        for entry in high_confidence:
-            unified_entry = {
-                'name': entry['name'],
-                'quadrant': entry['quadrant'],
-                'ring': entry['ring'],
-                'description': entry['description'],
-                'confidence': entry['confidence'],
-                'needs_review': False,
-                'metadata': self._prepare_metadata(entry, False)
-            }
-            all_technologies.append(unified_entry)
-
-        # Add needs-review entries (needs_review = true)
-        for entry in needs_review:
-            unified_entry = {
-                'name': entry['name'],
-                'quadrant': entry['quadrant'],
-                'ring': entry['ring'],
-                'description': entry['description'],
-                'confidence': entry['confidence'],
-                'needs_review': True,
-                'metadata': self._prepare_metadata(entry, True)
-            }
-            all_technologies.append(unified_entry)
+        # High-confidence entries get needs_review = false, the rest true
+        tagged = chain(
+            ((entry, False) for entry in high_confidence),
+            ((entry, True) for entry in needs_review)
+        )
+        all_technologies = [
+            self._build_unified_entry(entry, review)
+            for entry, review in tagged
+        ]
 
         # Sort data
         sort_by = config.get('sort_by', 'usage')
@@ -91,19 +92,22 @@ class UnifiedOutputGenerator:
 
         return sorted_data
 
+    def _build_unified_entry(self, entry: Dict, needs_review: bool) -> Dict:
+        """Build one unified output entry."""
+        return {
+            'name': entry['name'],
+            'quadrant': entry['quadrant'],
+            'ring': entry['ring'],
+            'description': entry['description'],
+            'confidence': entry['confidence'],
+            'needs_review': needs_review,
+            'metadata': self._prepare_metadata(entry, needs_review)
+        }
+
     def _prepare_metadata(self, entry: Dict, needs_review: bool) -> Dict:
         """Prepare metadata for unified output."""
-        metadata = {
-            'repos_count': entry['metadata']['repos_count'],
-            'usage_percentage': entry['metadata']['usage_percentage'],
-            'total_repos': entry['metadata']['total_repos'],
-            'ai_confidence': entry['metadata']['ai_confidence'],
-            'ai_model': entry['metadata']['ai_model'],
-            'temporal_data': entry['metadata']['temporal_data'],
-            'usage_score': entry['metadata']['usage_score'],
-            'recency_score': entry['metadata']['recency_score'],
-            'activity_score': entry['metadata']['activity_score']
-        }
+        source = entry['metadata']
+        metadata = {key: source[key] for key in METADATA_KEYS}
 
         # Add decision factors for all entries
         if 'decision_factors' in entry:
@@ -139,21 +143,55 @@ class UnifiedOutputGenerator:
         full_output_path.parent.mkdir(parents=True, exist_ok=True)
 
         indent = 2 if config.get('format') == 'pretty' else None
-        with open(full_output_path, 'w') as f:
-            json.dump(all_technologies, f, indent=indent)
+        count = self._write_json_array(full_output_path, all_technologies, indent)
 
-        logger.info(f"✓ Written {len(all_technologies)} technologies to {full_output_path} (full version)")
+        logger.info(f"✓ Written {count} technologies to {full_output_path} (full version)")
 
         # Write sanitized version (public use, without sensitive data)
-        sanitized_technologies = self._sanitize_data(all_technologies)
-        with open(output_path, 'w') as f:
-            json.dump(sanitized_technologies, f, indent=indent)
+        count = self._write_json_array(output_path, self._iter_sanitized(all_technologies), indent)
 
-        logger.info(f"✓ Written {len(sanitized_technologies)} technologies to {output_path} (sanitized version)")
+        logger.info(f"✓ Written {count} technologies to {output_path} (sanitized version)")
 
         return output_path
 
-    def _sanitize_data(self, technologies: List[Dict]) -> List[Dict]:
+    def _write_json_array(
+        self,
+        path: Path,
+        entries: Iterable[Dict],
+        indent: Optional[int]
+    ) -> int:
+        """
+        Stream a JSON array to disk one entry at a time.
+
+        Output is identical to json.dumps(list(entries), indent=indent), but
+        only one entry is encoded in memory at a time (json.dumps uses the C
+        encoder for compact output).
+
+        Returns:
+            Number of entries written
+        """
+        if indent is None:
+            opener, separator, closer = '[', ', ', ']'
+        else:
+            newline = '\n' + ' ' * indent
+            opener, separator, closer = '[' + newline, ',' + newline, '\n]'
+
+        count = 0
+        with open(path, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+            for entry in entries:
+                text = json.dumps(entry, indent=indent)
+                if indent is not None:
+                    # Nest the entry one level inside the array
+                    text = text.replace('\n', newline)
+                f.write(separator if count else opener)
+                f.write(text)
+                count += 1
+
+            f.write(closer if count else '[]')
+
+        return count
+
+    def _iter_sanitized(self, technologies: Iterable[Dict]) -> Iterator[Dict]:
         """
         Remove sensitive internal information for public version.
 
@@ -166,9 +204,10 @@ class UnifiedOutputGenerator:
         - usage_score, recency_score, activity_score (internal metrics)
         - decision_factors (internal decision rationale)
         - review_metadata (internal review process)
-        """
-        sanitized = []
 
+        Yields a projected view of each entry as the writer consumes it,
+        so no second list of entries is ever built.
+        """
         for tech in technologies:
             sanitized_tech = {
                 'name': tech['name'],
@@ -180,24 +219,26 @@ class UnifiedOutputGenerator:
             }
 
             # Keep minimal metadata (only AI model info, no internal data)
-            if 'metadata' in tech:
+            metadata = tech.get('metadata')
+            if metadata is not None:
                 sanitized_tech['metadata'] = {
-                    'ai_confidence': tech['metadata'].get('ai_confidence'),
-                    'ai_model': tech['metadata'].get('ai_model')
+                    'ai_confidence': metadata.get('ai_confidence'),
+                    'ai_model': metadata.get('ai_model')
                 }
 
-            sanitized.append(sanitized_tech)
-
-        return sanitized
+            yield sanitized_tech
 
     def _sort_data(self, data: List[Dict], sort_by: str) -> List[Dict]:
         """Sort data by specified criteria."""
         if sort_by == 'usage':
-            return sorted(data, key=lambda x: x['metadata']['usage_percentage'], reverse=True)
+            # Decorate-sort-undecorate: extract the nested key once per entry
+            keyed = [(d['metadata']['usage_percentage'], d) for d in data]
+            keyed.sort(key=itemgetter(0), reverse=True)
+            return [d for _, d in keyed]
         elif sort_by == 'name':
-            return sorted(data, key=lambda x: x['name'])
+            return sorted(data, key=itemgetter('name'))
         elif sort_by == 'ring':
-            return sorted(data, key=lambda x: (x['ring'], x['name']))
+            return sorted(data, key=itemgetter('ring', 'name'))
         elif sort_by == 'confidence':
             return sorted(data, key=lambda x: x.get('confidence', 0), reverse=True)
         else:
@@ -226,48 +267,56 @@ class UnifiedOutputGenerator:
         stats: Dict
     ):
         """Print summary of unified output."""
-        all_techs = high_confidence + needs_review
+        total = len(high_confidence) + len(needs_review)
+
+        # Collect the report and write it with a single print
+        lines = []
 
-        print("\n" + "=" * 70)
-        print("OUTPUT GENERATION SUMMARY")
-        print("=" * 70)
+        lines.append("\n" + "=" * 70)
+        lines.append("OUTPUT GENERATION SUMMARY")
+        lines.append("=" * 70)
 
-        print(f"\n📄 Unified Output File: {output_path}")
-        print(f"  Total technologies: {len(all_techs)}")
+        lines.append(f"\n📄 Unified Output File: {output_path}")
+        lines.append(f"  Total technologies: {total}")
 
-        print(f"\n✓ Auto-Approved (needs_review: false):")
-        print(f"  {len(high_confidence)} technologies with high confidence (≥0.75)")
+        lines.append(f"\n✓ Auto-Approved (needs_review: false):")
+        lines.append(f"  {len(high_confidence)} technologies with high confidence (≥0.75)")
 
         if needs_review:
-            print(f"\n⚠️  Needs Human Review (needs_review: true):")
-            print(f"  {len(needs_review)} technologies require human decision")
-            print(f"\n  Review reasons:")
-            review_reasons = {}
-            for tech in needs_review:
-                reason = tech.get('review_reason', 'Unknown')
-                review_reasons[reason] = review_reasons.get(reason, 0) + 1
-
-            for reason, count in sorted(review_reasons.items(), key=lambda x: x[1], reverse=True):
-                print(f"    - {reason}: {count}")
-
-        print(f"\n📊 Confidence Distribution:")
-        high = sum(1 for t in all_techs if t['confidence'] >= 0.85)
-        medium = sum(1 for t in all_techs if 0.65 <= t['confidence'] < 0.85)
-        low = sum(1 for t in all_techs if t['confidence'] < 0.65)
-
-        print(f"  High (≥0.85):   {high}")
-        print(f"  Medium (0.65-0.85): {medium}")
-        print(f"  Low (<0.65):    {low}")
-
-        print(f"\n📦 Repository Statistics:")
-        print(f"  Scanned: {stats.get('repos_scanned', 0)}")
-        print(f"  Skipped: {stats.get('repos_skipped', 0)}")
+            lines.append(f"\n⚠️  Needs Human Review (needs_review: true):")
+            lines.append(f"  {len(needs_review)} technologies require human decision")
+            lines.append(f"\n  Review reasons:")
+            review_reasons = Counter(tech.get('review_reason', 'Unknown') for tech in needs_review)
+
+            for reason, count in review_reasons.most_common():
+                lines.append(f"    - {reason}: {count}")
+
+        lines.append(f"\n📊 Confidence Distribution:")
+        high = medium = low = 0
+        for tech in chain(high_confidence, needs_review):
+            confidence = tech['confidence']
+            if confidence >= 0.85:
+                high += 1
+            elif confidence >= 0.65:
+                medium += 1
+            else:
+                low += 1
+
+        lines.append(f"  High (≥0.85):   {high}")
+        lines.append(f"  Medium (0.65-0.85): {medium}")
+        lines.append(f"  Low (<0.65):    {low}")
+
+        lines.append(f"\n📦 Repository Statistics:")
+        lines.append(f"  Scanned: {stats.get('repos_scanned', 0)}")
+        lines.append(f"  Skipped: {stats.get('repos_skipped', 0)}")
 
         if needs_review:
-            print(f"\n💡 Next Steps:")
-            print(f"  1. Filter technologies where needs_review = true")
-            print(f"  2. Review temporal_data, decision_factors, and ai_suggestion")
-            print(f"  3. Fill in review_metadata.human_decision (final_ring, notes)")
-            print(f"  4. Set needs_review = false when approved")
+            lines.append(f"\n💡 Next Steps:")
+            lines.append(f"  1. Filter technologies where needs_review = true")
+            lines.append(f"  2. Review temporal_data, decision_factors, and ai_suggestion")
+            lines.append(f"  3. Fill in review_metadata.human_decision (final_ring, notes)")
+            lines.append(f"  4. Set needs_review = false when approved")
+
+        lines.append("\n" + "=" * 70 + "\n")
 
-        print("\n" + "=" * 70 + "\n")
+        print('\n'.join(lines))
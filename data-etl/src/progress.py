@@ -2,7 +2,9 @@
 Progress tracking and checkpoint management.
 """
 
+import os
 import json
+import time
 import logging
 from pathlib import Path
 from typing import Dict, List, Set, Optional
@@ -25,6 +27,10 @@ class ProgressTracker:
         """
         self.checkpoint_path = checkpoint_path
         self.enabled = enabled
+
+        # Append-only log of repos scanned since the last full snapshot
+        self.journal_path = checkpoint_path.with_suffix('.journal')
+        self._journal = None
         self.data = {
             'scanned_repos': [],
             'start_time': None,
@@ -33,6 +39,12 @@ class ProgressTracker:
             'stats': {}
         }
 
+        # Scanned repos as a set for O(1) membership (list only on disk)
+        self._scanned: Set[str] = set()
+
+        # Unsaved changes since the last snapshot
+        self._dirty = False
+
         # Only load checkpoint if explicitly resuming
         if enabled and resume:
             self._load()
@@ -41,25 +53,55 @@ class ProgressTracker:
         """Load progress from checkpoint file."""
         if self.checkpoint_path.exists():
             try:
-                with open(self.checkpoint_path, 'r') as f:
-                    self.data = json.load(f)
-                logger.info(f"Loaded checkpoint: {len(self.data['scanned_repos'])} repos scanned")
+                # Decode the raw bytes in one call (no text-layer pass)
+                self.data = json.loads(self.checkpoint_path.read_bytes())
+                self._scanned = set(self.data.get('scanned_repos', []))
+                self._load_journal()
+                logger.info(f"Loaded checkpoint: {len(self._scanned)} repos scanned")
             except Exception as e:
                 logger.warning(f"Could not load checkpoint: {e}")
                 self.data['scanned_repos'] = []
+                self._scanned = set()
+
+    def _load_journal(self) -> None:
+        """Add repos recorded in the journal since the last snapshot."""
+        if self.journal_path.exists():
+            before = len(self._scanned)
+            with open(self.journal_path, 'r') as f:
+                self._scanned.update(line.rstrip('\n') for line in f if line.strip())
+
+            # Compact the journal into the snapshot at the next save (start_scan)
+            if len(self._scanned) > before:
+                self._dirty = True
+
+    def _close_journal(self) -> None:
+        """Close and remove the journal (its entries are in the snapshot)."""
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+        if self.journal_path.exists():
+            self.journal_path.unlink()
 
     def _save(self) -> None:
-        """Save progress to checkpoint file."""
-        if not self.enabled:
+        """Save a full snapshot to the checkpoint file and compact the journal."""
+        if not self.enabled or not self._dirty:
             return
 
         try:
-            self.data['last_update'] = datetime.now().isoformat()
+            # Epoch seconds; formatted only when read (see last_update_iso)
+            self.data['last_update'] = time.time()
+            self.data['scanned_repos'] = sorted(self._scanned)
 
-            with open(self.checkpoint_path, 'w') as f:
+            # Write to a temp file and rename so a crash never leaves a torn checkpoint
+            tmp_path = self.checkpoint_path.with_suffix(self.checkpoint_path.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
                 json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.checkpoint_path)
+
+            self._close_journal()
+            self._dirty = False
 
-            logger.debug(f"Checkpoint saved: {len(self.data['scanned_repos'])} repos")
+            logger.debug(f"Checkpoint saved: {len(self._scanned)} repos")
         except Exception as e:
             logger.error(f"Error saving checkpoint: {e}")
 
@@ -67,6 +109,7 @@ class ProgressTracker:
         """Mark scan as started."""
         if not self.data['start_time']:
             self.data['start_time'] = datetime.now().isoformat()
+            self._dirty = True
         self._save()
 
     def is_scanned(self, repo_full_name: str) -> bool:
@@ -79,7 +122,7 @@ class ProgressTracker:
         Returns:
             True if already scanned
         """
-        return repo_full_name in self.data['scanned_repos']
+        return repo_full_name in self._scanned
 
     def mark_scanned(self, repo_full_name: str, save_interval: int = 10) -> None:
         """
@@ -87,14 +130,25 @@ class ProgressTracker:
 
         Args:
             repo_full_name: Full repository name (org/repo)
-            save_interval: Save checkpoint every N repos
+            save_interval: Flush the journal every N repos
         """
-        if repo_full_name not in self.data['scanned_repos']:
-            self.data['scanned_repos'].append(repo_full_name)
+        if repo_full_name in self._scanned:
+            return
+        self._scanned.add(repo_full_name)
+        self._dirty = True
 
-        # Save periodically
-        if len(self.data['scanned_repos']) % save_interval == 0:
-            self._save()
+        if not self.enabled:
+            return
+
+        # Append to the journal instead of rewriting the whole checkpoint
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a')
+        self._journal.write(repo_full_name + '\n')
+
+        # Flush to disk periodically
+        if len(self._scanned) % save_interval == 0:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
 
     def update_stats(self, stats: Dict) -> None:
         """
@@ -104,14 +158,24 @@ class ProgressTracker:
             stats: Statistics dictionary
         """
         self.data['stats'] = stats
+        self._dirty = True
         self._save()
 
+    @property
+    def last_update_iso(self) -> Optional[str]:
+        """Time of the last checkpoint save as an ISO 8601 string."""
+        last_update = self.data.get('last_update')
+        if isinstance(last_update, (int, float)):
+            return datetime.fromtimestamp(last_update).isoformat()
+        # Checkpoints written before epoch timestamps store the string
+        return last_update
+
     def get_progress(self) -> Dict:
         """Get current progress information."""
         return {
-            'scanned_repos': len(self.data['scanned_repos']),
+            'scanned_repos': len(self._scanned),
             'start_time': self.data['start_time'],
-            'last_update': self.data['last_update']
+            'last_update': self.last_update_iso
         }
 
     def clear(self) -> None:
@@ -123,6 +187,9 @@ class ProgressTracker:
             'organizations': {},
             'stats': {}
         }
+        self._scanned = set()
+        self._dirty = True
+        self._close_journal()
 
         if self.checkpoint_path.exists():
             self.checkpoint_path.unlink()
@@ -132,6 +199,7 @@ class ProgressTracker:
     def finalize(self) -> None:
         """Finalize progress tracking."""
         self.data['end_time'] = datetime.now().isoformat()
+        self._dirty = True
         self._save()
         logger.info("Progress tracking finalized")
 
@@ -139,6 +207,11 @@ class ProgressTracker:
 class ProgressDisplay:
     """Display progress information to user."""
 
+    # Minimum seconds between redraws (~10 Hz)
+    REFRESH_INTERVAL = 0.1
+
+    BAR_WIDTH = 50
+
     def __init__(self, total: int):
         """
         Initialize progress display.
@@ -148,7 +221,13 @@ class ProgressDisplay:
         """
         self.total = total
         self.current = 0
-        self.start_time = datetime.now()
+        self.start_time = time.monotonic()
+        self._last_draw = 0.0
+        self._inv_total = 1.0 / total if total else 0.0
+
+        # Bar cells, updated in place as progress advances
+        self._bar = bytearray(b' ' * self.BAR_WIDTH)
+        self._filled_prev = 0
 
     def update(self, current: int, message: str = "") -> None:
         """
@@ -159,10 +238,17 @@ class ProgressDisplay:
             message: Optional message to display
         """
         self.current = current
-        percentage = (current / self.total) * 100 if self.total > 0 else 0
+
+        # Skip redraws within the refresh interval (always draw completion)
+        now = time.monotonic()
+        if now - self._last_draw < self.REFRESH_INTERVAL and current < self.total:
+            return
+        self._last_draw = now
+
+        percentage = current * self._inv_total * 100
 
         # Calculate ETA
-        elapsed = (datetime.now() - self.start_time).total_seconds()
+        elapsed = now - self.start_time
         if current > 0:
             avg_time = elapsed / current
             remaining = (self.total - current) * avg_time
@@ -170,17 +256,29 @@ class ProgressDisplay:
         else:
             eta_str = "calculating..."
 
-        # Create progress bar
-        bar_width = 50
-        filled = int(bar_width * current / self.total) if self.total > 0 else 0
-        bar = '=' * filled + '>' + ' ' * (bar_width - filled - 1)
-
         # Display
-        print(f"\r[{bar}] {current}/{self.total} ({percentage:.1f}%) | ETA: {eta_str} | {message}", end='', flush=True)
+        print(f"\r[{self._render_bar(current)}] {current}/{self.total} ({percentage:.1f}%) | ETA: {eta_str} | {message}", end='', flush=True)
 
         if current >= self.total:
             print()  # New line when complete
 
+    def _render_bar(self, current: int) -> str:
+        """Advance the bar buffer to the current position and return it."""
+        bar = self._bar
+        filled = min(int(self.BAR_WIDTH * current * self._inv_total), self.BAR_WIDTH)
+        prev = self._filled_prev
+
+        # Only touch the cells that changed since the last draw
+        if filled >= prev:
+            bar[prev:filled] = b'=' * (filled - prev)
+        else:
+            bar[filled:prev + 1] = b' ' * (prev + 1 - filled)
+        if filled < self.BAR_WIDTH:
+            bar[filled] = ord('>')
+        self._filled_prev = filled
+
+        return bar.decode('ascii')
+
     def _format_time(self, seconds: float) -> str:
         """Format seconds into readable time string."""
         if seconds < 60:
@@ -195,6 +293,6 @@ class ProgressDisplay:
 
     def complete(self, message: str = "Complete!") -> None:
         """Mark progress as complete."""
-        elapsed = (datetime.now() - self.start_time).total_seconds()
+        elapsed = time.monotonic() - self.start_time
         elapsed_str = self._format_time(elapsed)
         print(f"\n✓ {message} (took {elapsed_str})")
@@ -4,8 +4,9 @@ Rate limiter for GitHub API to prevent hitting rate limits.
 
 import time
 import logging
+import threading
+from collections import deque
 from typing import Optional
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -25,69 +26,124 @@ class RateLimiter:
         self.github = github_client
         self.max_per_minute = max_per_minute
         self.safety_threshold = safety_threshold
-        self.request_times = []
+        self.request_times = deque()
+        # Repositories are scanned concurrently
+        self._lock = threading.Lock()
 
-        # Cache for rate limit (avoid checking every time)
+        # Cache for get_status (avoid checking every time)
         self.rate_limit_cache = None
         self.rate_limit_cache_time = 0
         self.cache_ttl = 10  # Cache for 10 seconds
 
+        # Monotonic time before which no request may start (set after 403/429)
+        self._paused_until = 0.0
+
     def check_and_wait(self) -> None:
         """Check rate limit and wait if necessary."""
-        # Check GitHub's rate limit (with caching to avoid excessive API calls)
-        now = time.time()
-
-        # Only check actual rate limit every 10 seconds
-        if self.rate_limit_cache is None or (now - self.rate_limit_cache_time) > self.cache_ttl:
-            rate_limit = self.github.get_rate_limit()
-            self.rate_limit_cache = rate_limit
-            self.rate_limit_cache_time = now
-        else:
-            rate_limit = self.rate_limit_cache
+        # Wait out a pause GitHub asked for (shared by all workers)
+        self._wait_for_pause()
 
-        core_limit = rate_limit.core
-
-        remaining = core_limit.remaining
-        reset_time = core_limit.reset
+        # PyGithub records X-RateLimit-* headers from every response, so the
+        # current budget is known without calling the rate limit endpoint
+        remaining, limit = self.github.rate_limiting
 
-        logger.debug(f"GitHub rate limit: {remaining}/{core_limit.limit} remaining")
+        logger.debug(f"GitHub rate limit: {remaining}/{limit} remaining")
 
         # If we're below safety threshold, wait until reset
         if remaining < self.safety_threshold:
-            wait_seconds = (reset_time - datetime.now()).total_seconds()
+            wait_seconds = self.github.rate_limiting_resettime - time.time()
             if wait_seconds > 0:
                 logger.warning(
                     f"Rate limit low ({remaining} remaining). "
                     f"Waiting {wait_seconds:.0f}s until reset..."
                 )
                 time.sleep(wait_seconds + 1)  # Add 1s buffer
-                # Invalidate cache after waiting
-                self.rate_limit_cache = None
 
         # Enforce per-minute limit
         self._enforce_per_minute_limit()
 
+    def pause_from_headers(self, headers: Optional[dict]) -> None:
+        """
+        Pause all requests as directed by a rejected (403/429) response.
+
+        Honors Retry-After (secondary limits), otherwise waits for
+        X-RateLimit-Reset when the primary limit is exhausted.
+
+        Args:
+            headers: Response headers of the rejected request
+        """
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+
+        if 'retry-after' in headers:
+            wait_seconds = float(headers['retry-after'])
+        elif headers.get('x-ratelimit-remaining') == '0' and 'x-ratelimit-reset' in headers:
+            wait_seconds = int(headers['x-ratelimit-reset']) - time.time()
+        else:
+            return
+
+        if wait_seconds > 0:
+            logger.warning(f"GitHub rejected a request. Pausing all requests for {wait_seconds:.0f}s...")
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + wait_seconds)
+
+    def _wait_for_pause(self) -> None:
+        """Sleep until any pause set by pause_from_headers has passed."""
+        while True:
+            with self._lock:
+                wait_seconds = self._paused_until - time.monotonic()
+            if wait_seconds <= 0:
+                return
+            time.sleep(wait_seconds)
+
+    def _fetch_rate_limit(self, force_refresh: bool = False):
+        """
+        Get GitHub's rate limit, refreshing the cache when it is stale.
+
+        Args:
+            force_refresh: Bypass the cache and query the API
+
+        Returns:
+            PyGithub RateLimit object
+        """
+        now = time.time()
+
+        # Only check actual rate limit every cache_ttl seconds
+        if (force_refresh or self.rate_limit_cache is None
+                or (now - self.rate_limit_cache_time) > self.cache_ttl):
+            self.rate_limit_cache = self.github.get_rate_limit()
+            self.rate_limit_cache_time = now
+
+        return self.rate_limit_cache
+
     def _enforce_per_minute_limit(self) -> None:
         """Ensure we don't exceed max requests per minute."""
-        now = time.time()
+        while True:
+            with self._lock:
+                now = time.monotonic()
 
-        # Remove requests older than 1 minute
-        self.request_times = [t for t in self.request_times if now - t < 60]
+                # Remove requests older than 1 minute
+                while self.request_times and now - self.request_times[0] >= 60:
+                    self.request_times.popleft()
 
-        # If we've hit the limit, wait
-        if len(self.request_times) >= self.max_per_minute:
-            oldest = self.request_times[0]
-            wait_seconds = 60 - (now - oldest)
-            if wait_seconds > 0:
-                logger.debug(f"Per-minute limit reached. Waiting {wait_seconds:.1f}s...")
-                time.sleep(wait_seconds)
+                # Record this request if it fits in the window
+                if len(self.request_times) < self.max_per_minute:
+                    self.request_times.append(now)
+                    return
+
+                wait_seconds = 60 - (now - self.request_times[0])
 
-        # Record this request
-        self.request_times.append(now)
+            # Sleep outside the lock so other threads can wait concurrently
+            logger.debug(f"Per-minute limit reached. Waiting {wait_seconds:.1f}s...")
+            time.sleep(wait_seconds)
+
+    def get_status(self, force_refresh: bool = False) -> dict:
+        """
+        Get current rate limit status.
 
-    def get_status(self) -> dict:
-        """Get current rate limit status."""
-        rate_limit = self.github.get_rate_limit()
+        Args:
+            force_refresh: Bypass the rate limit cache
+        """
+        rate_limit = self._fetch_rate_limit(force_refresh)
         core_limit = rate_limit.core
 
         return {
@@ -98,8 +154,143 @@ class RateLimiter:
         }
 
 
+class RequestThrottle:
+    """Thread-safe per-minute request limit for APIs without rate headers (e.g. OpenAI)."""
+
+    def __init__(self, max_per_minute: int = 500):
+        """
+        Initialize request throttle.
+
+        Args:
+            max_per_minute: Maximum requests per minute across all threads
+        """
+        self.max_per_minute = max_per_minute
+        self.request_times = deque()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until another request fits within the per-minute limit."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+
+                # Remove requests older than 1 minute
+                while self.request_times and now - self.request_times[0] >= 60:
+                    self.request_times.popleft()
+
+                if len(self.request_times) < self.max_per_minute:
+                    self.request_times.append(now)
+                    return
+
+                wait_seconds = 60 - (now - self.request_times[0])
+
+            # Sleep outside the lock so other threads can re-check
+            logger.debug(f"Request limit reached. Waiting {wait_seconds:.1f}s...")
+            time.sleep(wait_seconds)
+
+
+class BackpressureController:
+    """
+    Adaptive concurrency limit (AIMD, as in TCP congestion control).
+
+    Halves the number of concurrent slots when the API pushes back
+    (rate limit / server errors) or latency exceeds the target, and adds
+    one slot back after every run of clean calls.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        increase_every: int = 20,
+        latency_target: Optional[float] = None,
+        latency_window: int = 20
+    ):
+        """
+        Initialize backpressure controller.
+
+        Args:
+            max_concurrency: Upper bound (and starting value) for concurrent slots
+            min_concurrency: Lower bound for concurrent slots
+            increase_every: Clean calls required before adding a slot
+            latency_target: Back off when average latency exceeds this (seconds)
+            latency_window: Number of recent calls in the latency average
+        """
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.increase_every = increase_every
+        self.latency_target = latency_target
+        self.concurrency = max_concurrency
+
+        self.latencies = deque(maxlen=latency_window)
+        self._active = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a slot is free under the current concurrency limit."""
+        with self._cond:
+            while self._active >= self.concurrency:
+                self._cond.wait()
+            self._active += 1
+
+    def release(self) -> None:
+        """Free a slot."""
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def record_success(self, latency: float) -> None:
+        """
+        Record a clean call and adjust the limit.
+
+        Args:
+            latency: Call duration in seconds
+        """
+        with self._cond:
+            self.latencies.append(latency)
+            self._successes += 1
+
+            if self.latency_target and len(self.latencies) == self.latencies.maxlen:
+                average = sum(self.latencies) / len(self.latencies)
+                if average > self.latency_target:
+                    self._decrease(0.5, f"average latency {average:.1f}s")
+                    return
+
+            if self._successes >= self.increase_every:
+                self._increase(1)
+
+    def multiplicative_decrease(self, beta: float = 0.5) -> None:
+        """Shrink the limit after the API pushed back."""
+        with self._cond:
+            self._decrease(beta, "API backpressure")
+
+    def additive_increase(self, alpha: int = 1) -> None:
+        """Grow the limit by alpha slots (up to max_concurrency)."""
+        with self._cond:
+            self._increase(alpha)
+
+    def _decrease(self, beta: float, reason: str) -> None:
+        """Shrink the limit (caller holds the lock)."""
+        new_limit = max(self.min_concurrency, int(self.concurrency * beta))
+        if new_limit < self.concurrency:
+            logger.warning(f"Reducing concurrency {self.concurrency} -> {new_limit} ({reason})")
+            self.concurrency = new_limit
+        self._successes = 0
+        # Judge the new limit on fresh latencies only
+        self.latencies.clear()
+
+    def _increase(self, alpha: int) -> None:
+        """Grow the limit (caller holds the lock)."""
+        self._successes = 0
+        if self.concurrency < self.max_concurrency:
+            self.concurrency = min(self.max_concurrency, self.concurrency + alpha)
+            logger.debug(f"Increasing concurrency to {self.concurrency}")
+            self._cond.notify_all()
+
+
 class CircuitBreaker:
-    """Circuit breaker pattern for API calls."""
+    """Circuit breaker pattern for API calls (thread-safe)."""
 
     def __init__(self, failure_threshold: int = 5, timeout: int = 60):
         """
@@ -114,6 +305,10 @@ class CircuitBreaker:
         self.failure_count = 0
         self.last_failure_time: Optional[float] = None
         self.state = 'CLOSED'  # CLOSED, OPEN, HALF_OPEN
+        # Repositories are scanned concurrently through one breaker
+        self._lock = threading.Lock()
+        # Only one trial call is let through while HALF_OPEN
+        self._probe_in_flight = False
 
     def call(self, func, *args, **kwargs):
         """
@@ -130,43 +325,101 @@ class CircuitBreaker:
         Raises:
             Exception: If circuit is open or function fails
         """
+        # Fast path: a closed circuit only needs bookkeeping after failures
+        if self.state == 'CLOSED':
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                self._record_failure()
+                raise
+            if self.failure_count:
+                with self._lock:
+                    self.failure_count = 0
+            return result
+
+        return self._call_guarded(func, *args, **kwargs)
+
+    def _call_guarded(self, func, *args, **kwargs):
+        """Call function while the circuit is OPEN or HALF_OPEN."""
+        with self._lock:
+            probe = self._admit()
+
+        if not probe:
+            # Another thread closed the circuit in the meantime
+            return self.call(func, *args, **kwargs)
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._record_failure(probe=True)
+            raise
+
+        # Success - reset counter
+        with self._lock:
+            logger.info("Circuit breaker closing (recovery successful)")
+            self.state = 'CLOSED'
+            self.failure_count = 0
+            self._probe_in_flight = False
+
+        return result
+
+    def _admit(self) -> bool:
+        """
+        Decide whether a call may proceed (caller holds the lock).
+
+        Returns:
+            True if this caller is the HALF_OPEN probe, False if the circuit
+            is already CLOSED again
+
+        Raises:
+            Exception: If the circuit is OPEN or a probe is already running
+        """
+        if self.state == 'CLOSED':
+            return False
+
         if self.state == 'OPEN':
             # Check if timeout has passed
-            if time.time() - self.last_failure_time >= self.timeout:
-                logger.info("Circuit breaker entering HALF_OPEN state")
-                self.state = 'HALF_OPEN'
-            else:
-                remaining = self.timeout - (time.time() - self.last_failure_time)
+            elapsed = time.monotonic() - self.last_failure_time
+            if elapsed < self.timeout:
+                remaining = self.timeout - elapsed
                 raise Exception(
                     f"Circuit breaker is OPEN. Retry in {remaining:.0f}s"
                 )
+            logger.info("Circuit breaker entering HALF_OPEN state")
+            self.state = 'HALF_OPEN'
 
-        try:
-            result = func(*args, **kwargs)
-
-            # Success - reset counter
-            if self.state == 'HALF_OPEN':
-                logger.info("Circuit breaker closing (recovery successful)")
-                self.state = 'CLOSED'
-            self.failure_count = 0
+        if self._probe_in_flight:
+            raise Exception("Circuit breaker is HALF_OPEN. Recovery probe in progress")
+        self._probe_in_flight = True
+        return True
 
-            return result
+    def _record_failure(self, probe: bool = False) -> None:
+        """
+        Count a failure and open the circuit at the threshold.
 
-        except Exception as e:
+        Args:
+            probe: The failed call was the HALF_OPEN recovery probe
+        """
+        with self._lock:
             self.failure_count += 1
-            self.last_failure_time = time.time()
+            self.last_failure_time = time.monotonic()
 
-            if self.failure_count >= self.failure_threshold:
+            # A failed probe re-opens the circuit straight away
+            if probe:
+                self._probe_in_flight = False
+                self.state = 'OPEN'
+                logger.error("Circuit breaker re-opening (recovery probe failed)")
+            elif self.state == 'CLOSED' and self.failure_count >= self.failure_threshold:
                 logger.error(
                     f"Circuit breaker opening after {self.failure_count} failures"
                 )
                 self.state = 'OPEN'
 
-            raise
-
     def reset(self) -> None:
         """Manually reset circuit breaker."""
-        self.failure_count = 0
-        self.state = 'CLOSED'
-        self.last_failure_time = None
+        with self._lock:
+            self.failure_count = 0
+            self.state = 'CLOSED'
+            self.last_failure_time = None
+            self._probe_in_flight = False
         logger.info("Circuit breaker manually reset")
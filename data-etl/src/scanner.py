@@ -2,26 +2,94 @@
 GitHub repository scanner with pagination and rate limiting.
 """
 
+import re
+import sys
+import time
 import logging
 import fnmatch
-from typing import List, Dict, Set, Optional
-from github import Github
+import threading
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, FrozenSet, Optional
 from github.Repository import Repository
 from github.GithubException import GithubException
 
-from rate_limiter import RateLimiter, CircuitBreaker
-from detector import TechnologyDetector
+from rate_limiter import RateLimiter, CircuitBreaker, BackpressureController
+from detector import TechnologyDetector, is_backpressure_error
 from ai_detector import AITechnologyDetector
 from domain_detector import DomainDetector
 from deep_scanner import DeepScanner
+from graphql_client import GitHubGraphQL
+from http_clients import create_github_client
 
 logger = logging.getLogger(__name__)
 
+# Repositories listed per step (one API page, one GraphQL language batch)
+REPO_PAGE_SIZE = 100
+
+
+def build_temporal_metadata(
+    created_at: datetime,
+    pushed_at: Optional[datetime],
+    now: Optional[datetime] = None
+) -> dict:
+    """
+    Build temporal metadata from a repository's creation and last push dates.
+
+    Args:
+        created_at: Repository creation time (timezone-aware)
+        pushed_at: Last push time (defaults to created_at)
+        now: Reference time (defaults to the current UTC time)
+
+    Returns:
+        Dict with temporal information
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    if not pushed_at:
+        pushed_at = created_at
+
+    # Calculate age
+    age_days = (now - created_at).days
+    age_months = age_days / 30.0
+
+    # Calculate days since last push
+    days_since_push = (now - pushed_at).days
+
+    # Determine if active (commits in last 90 days)
+    # 90 days is more realistic for production systems and stable libraries
+    is_active = days_since_push < 90
+
+    # Categorize by age
+    is_recent = age_months <= 6
+    is_new = age_months <= 12
+    is_legacy = age_months > 24
+
+    return {
+        'created_at': created_at.isoformat(),
+        'pushed_at': pushed_at.isoformat(),
+        'age_months': round(age_months, 1),
+        'days_since_push': days_since_push,
+        'is_active': is_active,
+        'is_recent': is_recent,       # < 6 months
+        'is_new': is_new,              # < 12 months
+        'is_legacy': is_legacy         # > 24 months
+    }
+
 
 class GitHubScanner:
     """Scans GitHub repositories for technology usage."""
 
-    def __init__(self, github_token: str, config: dict, progress_tracker=None, openai_api_key: str = None):
+    def __init__(
+        self,
+        github_token: str,
+        config: dict,
+        progress_tracker=None,
+        openai_api_key: str = None,
+        cache_dir: Optional[Path] = None
+    ):
         """
         Initialize scanner.
 
@@ -30,8 +98,9 @@ class GitHubScanner:
             config: Configuration dictionary
             progress_tracker: Optional ProgressTracker for resumability
             openai_api_key: Optional OpenAI API key for domain detection
+            cache_dir: Optional directory for on-disk detection caches
         """
-        self.github = Github(github_token, per_page=100)
+        self.github = create_github_client(github_token)
         self.config = config
         self.progress_tracker = progress_tracker
         self.rate_limiter = RateLimiter(
@@ -45,39 +114,85 @@ class GitHubScanner:
         detection_config = config.get('detection', {})
         detection_mode = detection_config.get('mode', 'legacy')
 
+        ai_detector_cache = cache_dir / 'ai_detector' if cache_dir else None
+
         if detection_mode == 'ai' and openai_api_key:
-            self.detector = AITechnologyDetector(openai_api_key, config)
+            self.detector = AITechnologyDetector(openai_api_key, config, cache_path=ai_detector_cache)
             logger.info("Using AI-driven technology detection")
         elif detection_mode == 'hybrid' and openai_api_key:
             # Use both detectors - AI first, fallback to legacy
-            self.detector = AITechnologyDetector(openai_api_key, config)
+            self.detector = AITechnologyDetector(openai_api_key, config, cache_path=ai_detector_cache)
             self.legacy_detector = TechnologyDetector()
             logger.info("Using hybrid detection (AI + legacy fallback)")
         else:
-            self.detector = TechnologyDetector()
+            detector_cache = cache_dir / 'detector' if cache_dir else None
+            self.detector = TechnologyDetector(
+                cache_path=detector_cache,
+                graphql=GitHubGraphQL(github_token)
+            )
             logger.info("Using legacy hardcoded detection")
 
         # Initialize domain detector if API key provided
         self.domain_detector = None
         if openai_api_key:
-            self.domain_detector = DomainDetector(openai_api_key, config)
+            self.domain_detector = DomainDetector(
+                openai_api_key,
+                config,
+                cache_path=cache_dir / 'domains' if cache_dir else None
+            )
             logger.info("Domain detection enabled")
 
+            # Domain batches are detected while scanning continues; the
+            # semaphore bounds how many batches can queue up ahead of it
+            self._domain_executor = ThreadPoolExecutor(
+                max_workers=self.domain_detector.concurrency,
+                thread_name_prefix='domain-detect'
+            )
+            self._domain_slots = threading.BoundedSemaphore(2 * self.domain_detector.concurrency)
+
         # Initialize deep scanner if API key provided
         self.deep_scanner = None
         if openai_api_key:
-            self.deep_scanner = DeepScanner(openai_api_key, config)
+            self.deep_scanner = DeepScanner(
+                openai_api_key,
+                config,
+                cache_path=cache_dir / 'deep_scan' if cache_dir else None
+            )
             if config.get('deep_scan', {}).get('enabled', False):
                 deep_repos = config.get('deep_scan', {}).get('repositories', [])
                 logger.info(f"Deep scanning enabled for: {', '.join(deep_repos)}")
 
+        # Repository filters, resolved once (checked for every repo)
+        github_config = config.get('github', {})
+        self._include_archived = github_config.get('include_archived', False)
+        self._include_forks = github_config.get('include_forks', False)
+        self._include_private = github_config.get('include_private', True)
+        self._min_stars = github_config.get('min_stars', 0)
+
+        # Exclude globs combined into one regex
+        exclude_patterns = github_config.get('exclude_repos', [])
+        self._exclude_re = (
+            re.compile('|'.join(fnmatch.translate(p) for p in exclude_patterns))
+            if exclude_patterns else None
+        )
+
         # Get repo limit from config (can be overridden externally)
-        config_limit = config.get('github', {}).get('repo_limit', 0)
+        config_limit = github_config.get('repo_limit', 0)
         self.repo_limit = config_limit if config_limit > 0 else None
 
         # Get checkpoint save interval from config
         self.checkpoint_save_interval = config.get('checkpoint', {}).get('save_interval', 10)
 
+        # Repositories scanned in parallel (each scan is dominated by API latency)
+        self.concurrency = github_config.get('concurrency', 8)
+        self._stats_lock = threading.Lock()
+
+        # Shrinks the number of in-flight scans when GitHub pushes back
+        self.backpressure = BackpressureController(
+            max_concurrency=self.concurrency,
+            latency_target=github_config.get('latency_target') or None
+        )
+
         # Stats
         self.stats = {
             'repos_scanned': 0,
@@ -121,6 +236,13 @@ class GitHubScanner:
                 logger.error(f"Unexpected error scanning {org_name}: {e}")
                 self.stats['errors'] += 1
 
+        # Flush on-disk detection caches
+        self.detector.save_cache()
+        if self.domain_detector:
+            self.domain_detector.save_cache()
+        if self.deep_scanner:
+            self.deep_scanner.save_cache()
+
         # Aggregate technologies
         tech_counts = self.detector.aggregate_technologies(all_repo_techs)
 
@@ -131,7 +253,7 @@ class GitHubScanner:
         self,
         org_name: str,
         progress_callback: Optional[callable] = None
-    ) -> tuple[List[Dict[str, Set[str]]], List[Dict]]:
+    ) -> tuple[List[Dict[str, FrozenSet[str]]], List[Dict]]:
         """
         Scan all repositories in an organization.
 
@@ -146,80 +268,176 @@ class GitHubScanner:
         self.stats['api_calls'] += 1
 
         org = self.github.get_organization(org_name)
-        repos = list(org.get_repos())
 
-        # Apply limit if specified
-        total_repos = len(repos)
-        if self.repo_limit and self.repo_limit < total_repos:
-            repos = repos[:self.repo_limit]
-            logger.info(f"Found {total_repos} repositories in {org_name}, limiting to {self.repo_limit}")
-        else:
-            logger.info(f"Found {len(repos)} repositories in {org_name}")
+        # Stream the paginated listing; with a limit, later pages are never fetched
+        repos = iter(org.get_repos())
+        if self.repo_limit:
+            repos = islice(repos, self.repo_limit)
+            logger.info(f"Scanning up to {self.repo_limit} repositories in {org_name}")
 
         all_repo_techs = []
         repo_details = []
+        domain_pending = []
+        domain_jobs = []
+        futures = {}
+        listed = 0
+
+        # One reference time so every repo's age is measured alike
+        scan_time = datetime.now(timezone.utc)
+
+        # Scan repositories concurrently; results are consumed on this thread
+        # as they complete, so only the workers' own state needs locking
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix='repo-scan'
+        ) as executor:
+            # Submit each page as it arrives so scanning overlaps pagination
+            while True:
+                page = list(islice(repos, REPO_PAGE_SIZE))
+                if not page:
+                    break
+                listed += len(page)
+
+                to_scan = []
+                for repo in page:
+                    # Check if already scanned (checkpoint resume)
+                    if self.progress_tracker and self.progress_tracker.is_scanned(repo.full_name):
+                        logger.info(f"Skipping {repo.name} (already scanned in previous run)")
+                        self.stats['repos_skipped'] += 1
+                        continue
+
+                    # Check if should skip
+                    if self._should_skip_repo(repo):
+                        logger.debug(f"Skipping {repo.name} (filtered)")
+                        self.stats['repos_skipped'] += 1
+                        continue
+
+                    to_scan.append(repo)
+
+                # Batch-fetch languages for the repos we will actually scan
+                if isinstance(self.detector, TechnologyDetector):
+                    self.detector.prefetch_languages(to_scan)
+
+                for repo in to_scan:
+                    # Scan repository with circuit breaker protection
+                    future = executor.submit(self.circuit_breaker.call, self._scan_with_backpressure, repo)
+                    futures[future] = repo
+
+            logger.info(f"Found {listed} repositories in {org_name}")
+
+            for completed, future in enumerate(as_completed(futures), 1):
+                repo = futures[future]
+
+                # Progress callback
+                if progress_callback:
+                    progress_callback(completed, len(futures), repo.name)
+
+                try:
+                    techs = future.result()
+
+                    if techs:
+                        all_repo_techs.append(techs)
+
+                        details = {
+                            'name': repo.name,
+                            'full_name': repo.full_name,
+                            'url': repo.html_url,
+                            'stars': repo.stargazers_count,
+                            'technologies': techs,
+                            'temporal_metadata': self._get_temporal_metadata(repo, scan_time),
+                            'domain': None
+                        }
+                        repo_details.append(details)
+                        domain_pending.append((repo, details))
+
+                        # Hand full batches to domain detection (Batch API mode submits once at the end)
+                        if (
+                            self.domain_detector
+                            and not self.domain_detector.use_batch_api
+                            and len(domain_pending) >= self.domain_detector.batch_size
+                        ):
+                            domain_jobs.append(self._submit_domain_batch(domain_pending))
+                            domain_pending = []
+
+                    self.stats['repos_scanned'] += 1
+
+                    # Mark as scanned (checkpoint)
+                    if self.progress_tracker:
+                        self.progress_tracker.mark_scanned(
+                            repo.full_name,
+                            save_interval=self.checkpoint_save_interval
+                        )
+
+                except Exception as e:
+                    logger.error(f"Error scanning {repo.name}: {e}")
+                    self.stats['errors'] += 1
+
+        # Detect domains for the remaining repos and wait for in-flight batches
+        if self.domain_detector:
+            if domain_pending:
+                domain_jobs.append(self._submit_domain_batch(domain_pending))
+            self._collect_domain_batches(org_name, domain_jobs)
 
-        for idx, repo in enumerate(repos):
-            # Check if already scanned (checkpoint resume)
-            if self.progress_tracker and self.progress_tracker.is_scanned(repo.full_name):
-                logger.info(f"Skipping {repo.name} (already scanned in previous run)")
-                self.stats['repos_skipped'] += 1
-                continue
+        return all_repo_techs, repo_details
 
-            # Check if should skip
-            if self._should_skip_repo(repo):
-                logger.debug(f"Skipping {repo.name} (filtered)")
-                self.stats['repos_skipped'] += 1
-                continue
+    def _submit_domain_batch(self, batch: List[tuple]) -> tuple:
+        """
+        Start domain detection for scanned repos in the background.
 
-            # Progress callback
-            if progress_callback:
-                progress_callback(idx + 1, len(repos), repo.name)
+        Blocks while too many batches are already queued (backpressure).
 
-            try:
-                # Scan repository with circuit breaker protection
-                techs = self.circuit_breaker.call(
-                    self._scan_repository,
-                    repo
-                )
+        Args:
+            batch: List of (repo, details) tuples
 
-                if techs:
-                    all_repo_techs.append(techs)
-
-                    # Detect domain if enabled
-                    domain_info = None
-                    if self.domain_detector:
-                        try:
-                            domain_info = self.domain_detector.detect_domain(repo, techs)
-                        except Exception as e:
-                            logger.warning(f"Domain detection failed for {repo.name}: {e}")
-
-                    repo_details.append({
-                        'name': repo.name,
-                        'full_name': repo.full_name,
-                        'url': repo.html_url,
-                        'stars': repo.stargazers_count,
-                        'technologies': techs,
-                        'temporal_metadata': self._get_temporal_metadata(repo),
-                        'domain': domain_info
-                    })
-
-                self.stats['repos_scanned'] += 1
-
-                # Mark as scanned (checkpoint)
-                if self.progress_tracker:
-                    self.progress_tracker.mark_scanned(
-                        repo.full_name,
-                        save_interval=self.checkpoint_save_interval
-                    )
+        Returns:
+            Tuple of (future, batch)
+        """
+        self._domain_slots.acquire()
+        future = self._domain_executor.submit(
+            self.domain_detector.batch_detect_domains,
+            [{'repo': repo, 'technologies': details['technologies']} for repo, details in batch]
+        )
+        future.add_done_callback(lambda _: self._domain_slots.release())
+        return future, batch
 
+    def _collect_domain_batches(self, org_name: str, jobs: List[tuple]) -> None:
+        """Wait for domain detection batches and fill in repo details."""
+        for future, batch in jobs:
+            try:
+                domains = future.result()
             except Exception as e:
-                logger.error(f"Error scanning {repo.name}: {e}")
-                self.stats['errors'] += 1
+                logger.warning(f"Domain detection failed for {org_name}: {e}")
+                continue
 
-        return all_repo_techs, repo_details
+            for repo, details in batch:
+                details['domain'] = domains.get(repo.full_name)
 
-    def _scan_repository(self, repo: Repository) -> Dict[str, Set[str]]:
+    def _scan_with_backpressure(self, repo: Repository) -> Dict[str, FrozenSet[str]]:
+        """
+        Scan a repository within the adaptive concurrency limit.
+
+        Rate limit (403/429) and server (5xx) errors, which the detectors
+        re-raise for this purpose, shrink the limit (403/429 also pause all
+        requests as the response directs); clean scans feed latency back to
+        the controller.
+        """
+        self.backpressure.acquire()
+        try:
+            start = time.monotonic()
+            try:
+                techs = self._scan_repository(repo)
+            except GithubException as e:
+                if is_backpressure_error(e):
+                    if e.status in (403, 429):
+                        self.rate_limiter.pause_from_headers(e.headers)
+                    self.backpressure.multiplicative_decrease()
+                raise
+            self.backpressure.record_success(time.monotonic() - start)
+            return techs
+        finally:
+            self.backpressure.release()
+
+    def _scan_repository(self, repo: Repository) -> Dict[str, FrozenSet[str]]:
         """
         Scan a single repository for technologies.
 
@@ -227,13 +445,14 @@ class GitHubScanner:
             repo: Repository object
 
         Returns:
-            Dict of technologies by category
+            Dict of technologies by category (frozen)
         """
         logger.debug(f"Scanning repository: {repo.name}")
 
         # Rate limiting
         self.rate_limiter.check_and_wait()
-        self.stats['api_calls'] += 1
+        with self._stats_lock:
+            self.stats['api_calls'] += 1
 
         # Detect technologies (standard detection)
         technologies = self.detector.detect_technologies(repo)
@@ -265,7 +484,12 @@ class GitHubScanner:
         if tech_count > 0:
             logger.info(f"  {repo.name}: Found {tech_count} technologies")
 
-        return technologies
+        # Freeze the result; interning shares one string per tech name across
+        # repos and lets later membership checks match by identity
+        return {
+            category: frozenset(map(sys.intern, techs))
+            for category, techs in technologies.items()
+        }
 
     def _should_skip_repo(self, repo: Repository) -> bool:
         """
@@ -277,77 +501,41 @@ class GitHubScanner:
         Returns:
             True if should skip
         """
-        config = self.config['github']
-
         # Check archived
-        if repo.archived and not config.get('include_archived', False):
+        if repo.archived and not self._include_archived:
             return True
 
         # Check fork
-        if repo.fork and not config.get('include_forks', False):
+        if repo.fork and not self._include_forks:
             return True
 
         # Check private
-        if repo.private and not config.get('include_private', True):
+        if repo.private and not self._include_private:
             return True
 
         # Check stars
-        min_stars = config.get('min_stars', 0)
-        if repo.stargazers_count < min_stars:
+        if repo.stargazers_count < self._min_stars:
             return True
 
         # Check exclude patterns
-        exclude_patterns = config.get('exclude_repos', [])
-        for pattern in exclude_patterns:
-            if fnmatch.fnmatch(repo.name, pattern):
-                return True
+        if self._exclude_re and self._exclude_re.match(repo.name):
+            return True
 
         return False
 
-    def _get_temporal_metadata(self, repo: Repository) -> dict:
+    def _get_temporal_metadata(self, repo: Repository, now: datetime) -> dict:
         """
         Extract temporal metadata from repository.
 
         Args:
             repo: Repository object
+            now: Reference time, captured once per scan
 
         Returns:
             Dict with temporal information
         """
-        from datetime import datetime, timezone
-
-        now = datetime.now(timezone.utc)
-
-        # Get dates
-        created_at = repo.created_at
-        pushed_at = repo.pushed_at if repo.pushed_at else created_at
-
-        # Calculate age
-        age_days = (now - created_at).days
-        age_months = age_days / 30.0
-
-        # Calculate days since last push
-        days_since_push = (now - pushed_at).days
-
-        # Determine if active (commits in last 90 days)
-        # 90 days is more realistic for production systems and stable libraries
-        is_active = days_since_push < 90
-
-        # Categorize by age
-        is_recent = age_months <= 6
-        is_new = age_months <= 12
-        is_legacy = age_months > 24
-
-        return {
-            'created_at': created_at.isoformat(),
-            'pushed_at': pushed_at.isoformat(),
-            'age_months': round(age_months, 1),
-            'days_since_push': days_since_push,
-            'is_active': is_active,
-            'is_recent': is_recent,       # < 6 months
-            'is_new': is_new,              # < 12 months
-            'is_legacy': is_legacy         # > 24 months
-        }
+        # Both dates come with the repo listing (no extra API call)
+        return build_temporal_metadata(repo.created_at, repo.pushed_at, now)
 
     def get_stats(self) -> dict:
         """Get scanning statistics."""
@@ -4,7 +4,8 @@ Analyzes when technologies were adopted and how actively they're being used.
 """
 
 import logging
-from typing import Dict, List
+import threading
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
@@ -13,6 +14,60 @@ logger = logging.getLogger(__name__)
 class TemporalAnalyzer:
     """Analyzes technology adoption patterns over time."""
 
+    def __init__(self, repo_details: Optional[List[Dict]] = None):
+        """
+        Initialize analyzer.
+
+        Args:
+            repo_details: Optional repository details to index up front
+                (otherwise indexed on first use)
+        """
+        self._indexed_repos = None
+        self._tech_index: Dict[str, List[int]] = {}
+        self._index_lock = threading.Lock()
+
+        if repo_details is not None:
+            self.index_repositories(repo_details)
+
+    def index_repositories(self, repo_details: List[Dict]) -> None:
+        """
+        Build the technology -> repository index for a scan.
+
+        Args:
+            repo_details: List of repository detail dictionaries
+        """
+        with self._index_lock:
+            self._build_index(repo_details)
+
+    def _build_index(self, repo_details: List[Dict]) -> None:
+        """Build the index (caller holds the lock)."""
+        index = defaultdict(list)
+        for i, repo in enumerate(repo_details):
+            # A tech listed in several categories still maps to the repo once
+            for tech in set().union(*repo['technologies'].values()):
+                index[tech].append(i)
+
+        self._tech_index = dict(index)
+        self._indexed_repos = repo_details
+
+    def repos_with_technology(self, tech_name: str, repo_details: List[Dict]) -> List[Dict]:
+        """
+        Get the repositories that use a technology (in scan order).
+
+        Args:
+            tech_name: Name of the technology
+            repo_details: List of repository detail dictionaries
+
+        Returns:
+            Repositories using the technology
+        """
+        with self._index_lock:
+            if repo_details is not self._indexed_repos:
+                self._build_index(repo_details)
+            index = self._tech_index
+
+        return [repo_details[i] for i in index.get(tech_name, ())]
+
     def analyze_technology(
         self,
         tech_name: str,
@@ -31,13 +86,7 @@ class TemporalAnalyzer:
             Dict with temporal analysis (includes domain breakdown if available)
         """
         # Find repos using this technology
-        repos_with_tech = []
-        for repo in repo_details:
-            # Check if tech is in any category
-            for category_techs in repo['technologies'].values():
-                if tech_name in category_techs:
-                    repos_with_tech.append(repo)
-                    break
+        repos_with_tech = self.repos_with_technology(tech_name, repo_details)
 
         if not repos_with_tech:
             return self._empty_analysis()
@@ -54,14 +103,12 @@ class TemporalAnalyzer:
         total_repos = len(repos_with_tech)
 
         # Analyze temporal patterns
-        recent_repos = sum(1 for r in repos_with_tech if r['temporal_metadata']['is_recent'])
-        new_repos = sum(1 for r in repos_with_tech if r['temporal_metadata']['is_new'])
-        legacy_repos = sum(1 for r in repos_with_tech if r['temporal_metadata']['is_legacy'])
-        active_repos = sum(1 for r in repos_with_tech if r['temporal_metadata']['is_active'])
+        recent_repos, new_repos, legacy_repos, active_repos, total_age = \
+            self._count_temporal_flags(repos_with_tech)
         stale_repos = total_repos - active_repos
 
         # Calculate average age
-        avg_age = sum(r['temporal_metadata']['age_months'] for r in repos_with_tech) / total_repos
+        avg_age = total_age / total_repos
 
         # Determine trend
         trend = self._determine_trend(
@@ -128,9 +175,7 @@ class TemporalAnalyzer:
         domain_analysis = {}
         for domain, repos in domain_groups.items():
             total = len(repos)
-            recent = sum(1 for r in repos if r['temporal_metadata']['is_recent'])
-            new = sum(1 for r in repos if r['temporal_metadata']['is_new'])
-            active = sum(1 for r in repos if r['temporal_metadata']['is_active'])
+            recent, new, legacy, active, _ = self._count_temporal_flags(repos)
 
             domain_analysis[domain] = {
                 'total_repos': total,
@@ -139,13 +184,29 @@ class TemporalAnalyzer:
                 'active_repos': active,
                 'recency_score': round(self._calculate_recency_score(recent, new, total), 3),
                 'activity_score': round(active / total, 3) if total > 0 else 0,
-                'trend': self._determine_trend(recent, new,
-                                              sum(1 for r in repos if r['temporal_metadata']['is_legacy']),
-                                              active, total)
+                'trend': self._determine_trend(recent, new, legacy, active, total)
             }
 
         return domain_analysis
 
+    def _count_temporal_flags(self, repos: List[Dict]) -> Tuple[int, int, int, int, float]:
+        """
+        Count temporal flags in a single pass over the repos.
+
+        Returns:
+            Tuple of (recent, new, legacy, active, total age in months)
+        """
+        recent = new = legacy = active = 0
+        total_age = 0.0
+        for repo in repos:
+            metadata = repo['temporal_metadata']
+            recent += metadata['is_recent']
+            new += metadata['is_new']
+            legacy += metadata['is_legacy']
+            active += metadata['is_active']
+            total_age += metadata['age_months']
+        return recent, new, legacy, active, total_age
+
     def _empty_analysis(self) -> Dict:
         """Return empty analysis structure."""
         return {
@@ -230,10 +291,7 @@ class TemporalAnalyzer:
             return {}
 
         total = len(repo_details)
-        recent = sum(1 for r in repo_details if r['temporal_metadata']['is_recent'])
-        new = sum(1 for r in repo_details if r['temporal_metadata']['is_new'])
-        legacy = sum(1 for r in repo_details if r['temporal_metadata']['is_legacy'])
-        active = sum(1 for r in repo_details if r['temporal_metadata']['is_active'])
+        recent, new, legacy, active, _ = self._count_temporal_flags(repo_details)
 
         return {
             'total_repositories': total,
@@ -4,11 +4,9 @@ Test AI analysis of tree structure.
 """
 import sys
 import os
-import yaml
 from dotenv import load_dotenv
 
 sys.path.insert(0, 'src')
-from deep_scanner import DeepScanner
 
 def test_ai_analysis():
     """Test AI analysis with sample tree."""
@@ -22,9 +20,12 @@ def test_ai_analysis():
 
     print("✓ OpenAI API key found")
 
+    # Heavy imports deferred until the API key check has passed
+    from config import load_yaml_config
+    from deep_scanner import DeepScanner
+
     # Load config
-    with open('config/config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config()
 
     scanner = DeepScanner(openai_key, config)
     print("✓ DeepScanner initialized")
@@ -9,6 +9,8 @@ import os
 import sys
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 from pathlib import Path
 from dotenv import load_dotenv
 from github import Github
@@ -19,6 +21,7 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from ai_detector import AITechnologyDetector
 from detector import TechnologyDetector
 from config import Config, setup_logging
+from http_clients import create_github_client
 
 # Load environment
 load_dotenv()
@@ -31,93 +34,98 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def test_single_repo(repo_name: str, github_token: str, openai_key: str, config: Config):
+def test_single_repo(
+    repo_name: str,
+    gh: Github,
+    legacy_detector: TechnologyDetector,
+    ai_detector: AITechnologyDetector
+):
     """
     Test both detectors on a single repository.
 
+    Repos are tested in parallel, so the report is returned instead of
+    logged here; the caller logs it as one block per repo.
+
     Args:
         repo_name: Full repo name (org/repo)
-        github_token: GitHub token
-        openai_key: OpenAI API key
-        config: Config object
+        gh: Shared GitHub client
+        legacy_detector: Shared legacy detector
+        ai_detector: Shared AI detector
+
+    Returns:
+        Tuple of (result dict, report as (level, message, args) entries)
     """
-    logger.info(f"\n{'='*60}")
-    logger.info(f"Testing Repository: {repo_name}")
-    logger.info(f"{'='*60}")
+    report = []
 
-    # Initialize GitHub
-    gh = Github(github_token)
-    repo = gh.get_repo(repo_name)
+    def log(level, message, *args):
+        report.append((level, message, args))
 
-    # Initialize detectors
-    legacy_detector = TechnologyDetector()
-    ai_detector = AITechnologyDetector(openai_key, config.to_dict())
+    log(logging.INFO, "\n%s", '=' * 60)
+    log(logging.INFO, "Testing Repository: %s", repo_name)
+    log(logging.INFO, "%s", '=' * 60)
+
+    repo = gh.get_repo(repo_name)
 
     # Test legacy detector
-    logger.info("\n[LEGACY DETECTOR]")
+    log(logging.INFO, "\n[LEGACY DETECTOR]")
     try:
         legacy_result = legacy_detector.detect_technologies(repo)
-        logger.info("Technologies found:")
-        for category, techs in legacy_result.items():
-            if techs:
-                logger.info(f"  {category}: {sorted(techs)}")
+        # Sorting the lists is only worth it when INFO is shown
+        if logger.isEnabledFor(logging.INFO):
+            log(logging.INFO, "Technologies found:")
+            for category, techs in legacy_result.items():
+                if techs:
+                    log(logging.INFO, "  %s: %s", category, sorted(techs))
         legacy_count = sum(len(techs) for techs in legacy_result.values())
-        logger.info(f"Total: {legacy_count} technologies")
+        log(logging.INFO, "Total: %d technologies", legacy_count)
     except Exception as e:
-        logger.error(f"Legacy detector failed: {e}")
+        log(logging.ERROR, "Legacy detector failed: %s", e)
         legacy_result = {}
         legacy_count = 0
 
     # Test AI detector
-    logger.info("\n[AI DETECTOR]")
+    log(logging.INFO, "\n[AI DETECTOR]")
     try:
         ai_result = ai_detector.detect_technologies(repo)
-        logger.info("Technologies found:")
-        for category, techs in ai_result.items():
-            if techs:
-                logger.info(f"  {category}: {sorted(techs)}")
+        # Sorting the lists is only worth it when INFO is shown
+        if logger.isEnabledFor(logging.INFO):
+            log(logging.INFO, "Technologies found:")
+            for category, techs in ai_result.items():
+                if techs:
+                    log(logging.INFO, "  %s: %s", category, sorted(techs))
         ai_count = sum(len(techs) for techs in ai_result.values())
-        logger.info(f"Total: {ai_count} technologies")
-
-        # Show AI stats
-        stats = ai_detector.get_stats()
-        logger.info(f"\nAI Stats: {stats}")
+        log(logging.INFO, "Total: %d technologies", ai_count)
     except Exception as e:
-        logger.error(f"AI detector failed: {e}")
+        log(logging.ERROR, "AI detector failed: %s", e)
         ai_result = {}
         ai_count = 0
 
     # Compare results
-    logger.info("\n[COMPARISON]")
+    log(logging.INFO, "\n[COMPARISON]")
 
     # Find new discoveries (in AI but not legacy)
-    all_legacy = set()
-    for techs in legacy_result.values():
-        all_legacy.update(techs)
-
-    all_ai = set()
-    for techs in ai_result.values():
-        all_ai.update(techs)
+    all_legacy = set(chain.from_iterable(legacy_result.values()))
+    all_ai = set(chain.from_iterable(ai_result.values()))
 
     new_discoveries = all_ai - all_legacy
     if new_discoveries:
-        logger.info(f"✅ NEW discoveries by AI: {sorted(new_discoveries)}")
+        log(logging.INFO, "✅ NEW discoveries by AI: %s", sorted(new_discoveries))
     else:
-        logger.info("No new discoveries")
+        log(logging.INFO, "No new discoveries")
 
     # Find missing (in legacy but not AI)
     missing = all_legacy - all_ai
     if missing:
-        logger.warning(f"⚠️  Missing in AI: {sorted(missing)}")
+        log(logging.WARNING, "⚠️  Missing in AI: %s", sorted(missing))
 
     # Summary
-    logger.info(f"\nSummary:")
-    logger.info(f"  Legacy: {legacy_count} technologies")
-    logger.info(f"  AI: {ai_count} technologies")
-    logger.info(f"  New discoveries: {len(new_discoveries)}")
-    logger.info(f"  Missing: {len(missing)}")
+    log(logging.INFO, "\nSummary:")
+    log(logging.INFO, "  Legacy: %d technologies", legacy_count)
+    log(logging.INFO, "  AI: %d technologies", ai_count)
+    log(logging.INFO, "  New discoveries: %d", len(new_discoveries))
+    log(logging.INFO, "  Missing: %d", len(missing))
 
-    return {
+    result = {
         'repo': repo_name,
         'legacy_count': legacy_count,
         'ai_count': ai_count,
@@ -126,6 +134,7 @@ def test_single_repo(repo_name: str, github_token: str, openai_key: str, config:
         'legacy_result': {k: list(v) for k, v in legacy_result.items()},
         'ai_result': {k: list(v) for k, v in ai_result.items()}
     }
+    return result, report
 
 
 def main():
@@ -149,57 +158,77 @@ def main():
         'bazaartechnologies/terraform-modules',         # Infrastructure
     ]
 
-    # Run tests
-    all_results = []
-    for repo_name in test_repos:
-        try:
-            result = test_single_repo(repo_name, github_token, openai_key, config)
-            all_results.append(result)
-        except Exception as e:
-            logger.error(f"Failed to test {repo_name}: {e}")
+    # One client and detector pair shared by all repos (pooled connections)
+    gh = create_github_client(github_token)
+    legacy_detector = TechnologyDetector()
+    ai_detector = AITechnologyDetector(openai_key, config.to_dict())
+
+    # Run tests (network-bound, so repos are tested in parallel)
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(test_repos)) as executor:
+        futures = {
+            executor.submit(test_single_repo, repo_name, gh, legacy_detector, ai_detector): repo_name
+            for repo_name in test_repos
+        }
+
+        # Log each repo's report as one block as soon as it finishes
+        for future in as_completed(futures):
+            repo_name = futures[future]
+            try:
+                result, report = future.result()
+            except Exception as e:
+                logger.error("Failed to test %s: %s", repo_name, e)
+                continue
+
+            for level, message, args in report:
+                logger.log(level, message, *args)
+            results[repo_name] = result
+
+    # Keep the saved results in test order
+    all_results = [results[repo_name] for repo_name in test_repos if repo_name in results]
 
     # Overall summary
-    logger.info(f"\n{'='*60}")
+    logger.info("\n%s", '=' * 60)
     logger.info("OVERALL SUMMARY")
-    logger.info(f"{'='*60}")
+    logger.info("%s", '=' * 60)
 
     total_legacy = sum(r['legacy_count'] for r in all_results)
     total_ai = sum(r['ai_count'] for r in all_results)
     total_new = sum(len(r['new_discoveries']) for r in all_results)
     total_missing = sum(len(r['missing']) for r in all_results)
 
-    logger.info(f"Repositories tested: {len(all_results)}")
-    logger.info(f"Total technologies (legacy): {total_legacy}")
-    logger.info(f"Total technologies (AI): {total_ai}")
-    logger.info(f"Total new discoveries: {total_new}")
-    logger.info(f"Total missing: {total_missing}")
+    logger.info("Repositories tested: %d", len(all_results))
+    logger.info("AI Stats: %s", ai_detector.get_stats())
+    logger.info("Total technologies (legacy): %d", total_legacy)
+    logger.info("Total technologies (AI): %d", total_ai)
+    logger.info("Total new discoveries: %d", total_new)
+    logger.info("Total missing: %d", total_missing)
 
     # Aggregate new discoveries
-    all_new = set()
-    for r in all_results:
-        all_new.update(r['new_discoveries'])
+    all_new = set(chain.from_iterable(r['new_discoveries'] for r in all_results))
 
-    logger.info(f"\nUnique new technologies discovered by AI:")
-    for tech in sorted(all_new):
-        logger.info(f"  - {tech}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\nUnique new technologies discovered by AI:")
+        for tech in sorted(all_new):
+            logger.info("  - %s", tech)
 
     # Check for GraphQL and gRPC
-    logger.info(f"\n✅ Key Technologies Check:")
+    logger.info("\n✅ Key Technologies Check:")
     if 'GraphQL' in all_new or any('graphql' in t.lower() for t in all_new):
-        logger.info(f"  ✅ GraphQL DETECTED (was missing before!)")
+        logger.info("  ✅ GraphQL DETECTED (was missing before!)")
     else:
-        logger.warning(f"  ⚠️  GraphQL not found")
+        logger.warning("  ⚠️  GraphQL not found")
 
     if 'gRPC' in all_new or any('grpc' in t.lower() for t in all_new):
-        logger.info(f"  ✅ gRPC DETECTED (was missing before!)")
+        logger.info("  ✅ gRPC DETECTED (was missing before!)")
     else:
-        logger.warning(f"  ⚠️  gRPC not found")
+        logger.warning("  ⚠️  gRPC not found")
 
     # Save results
     output_file = Path(__file__).parent / 'test_results_ai_detection.json'
     with open(output_file, 'w') as f:
-        json.dump(all_results, f, indent=2)
-    logger.info(f"\nDetailed results saved to: {output_file}")
+        f.write(json.dumps(all_results, indent=2))
+    logger.info("\nDetailed results saved to: %s", output_file)
 
 
 if __name__ == '__main__':
@@ -4,13 +4,11 @@ Quick test for deep scanner functionality.
 """
 import sys
 import os
-import yaml
 from dotenv import load_dotenv
 
 # Add src to path
 sys.path.insert(0, 'src')
 
-from deep_scanner import DeepScanner
 
 def test_deep_scanner():
     """Test deep scanner with config."""
@@ -25,9 +23,12 @@ def test_deep_scanner():
 
     print("✓ OpenAI API key found")
 
+    # Heavy imports deferred until the API key check has passed
+    from config import load_yaml_config
+    from deep_scanner import DeepScanner
+
     # Load config
-    with open('config/config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config()
 
     print("✓ Config loaded")
 
@@ -6,14 +6,13 @@ import sys
 sys.path.insert(0, 'src')
 
 from classifier_enhanced import EnhancedTechnologyClassifier
-import yaml
+from config import load_yaml_config
 
 def test_domain_aware_threshold():
     """Test that infrastructure techs with 1 repo are included."""
 
     # Load config
-    with open('config/config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config()
 
     classifier = EnhancedTechnologyClassifier("fake-key", config)
 
@@ -12,6 +12,9 @@ import os
 import sys
 import json
 import logging
+from bisect import bisect_left
+from collections import Counter
+from operator import itemgetter
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -34,8 +37,8 @@ logger = logging.getLogger(__name__)
 
 def load_data(data_path: str) -> list:
     """Load data.json"""
-    with open(data_path, 'r') as f:
-        return json.load(f)
+    # Decode the raw bytes in one call (no text-layer pass)
+    return json.loads(Path(data_path).read_bytes())
 
 
 def print_section(title: str):
@@ -129,12 +132,9 @@ def compare_before_after(original: list, filtered: list):
 
     print_section("BEFORE/AFTER COMPARISON")
 
-    # Count by ring
+    # Count by ring (Counter tallies in C; missing rings read as 0)
     def count_by_ring(techs):
-        rings = {0: 0, 1: 0, 2: 0, 3: 0}
-        for t in techs:
-            rings[t['ring']] = rings.get(t['ring'], 0) + 1
-        return rings
+        return Counter(map(itemgetter('ring'), techs))
 
     original_rings = count_by_ring(original)
     filtered_rings = count_by_ring(filtered)
@@ -146,19 +146,13 @@ def compare_before_after(original: list, filtered: list):
     print(f"  Ring 3 (Hold):   {original_rings[3]:3d} → {filtered_rings[3]:3d}")
 
     # Count by repos
+    # Upper bounds of the 1 / 2-4 / 5-9 buckets (anything above is 10+)
+    repo_bounds = (1, 4, 9)
+    repo_labels = ('1', '2-4', '5-9', '10+')
+
     def count_by_repos(techs):
-        counts = {'1': 0, '2-4': 0, '5-9': 0, '10+': 0}
-        for t in techs:
-            repos = t['metadata']['repos_count']
-            if repos == 1:
-                counts['1'] += 1
-            elif repos <= 4:
-                counts['2-4'] += 1
-            elif repos <= 9:
-                counts['5-9'] += 1
-            else:
-                counts['10+'] += 1
-        return counts
+        buckets = Counter(bisect_left(repo_bounds, t['metadata']['repos_count']) for t in techs)
+        return {label: buckets[i] for i, label in enumerate(repo_labels)}
 
     original_repos = count_by_repos(original)
     filtered_repos = count_by_repos(filtered)
@@ -221,11 +215,11 @@ def main():
 
     logger.info(f"\nSaving filtered data to: {filtered_path}")
     with open(filtered_path, 'w') as f:
-        json.dump(filtered_data, f, indent=2, default=str)
+        f.write(json.dumps(filtered_data, indent=2, default=str))
 
     logger.info(f"Saving filtering report to: {report_path}")
     with open(report_path, 'w') as f:
-        json.dump(decisions, f, indent=2, default=str)
+        f.write(json.dumps(decisions, indent=2, default=str))
 
     print_section("FILTERING COMPLETE")
     print(f"✅ Original:  {data_path}")
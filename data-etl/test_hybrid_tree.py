@@ -4,11 +4,9 @@ Test the new hybrid tree generation approach.
 """
 import sys
 import os
-import yaml
 from dotenv import load_dotenv
 
 sys.path.insert(0, 'src')
-from deep_scanner import DeepScanner
 
 def test_hybrid_tree():
     """Test hybrid tree generation on real IAC repo."""
@@ -20,9 +18,12 @@ def test_hybrid_tree():
         print("❌ OPENAI_API_KEY not found")
         return False
 
+    # Heavy imports deferred until the API key check has passed
+    from config import load_yaml_config
+    from deep_scanner import DeepScanner
+
     # Load config
-    with open('config/config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config()
 
     scanner = DeepScanner(openai_key, config)
     print("✓ DeepScanner initialized\n")
@@ -2,13 +2,12 @@
 """
 Test the simplified deep scanner on IAC repo.
 """
+import re
 import sys
 import os
-import yaml
 from dotenv import load_dotenv
 
 sys.path.insert(0, 'src')
-from deep_scanner import DeepScanner
 
 def test_iac_deep_scan():
     """Test deep scan on real IAC repo."""
@@ -22,9 +21,12 @@ def test_iac_deep_scan():
 
     print("✓ OpenAI API key found\n")
 
+    # Heavy imports deferred until the API key check has passed
+    from config import load_yaml_config
+    from deep_scanner import DeepScanner
+
     # Load config
-    with open('config/config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config()
 
     scanner = DeepScanner(openai_key, config)
     print("✓ DeepScanner initialized\n")
@@ -66,6 +68,11 @@ def test_iac_deep_scan():
         icon = "✓" if check else "✗"
         print(f"  {icon} {desc}")
 
+    # The AI call takes 10-20s; skip it when the tree lacks the core IAC markers
+    if not all(check for check, _ in checks[:3]):
+        print("\n❌ Tree is missing required markers (accounts, environments, Terraform); skipping AI analysis")
+        return False
+
     # Now do AI analysis
     print(f"\n{'=' * 80}")
     print("Phase 2: AI Analysis (this takes ~10-20 seconds)...")
@@ -88,9 +95,15 @@ def test_iac_deep_scan():
         'CI/CD': ['GitHub Actions'],
     }
 
+    # One case-insensitive alternation per category instead of lowercasing per pair
+    category_patterns = {
+        category: re.compile('|'.join(map(re.escape, expected_techs)), re.IGNORECASE)
+        for category, expected_techs in expected_categories.items()
+    }
+
     print(f"\n📊 Analysis by Category:")
-    for category, expected_techs in expected_categories.items():
-        found = [t for t in technologies if any(exp.lower() in t.lower() for exp in expected_techs)]
+    for category, pattern in category_patterns.items():
+        found = [t for t in technologies if pattern.search(t)]
         if found:
             print(f"\n  {category}:")
             for tech in found:
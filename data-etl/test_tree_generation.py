@@ -5,33 +5,45 @@ Test tree generation functionality.
 import sys
 import os
 import tempfile
-import shutil
 import subprocess
-import yaml
+from contextlib import contextmanager
+from pathlib import Path
 from dotenv import load_dotenv
 
 sys.path.insert(0, 'src')
-from deep_scanner import DeepScanner
 
+# Infrastructure-like layout for the test repository
+TEST_REPO_DIRS = (
+    'terraform/modules/eks',
+    'kubernetes/prometheus/templates',
+    'kubernetes/grafana/dashboards',
+    '.github/workflows',
+)
+
+TEST_REPO_FILES = (
+    ('terraform/main.tf', '# Terraform config'),
+    ('terraform/modules/eks/cluster.tf', '# EKS cluster'),
+    ('kubernetes/prometheus/Chart.yaml', 'apiVersion: v2\nname: prometheus'),
+    ('kubernetes/grafana/Chart.yaml', 'apiVersion: v2\nname: grafana'),
+    ('.pre-commit-config.yaml', 'repos:\n  - repo: https://github.com/aquasecurity/trivy'),
+    ('.github/workflows/ci.yaml', 'name: CI'),
+)
+
+@contextmanager
 def create_test_repo():
-    """Create a test repository structure."""
-    temp_dir = tempfile.mkdtemp(prefix='test_tree_')
+    """Create a test repository structure, removed again on exit."""
+    with tempfile.TemporaryDirectory(prefix='test_tree_') as temp_dir:
+        root = Path(temp_dir)
 
-    # Create infrastructure-like structure
-    os.makedirs(f'{temp_dir}/terraform/modules/eks')
-    os.makedirs(f'{temp_dir}/kubernetes/prometheus/templates')
-    os.makedirs(f'{temp_dir}/kubernetes/grafana/dashboards')
-    os.makedirs(f'{temp_dir}/.github/workflows')
+        # Create infrastructure-like structure
+        for directory in TEST_REPO_DIRS:
+            (root / directory).mkdir(parents=True)
 
-    # Create some files
-    open(f'{temp_dir}/terraform/main.tf', 'w').write('# Terraform config')
-    open(f'{temp_dir}/terraform/modules/eks/cluster.tf', 'w').write('# EKS cluster')
-    open(f'{temp_dir}/kubernetes/prometheus/Chart.yaml', 'w').write('apiVersion: v2\nname: prometheus')
-    open(f'{temp_dir}/kubernetes/grafana/Chart.yaml', 'w').write('apiVersion: v2\nname: grafana')
-    open(f'{temp_dir}/.pre-commit-config.yaml', 'w').write('repos:\n  - repo: https://github.com/aquasecurity/trivy')
-    open(f'{temp_dir}/.github/workflows/ci.yaml', 'w').write('name: CI')
+        # Create some files
+        for path, content in TEST_REPO_FILES:
+            (root / path).write_text(content)
 
-    return temp_dir
+        yield temp_dir
 
 def test_tree_generation():
     """Test tree generation with real tree command."""
@@ -43,17 +55,19 @@ def test_tree_generation():
         print("❌ OPENAI_API_KEY not found")
         return False
 
+    # Heavy imports deferred until the API key check has passed
+    from config import load_yaml_config
+    from deep_scanner import DeepScanner
+
     # Load config
-    with open('config/config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_config()
 
     scanner = DeepScanner(openai_key, config)
 
     # Create test repo
-    test_dir = create_test_repo()
-    print(f"✓ Created test repo at: {test_dir}")
+    with create_test_repo() as test_dir:
+        print(f"✓ Created test repo at: {test_dir}")
 
-    try:
         # Test tree generation
         print("\n📁 Generating tree...")
         tree_output = scanner._generate_tree(test_dir, 'test-repo')
@@ -86,12 +100,8 @@ def test_tree_generation():
         else:
             print("\n❌ Some checks failed")
 
-        return all_passed
-
-    finally:
-        # Cleanup
-        shutil.rmtree(test_dir, ignore_errors=True)
-        print(f"\n🗑️  Cleaned up test repo")
+    print(f"\n🗑️  Cleaned up test repo")
+    return all_passed
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,59 @@
+"""
+Tests for AI technology detector.
+"""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import Mock
+
+# ai_detector imports its sibling modules by bare name
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from ai_detector import AITechnologyDetector
+
+
+class TestAITechnologyDetector:
+    """Test AI detector bookkeeping."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.detector = AITechnologyDetector('fake-key', {})
+
+    def _run_with_timeout(self, target):
+        """Run target in a thread so a deadlock fails the test instead of hanging."""
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        assert not thread.is_alive(), 'call did not return (deadlock?)'
+
+    def test_count_increments_stat(self):
+        """Test _count increments the counter and returns."""
+        self._run_with_timeout(lambda: self.detector._count('errors'))
+
+        assert self.detector.stats['errors'] == 1
+
+    def test_concurrent_counts_are_not_lost(self):
+        """Test counters updated from many threads add up."""
+        def worker():
+            for _ in range(500):
+                self.detector._count('cache_hits')
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert self.detector.stats['cache_hits'] == 4000
+
+    def test_failed_detection_counts_error(self):
+        """Test a failing repo is counted as an error without hanging."""
+        repo = Mock()
+        repo.name = 'repo'
+        repo.full_name = 'org/repo'
+        self.detector._phase1_triage = Mock(side_effect=RuntimeError('boom'))
+
+        self._run_with_timeout(lambda: self.detector.detect_technologies(repo))
+
+        assert self.detector.get_stats()['errors'] == 1
@@ -7,28 +7,31 @@ from unittest.mock import Mock, patch
 from src.classifier import TechnologyClassifier
 
 
+# Shared by every test; tests that need other settings derive a copy
+BASE_CONFIG = {
+    'openai': {
+        'model': 'gpt-4o-mini',
+        'max_tokens': 1000,
+        'temperature': 0.3
+    },
+    'classification': {
+        'thresholds': {
+            'adopt': 0.7,
+            'trial': 0.4,
+            'assess': 0.1
+        },
+        'min_repos': 2,
+        'exclude_patterns': []
+    }
+}
+
+
 class TestTechnologyClassifier:
     """Test technology classification."""
 
     def setup_method(self):
         """Setup test fixtures."""
-        self.config = {
-            'openai': {
-                'model': 'gpt-4o-mini',
-                'max_tokens': 1000,
-                'temperature': 0.3
-            },
-            'classification': {
-                'thresholds': {
-                    'adopt': 0.7,
-                    'trial': 0.4,
-                    'assess': 0.1
-                },
-                'min_repos': 2,
-                'exclude_patterns': []
-            }
-        }
-        self.classifier = TechnologyClassifier('fake-key', self.config)
+        self.classifier = TechnologyClassifier('fake-key', BASE_CONFIG)
 
     def test_determine_ring_adopt(self):
         """Test ring determination for high usage."""
@@ -67,8 +70,14 @@ class TestTechnologyClassifier:
 
     def test_should_exclude(self):
         """Test exclusion patterns."""
-        self.config['classification']['exclude_patterns'] = ['*-internal', 'custom-*']
-        classifier = TechnologyClassifier('fake-key', self.config)
+        config = {
+            **BASE_CONFIG,
+            'classification': {
+                **BASE_CONFIG['classification'],
+                'exclude_patterns': ['*-internal', 'custom-*']
+            }
+        }
+        classifier = TechnologyClassifier('fake-key', config)
 
         assert classifier._should_exclude('tool-internal') is True
         assert classifier._should_exclude('custom-framework') is True
@@ -0,0 +1,60 @@
+"""
+Tests for deep scanner tree handling.
+"""
+
+import sys
+from pathlib import Path
+
+# deep_scanner imports its sibling modules by bare name
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from deep_scanner import DeepScanner
+
+
+UTF8_TREE = """repo
+├── infra
+│   ├── modules
+│   │   └── vpc
+│   │       └── main.tf
+│   └── main.tf
+└── README.md"""
+
+ASCII_TREE = """repo
+|-- infra
+|   |-- modules
+|   |   `-- vpc
+|   |       `-- main.tf
+|   `-- main.tf
+`-- README.md"""
+
+
+class TestPruneTreeDepth:
+    """Test pruning of `tree` command output."""
+
+    def test_prunes_utf8_tree(self):
+        """Test entries below the depth are dropped from UTF-8 output."""
+        pruned = DeepScanner._prune_tree_depth(UTF8_TREE, 2)
+
+        assert pruned.splitlines() == [
+            'repo',
+            '├── infra',
+            '│   ├── modules',
+            '│   └── main.tf',
+            '└── README.md'
+        ]
+
+    def test_prunes_ascii_tree(self):
+        """Test ASCII connectors (C/POSIX locale) are pruned the same way."""
+        pruned = DeepScanner._prune_tree_depth(ASCII_TREE, 2)
+
+        assert pruned.splitlines() == [
+            'repo',
+            '|-- infra',
+            '|   |-- modules',
+            '|   `-- main.tf',
+            '`-- README.md'
+        ]
+
+    def test_keeps_everything_within_depth(self):
+        """Test pruning at the full depth is a no-op."""
+        assert DeepScanner._prune_tree_depth(ASCII_TREE, 4) == ASCII_TREE
@@ -3,10 +3,19 @@ Tests for technology detector.
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, MagicMock, patch
+from github.GithubException import GithubException, UnknownObjectException
 from src.detector import TechnologyDetector
 
 
+def make_repo(decoded_content: bytes = b'') -> SimpleNamespace:
+    """Repository stub whose get_contents returns one file (cheaper than Mock)."""
+    content = SimpleNamespace(decoded_content=decoded_content)
+    return SimpleNamespace(get_contents=lambda *args, **kwargs: content)
+
+
 class TestTechnologyDetector:
     """Test technology detection."""
 
@@ -16,10 +25,7 @@ class TestTechnologyDetector:
 
     def test_detect_node_react(self):
         """Test React detection from package.json."""
-        repo = Mock()
-        content = Mock()
-        content.decoded_content = b'{"dependencies": {"react": "^18.0.0"}}'
-        repo.get_contents.return_value = content
+        repo = make_repo(b'{"dependencies": {"react": "^18.0.0"}}')
 
         techs = self.detector.detect_node(repo)
 
@@ -27,10 +33,7 @@ class TestTechnologyDetector:
 
     def test_detect_node_typescript(self):
         """Test TypeScript detection."""
-        repo = Mock()
-        content = Mock()
-        content.decoded_content = b'{"devDependencies": {"typescript": "^5.0.0"}}'
-        repo.get_contents.return_value = content
+        repo = make_repo(b'{"devDependencies": {"typescript": "^5.0.0"}}')
 
         techs = self.detector.detect_node(repo)
 
@@ -38,19 +41,29 @@ class TestTechnologyDetector:
 
     def test_detect_python_django(self):
         """Test Django detection from requirements.txt."""
-        repo = Mock()
-        content = Mock()
-        content.decoded_content = b'django==4.2.0\npsycopg2==2.9.0'
-        repo.get_contents.return_value = content
+        repo = make_repo(b'django==4.2.0\npsycopg2==2.9.0')
 
         techs = self.detector.detect_python(repo)
 
         assert 'Django' in techs['frameworks']
 
+    def test_detect_python_pyproject(self):
+        """Test build backend and dependency detection from pyproject.toml."""
+        repo = make_repo(
+            b'[build-system]\nbuild-backend = "hatchling.build"\n'
+            b'[project]\ndependencies = ["fastapi>=0.100", "pytest[testing]"]\n'
+        )
+
+        techs = self.detector.detect_python_pyproject(repo)
+
+        assert 'Hatch' in techs['tools']
+        assert 'Poetry' not in techs['tools']
+        assert 'FastAPI' in techs['frameworks']
+        assert 'pytest' in techs['tools']
+
     def test_detect_go(self):
         """Test Go detection."""
-        repo = Mock()
-        repo.get_contents.return_value = Mock()  # go.mod exists
+        repo = make_repo()  # go.mod exists
 
         techs = self.detector.detect_go(repo)
 
@@ -58,8 +71,7 @@ class TestTechnologyDetector:
 
     def test_detect_docker(self):
         """Test Docker detection."""
-        repo = Mock()
-        repo.get_contents.return_value = Mock()  # Dockerfile exists
+        repo = make_repo()  # Dockerfile exists
 
         techs = self.detector.detect_docker(repo)
 
@@ -80,3 +92,114 @@ class TestTechnologyDetector:
         assert counts['Flask'] == 1
         assert counts['JavaScript'] == 1
         assert counts['React'] == 1
+
+    def test_aggregate_technologies_counts_repo_once(self):
+        """Test a tech listed in several categories counts once per repo."""
+        all_techs = [
+            {'languages': {'Kotlin'}, 'frameworks': {'Kotlin'}},
+            {'languages': {'Kotlin'}},
+        ]
+
+        counts = self.detector.aggregate_technologies(all_techs)
+
+        assert counts == {'Kotlin': 2}
+
+    def test_detect_technologies_persistent_cache(self, tmp_path):
+        """Test results are reused across detector instances."""
+        repo = Mock()
+        repo.full_name = 'org/repo'
+        repo.pushed_at = datetime(2024, 1, 1)
+        repo.get_languages.return_value = {'Python': 100}
+        repo.get_contents.side_effect = UnknownObjectException(404)
+
+        detector = TechnologyDetector(cache_path=tmp_path / 'detector')
+        first = detector.detect_technologies(repo)
+        detector.save_cache()
+
+        repo.get_languages.side_effect = AssertionError('should hit cache')
+        second = TechnologyDetector(cache_path=tmp_path / 'detector').detect_technologies(repo)
+
+        assert second == first
+        assert 'Python' in second['languages']
+
+    def test_prefetch_languages(self):
+        """Test prefetched languages replace per-repo get_languages calls."""
+        graphql = Mock()
+        graphql.fetch_repositories.return_value = {
+            'org/repo': {'languages': {'nodes': [{'name': 'Go'}, {'name': 'Shell'}]}}
+        }
+        detector = TechnologyDetector(graphql=graphql)
+
+        repo = Mock()
+        repo.full_name = 'org/repo'
+        repo.get_contents.side_effect = Exception('not found')
+
+        detector.prefetch_languages([repo])
+        techs = detector.detect_technologies(repo)
+
+        assert techs['languages'] == {'Go', 'Shell'}
+        repo.get_languages.assert_not_called()
+
+    def test_detect_technologies_skips_cache_on_probe_error(self, tmp_path):
+        """Test a result with a failed (non-404) file probe is not cached."""
+        repo = Mock()
+        repo.full_name = 'org/repo'
+        repo.pushed_at = datetime(2024, 1, 1)
+        repo.get_languages.return_value = {'Python': 100}
+        repo.get_contents.side_effect = ConnectionError('reset by peer')
+
+        detector = TechnologyDetector(cache_path=tmp_path / 'detector')
+        techs = detector.detect_technologies(repo)
+
+        assert 'Python' in techs['languages']
+        assert len(detector.persistent_cache) == 0
+
+    def test_detect_technologies_raises_rate_limit(self, tmp_path):
+        """Test a rate-limited probe is raised (for backoff) and not cached."""
+        repo = Mock()
+        repo.full_name = 'org/repo'
+        repo.pushed_at = datetime(2024, 1, 1)
+        repo.get_languages.return_value = {'Python': 100}
+        repo.get_contents.side_effect = GithubException(429, headers={'Retry-After': '5'})
+
+        detector = TechnologyDetector(cache_path=tmp_path / 'detector')
+        with pytest.raises(GithubException) as excinfo:
+            detector.detect_technologies(repo)
+
+        assert excinfo.value.status == 429
+        assert repo.get_contents.call_count == 1  # Stops probing after the rejection
+        assert len(detector.persistent_cache) == 0
+
+    def test_detect_technologies_uses_overridden_detectors(self):
+        """Test subclass and patched detect methods are the ones dispatched."""
+        class NodeOnlyDetector(TechnologyDetector):
+            def detect_node(self, repo):
+                return {'frameworks': {'Custom'}}
+
+        repo = Mock()
+        repo.full_name = 'org/repo'
+        repo.pushed_at = datetime(2024, 1, 1)
+        repo.get_languages.return_value = {'Python': 100}
+        repo.get_contents.side_effect = UnknownObjectException(404)
+
+        assert 'Custom' in NodeOnlyDetector().detect_technologies(repo)['frameworks']
+
+        with patch.object(TechnologyDetector, 'detect_go', return_value={'tools': {'Patched'}}):
+            detector = TechnologyDetector()
+        assert 'Patched' in detector.detect_technologies(repo)['tools']
+
+    def test_invalidate_cache(self, tmp_path):
+        """Test invalidate_cache drops persisted results."""
+        repo = Mock()
+        repo.full_name = 'org/repo'
+        repo.pushed_at = datetime(2024, 1, 1)
+        repo.get_languages.return_value = {'Python': 100}
+        repo.get_contents.side_effect = UnknownObjectException(404)
+
+        detector = TechnologyDetector(cache_path=tmp_path / 'detector')
+        detector.detect_technologies(repo)
+        assert len(detector.persistent_cache) == 1
+
+        detector.invalidate_cache()
+
+        assert len(detector.persistent_cache) == 0
@@ -0,0 +1,176 @@
+"""
+Tests for rate limiter.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+from src.rate_limiter import RateLimiter, CircuitBreaker
+
+
+class FakeClock:
+    """Monotonic clock where sleeping advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeping = 0
+        self.max_sleeping = 0
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        with self._lock:
+            return self.now
+
+    def time(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        with self._lock:
+            wake_time = self.now + seconds
+            self.sleeping += 1
+            self.max_sleeping = max(self.max_sleeping, self.sleeping)
+
+        # Give the other threads a chance to reach the limit too
+        time.sleep(0.05)
+
+        with self._lock:
+            self.sleeping -= 1
+            self.now = max(self.now, wake_time)
+
+
+class TestRateLimiter:
+    """Test per-minute request limiting."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        github = Mock()
+        github.rate_limiting = (5000, 5000)
+        self.limiter = RateLimiter(github, max_per_minute=1)
+
+    def test_waiting_threads_do_not_hold_lock(self):
+        """Test threads at the limit sleep concurrently, not one by one."""
+        clock = FakeClock()
+        with patch('src.rate_limiter.time', clock):
+            self.limiter.request_times.append(clock.monotonic())
+
+            threads = [
+                threading.Thread(target=self.limiter._enforce_per_minute_limit)
+                for _ in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=5)
+
+        assert clock.max_sleeping > 1
+        assert len(self.limiter.request_times) == 1
+
+    def test_requests_within_limit_do_not_wait(self):
+        """Test requests under the limit are recorded without sleeping."""
+        self.limiter.max_per_minute = 10
+        with patch('src.rate_limiter.time.sleep') as sleep:
+            for _ in range(10):
+                self.limiter._enforce_per_minute_limit()
+
+        sleep.assert_not_called()
+        assert len(self.limiter.request_times) == 10
+
+    def test_low_remaining_waits_for_reset(self):
+        """Test a low header-reported budget waits until the reset time."""
+        self.limiter.github.rate_limiting = (10, 5000)
+        self.limiter.github.rate_limiting_resettime = time.time() + 30
+        with patch('src.rate_limiter.time.sleep') as sleep:
+            self.limiter.check_and_wait()
+
+        assert 29 < sleep.call_args_list[0].args[0] <= 31
+        self.limiter.github.get_rate_limit.assert_not_called()
+
+    def test_retry_after_pauses_requests(self):
+        """Test Retry-After from a rejected response pauses later checks."""
+        self.limiter.pause_from_headers({'Retry-After': '5'})
+        with patch('src.rate_limiter.time.sleep') as sleep:
+            sleep.side_effect = lambda seconds: setattr(self.limiter, '_paused_until', 0.0)
+            self.limiter.check_and_wait()
+
+        assert 4 < sleep.call_args_list[0].args[0] <= 5
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker under concurrent callers."""
+
+    def test_concurrent_failures_are_all_counted(self):
+        """Test failures from many threads are counted without losses."""
+        breaker = CircuitBreaker(failure_threshold=10_000)
+
+        def failing():
+            raise ValueError('boom')
+
+        def worker():
+            for _ in range(200):
+                try:
+                    breaker.call(failing)
+                except ValueError:
+                    pass
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert breaker.failure_count == 1600
+        assert breaker.state == 'CLOSED'
+
+    def test_half_open_admits_single_probe(self):
+        """Test only one caller gets through while the circuit is HALF_OPEN."""
+        breaker = CircuitBreaker(failure_threshold=1, timeout=60)
+        breaker.state = 'OPEN'
+        breaker.last_failure_time = time.monotonic() - 61
+
+        release = threading.Event()
+        calls = []
+        rejected = []
+
+        def probe():
+            calls.append(1)
+            release.wait(timeout=5)
+            return 'ok'
+
+        def worker():
+            try:
+                breaker.call(probe)
+            except Exception as e:
+                rejected.append(str(e))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+
+        # Let the probe finish only after every other caller was turned away
+        deadline = time.monotonic() + 5
+        while len(rejected) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert len(calls) == 1
+        assert len(rejected) == 4
+        assert breaker.state == 'CLOSED'
+
+    def test_failed_probe_reopens(self):
+        """Test a failing HALF_OPEN probe opens the circuit again."""
+        breaker = CircuitBreaker(failure_threshold=3, timeout=60)
+        breaker.state = 'OPEN'
+        breaker.last_failure_time = time.monotonic() - 61
+
+        def failing():
+            raise ValueError('still down')
+
+        try:
+            breaker.call(failing)
+        except ValueError:
+            pass
+
+        assert breaker.state == 'OPEN'
+        assert not breaker._probe_in_flight
@@ -0,0 +1,123 @@
+"""
+Tests for repository scanner.
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from github.GithubException import GithubException, UnknownObjectException
+
+# scanner imports its sibling modules by bare name
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from scanner import GitHubScanner
+
+
+def make_repo(**overrides) -> Mock:
+    """Repository mock for the legacy detector."""
+    repo = Mock()
+    repo.name = 'repo'
+    repo.full_name = 'org/repo'
+    repo.pushed_at = datetime(2024, 1, 1)
+    repo.get_languages.return_value = {'Python': 100}
+    repo.get_contents.side_effect = UnknownObjectException(404)
+    for name, value in overrides.items():
+        setattr(repo, name, value)
+    return repo
+
+
+class TestScanBackpressure:
+    """Test GitHub pushback reaches the backpressure controller."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        config = {
+            'github': {'concurrency': 8},
+            'detection': {'mode': 'legacy'},
+            'deep_scan': {'enabled': False}
+        }
+        self.scanner = GitHubScanner('fake-token', config)
+        # No real API calls for the pre-request budget check
+        self.scanner.rate_limiter.check_and_wait = Mock()
+
+    def test_rate_limited_probe_shrinks_concurrency(self):
+        """Test a 429 from a file probe halves the limit."""
+        repo = make_repo()
+        repo.get_contents.side_effect = GithubException(429)
+
+        with pytest.raises(GithubException):
+            self.scanner._scan_with_backpressure(repo)
+
+        assert self.scanner.backpressure.concurrency == 4
+
+    def test_server_error_shrinks_concurrency(self):
+        """Test a 5xx from the languages call halves the limit."""
+        repo = make_repo()
+        repo.get_languages.side_effect = GithubException(502)
+
+        with pytest.raises(GithubException):
+            self.scanner._scan_with_backpressure(repo)
+
+        assert self.scanner.backpressure.concurrency == 4
+
+    def test_missing_files_do_not_shrink_concurrency(self):
+        """Test 404 probes are a clean scan."""
+        techs = self.scanner._scan_with_backpressure(make_repo())
+
+        assert 'Python' in techs['languages']
+        assert self.scanner.backpressure.concurrency == 8
+
+
+class TestScanRateLimitPause:
+    """Test rejected requests pause all workers as GitHub directs."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        config = {
+            'github': {'concurrency': 8},
+            'detection': {'mode': 'legacy'},
+            'deep_scan': {'enabled': False}
+        }
+        self.scanner = GitHubScanner('fake-token', config)
+        self.scanner.rate_limiter.check_and_wait = Mock()
+
+    def _paused_for(self) -> float:
+        """Seconds left on the shared pause."""
+        return self.scanner.rate_limiter._paused_until - time.monotonic()
+
+    def test_secondary_limit_pauses_for_retry_after(self):
+        """Test a 429 with Retry-After pauses requests for that long."""
+        repo = make_repo()
+        repo.get_contents.side_effect = GithubException(429, headers={'Retry-After': '30'})
+
+        with pytest.raises(GithubException):
+            self.scanner._scan_with_backpressure(repo)
+
+        assert 25 < self._paused_for() <= 30
+
+    def test_exhausted_primary_limit_pauses_until_reset(self):
+        """Test a 403 with no remaining budget pauses until the reset time."""
+        repo = make_repo()
+        repo.get_languages.side_effect = GithubException(403, headers={
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': str(int(time.time()) + 60)
+        })
+
+        with pytest.raises(GithubException):
+            self.scanner._scan_with_backpressure(repo)
+
+        assert 50 < self._paused_for() <= 60
+
+    def test_server_error_does_not_pause(self):
+        """Test a 5xx shrinks concurrency but sets no pause."""
+        repo = make_repo()
+        repo.get_languages.side_effect = GithubException(503)
+
+        with pytest.raises(GithubException):
+            self.scanner._scan_with_backpressure(repo)
+
+        assert self._paused_for() <= 0